@@ -0,0 +1,123 @@
+from __future__ import annotations
+import asyncio
+import contextlib
+import io
+import math
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence
+
+from bench.fixtures import Fixtures
+from bench.standins import FakeES, FakeOpenAI, FixtureSite
+
+"""
+엔드투엔드 벤치마크: client.main 을 로컬 대역 서버(사이트/LLM/ES)에 붙여 postings/s 측정
+
+- lib.req 의 URL 상수를 FixtureSite 로, HTTP LLM 백엔드를 FakeOpenAI 로, es 를 FakeES 로 돌린다
+- 캐시/아카이브/저널/dedup 경로는 임시 디렉터리 (실제 .cache, out 은 건드리지 않음)
+- cold: 빈 색인에서 전체 실행 / warm: 같은 상태로 한 번 더 (증분 필터 + HTTP 304 경로)
+- MCP 서버 프로세스 기동 시간도 wall 에 포함되므로 postings 가 적으면 고정비 비중이 큼
+"""
+
+_URL_CONSTANTS = ("API", "DETAIL_URL", "LIST_URL", "SARAMIN_LIST_URL")
+
+
+@contextlib.contextmanager
+def _patched(modules: Sequence[Any], values: Dict[str, Any]) -> Iterator[None]:
+    saved = []
+    for mod in modules:
+        for name, value in values.items():
+            if hasattr(mod, name):
+                saved.append((mod, name, getattr(mod, name)))
+                setattr(mod, name, value)
+    try:
+        yield
+    finally:
+        for mod, name, value in reversed(saved):
+            setattr(mod, name, value)
+
+
+def _client_argv(tmp: Path, postings: int, extra: Sequence[str]) -> List[str]:
+    page = 20
+    return [
+        "--index", "jobs",
+        "--wanted-groups", "518",
+        "--wanted-page-size", str(page),
+        "--max-pages", str(max(1, math.ceil(postings / page))),
+        "--saramin-pages", "1",
+        "--jobkorea-pages", "1",
+        # 로컬 서버라 호스트별 속도 제한은 사실상 끔
+        "--host-rate", "100000",
+        "--per-host", "32",
+        "--http-cache", str(tmp / "http_cache.sqlite"),
+        "--archive", str(tmp / "archive"),
+        "--llm-cache", str(tmp / "llm_cache.sqlite"),
+        "--dedup-db", str(tmp / "dedup.sqlite"),
+        "--journal", str(tmp / "run.journal.ndjson"),
+        "--llm-failures", str(tmp / "llm_failures.ndjson"),
+        *extra,
+    ]
+
+
+def _run_client(client: Any, argv: List[str]) -> Dict[str, Any]:
+    out = io.StringIO()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        report = asyncio.run(client.main(client.parse_args(argv)))
+    wall = time.perf_counter() - t0
+    rep = report.as_dict()
+    crawled = rep["stages"][0]["out"] if rep["stages"] else 0
+    return {
+        "wall_s": round(wall, 3),
+        "postings": crawled,
+        "postings_per_s": round(crawled / wall, 2) if wall else None,
+        "pipeline": rep,
+        "stdout_tail": out.getvalue().splitlines()[-12:],
+    }
+
+
+def run_e2e(
+    fx: Fixtures,
+    *,
+    postings: int = 200,
+    latency: float = 0.02,
+    jitter: float = 0.01,
+    error_rate: float = 0.0,
+    tokens_per_s: float = 400.0,
+    ttft: float = 0.05,
+    max_batch: int = 32,
+    warm: bool = True,
+    client_args: Sequence[str] = (),
+) -> Dict[str, Any]:
+    site = FixtureSite(fx, postings=postings, latency=latency, jitter=jitter, error_rate=error_rate)
+    llm_srv = FakeOpenAI(tokens_per_s=tokens_per_s, ttft=ttft, max_batch=max_batch)
+    es_srv = FakeES()
+    with site, llm_srv, es_srv, tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        from elasticsearch import Elasticsearch
+        import client
+        import lib.llm_backend
+        import lib.req
+        from lib.lchain import make_llm
+
+        values: Dict[str, Any] = {k: v for k, v in site.urls().items() if k in _URL_CONSTANTS}
+        es = Elasticsearch(es_srv.url)
+        llm = make_llm(llm_srv.base_url())
+        with _patched([lib.req, client], values), \
+                _patched([client], {"get_es": lambda: es}), \
+                _patched([lib.llm_backend], {"get_llm": lambda: llm}):
+            argv = _client_argv(Path(tmp), postings, client_args)
+            result: Dict[str, Any] = {"params": {
+                "postings": postings, "latency": latency, "jitter": jitter, "error_rate": error_rate,
+                "tokens_per_s": tokens_per_s, "ttft": ttft, "max_batch": max_batch,
+                "client_args": list(client_args),
+            }}
+            result["cold"] = _run_client(client, argv)
+            result["cold"]["indexed"] = len(es_srv.docs("jobs"))
+            if warm:
+                result["warm"] = _run_client(client, argv)
+                result["warm"]["indexed"] = len(es_srv.docs("jobs"))
+        result["site"] = site.stats.as_dict()
+        result["llm_server"] = llm_srv.stats.as_dict()
+        result["es"] = es_srv.stats.as_dict()
+    return result
@@ -0,0 +1,151 @@
+from __future__ import annotations
+import json
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+"""
+벤치마크 입력 (HTML/JSON 픽스처)
+
+bench/fixtures/ 에 bench/record.py 로 녹화한 실제 페이지가 있으면 그것을, 없으면 같은 구조의
+합성 페이지를 시드 고정으로 만든다. 합성 페이지는 파서가 보는 태그/클래스/JSON-LD 구조만 맞춘 것.
+
+  bench/fixtures/wanted_list.json       원티드 목록 API 응답 1페이지
+  bench/fixtures/wanted_detail/*.html    원티드 상세 페이지
+  bench/fixtures/saramin_list.html       사람인 목록 1페이지
+  bench/fixtures/jobkorea_list.html      잡코리아 Top100 목록
+"""
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+
+_COMPANIES = ["우아한형제들", "(주)카카오", "네이버㈜", "토스", "당근마켓", "주식회사 라인플러스", "쿠팡", "리디", "뱅크샐러드", "센드버드"]
+_POSITIONS = ["백엔드 개발자", "[경력] 데이터 엔지니어", "프론트엔드 개발자 (React)", "ML 엔지니어", "DevOps 엔지니어",
+              "iOS 개발자", "Android 개발자", "QA 엔지니어", "데이터 분석가", "플랫폼 엔지니어 (Java/Kotlin)"]
+_LOCATIONS = ["서울 강남구", "서울 송파구", "경기 성남시", "서울 서초구", "서울 마포구"]
+_TASKS = ["대규모 트래픽 API 설계 및 개발", "데이터 파이프라인 구축과 운영", "사내 플랫폼 성능 개선", "서비스 장애 대응 및 모니터링",
+          "신규 기능 기획 단계부터 참여", "추천 모델 학습/서빙 파이프라인 개발", "코드 리뷰와 테스트 자동화"]
+_REQS = ["Python 또는 Java 기반 개발 경력 3년 이상", "RDBMS 설계 경험", "클라우드(AWS/GCP) 운영 경험", "협업 도구에 익숙하신 분",
+         "신입 가능", "CS 기초 지식", "Kubernetes 운영 경험 2년 이상"]
+
+
+@dataclass
+class Fixtures:
+    wanted_list: dict
+    wanted_details: List[str]
+    saramin_list: str
+    jobkorea_list: str
+    recorded: bool = False
+    meta: Dict[str, int] = field(default_factory=dict)
+
+
+def _detail_html(rng: random.Random, job_id: int, company: str, position: str) -> str:
+    tasks = rng.sample(_TASKS, 3)
+    reqs = rng.sample(_REQS, 3)
+    desc = (
+        f"{company}에서 {position}을(를) 찾습니다. 회사 위치: {rng.choice(_LOCATIONS)} "
+        "주요업무 " + " ".join(f"• {t}" for t in tasks) + " "
+        "자격요건 " + " ".join(f"• {r}" for r in reqs) + " "
+        "우대사항 • 오픈소스 기여 경험 혜택 및 복지 • 유연 근무"
+    )
+    ld = {
+        "@context": "https://schema.org",
+        "@type": "JobPosting",
+        "title": position,
+        "employmentType": "FULL_TIME",
+        "datePosted": "2025-11-0%d" % rng.randint(1, 9),
+        "validThrough": rng.choice(["2025-12-31", "2026-01-15", None]),
+        "occupationalCategory": ["개발", position.split()[-1]],
+        "experienceRequirements": {"@type": "OccupationalExperienceRequirements", "monthsOfExperience": 36},
+        "hiringOrganization": {"@type": "Organization", "name": company},
+    }
+    filler = "".join(
+        f'<div class="JobDescription_section__{i}"><p>{rng.choice(_TASKS)}</p></div>' for i in range(200)
+    )
+    return (
+        "<!DOCTYPE html><html lang=\"ko\"><head><meta charset=\"utf-8\">"
+        f"<title>[{company}] {position} | 원티드</title>"
+        f'<meta name="description" content="{desc}">'
+        f'<meta property="og:description" content="{desc}">'
+        f'<link rel="canonical" href="https://www.wanted.co.kr/wd/{job_id}">'
+        '<script src="/_next/static/chunks/main.js"></script>'
+        "</head><body><div id=\"__next\">"
+        f"{filler}"
+        f'<script type="application/ld+json">{json.dumps(ld, ensure_ascii=False)}</script>'
+        "</div></body></html>"
+    )
+
+
+def _saramin_html(rng: random.Random, n: int) -> str:
+    items = []
+    for i in range(n):
+        items.append(
+            '<li class="item lookup">'
+            f'<a href="/zf_user/jobs/relay/view?rec_idx={5000000 + i}">'
+            f'<strong class="tit">{rng.choice(_POSITIONS)}</strong></a>'
+            f'<span class="corp">{rng.choice(_COMPANIES)}</span>'
+            "<ul class=\"desc\">"
+            f'<li class="company_local">{rng.choice(_LOCATIONS)}</li>'
+            f"<li>{rng.choice(['신입', '경력 3년↑', '경력무관'])}</li>"
+            "<li>대졸이상</li></ul>"
+            f'<span class="date">~12.{rng.randint(10, 31)}(수)</span>'
+            "</li>"
+        )
+    return "<html><body><ul class=\"list_product list_grand\">" + "".join(items) + "</ul></body></html>"
+
+
+def _jobkorea_html(rng: random.Random, n: int) -> str:
+    items = []
+    for i in range(n):
+        gno = 47000000 + i
+        items.append(
+            f'<li data-source=\'{{"gno": {gno}}}\'>'
+            f'<div class="co"><a class="coLink" href="/company/{i}">{rng.choice(_COMPANIES)}</a></div>'
+            f'<div class="info"><a class="link" href="/Recruit/GI_Read/{gno}"><span>{rng.choice(_POSITIONS)}</span></a>'
+            '<div class="sTit"><span>AI·개발·데이터</span><span>백엔드개발자</span></div>'
+            f'<div class="sDsc"><span>{rng.choice(["신입", "경력3년↑", "경력무관"])}</span>'
+            f"<span>{rng.choice(_LOCATIONS)}</span><span>정규직</span></div></div>"
+            f'<div class="side"><span class="day">~12/{rng.randint(10, 31)}(금)</span></div>'
+            "</li>"
+        )
+    return "<html><body><ol class=\"rankList\">" + "".join(items) + "</ol></body></html>"
+
+
+def synthetic_fixtures(*, seed: int = 7, details: int = 20, list_size: int = 50) -> Fixtures:
+    rng = random.Random(seed)
+    data, htmls = [], []
+    for i in range(details):
+        job_id = 300000 + i
+        company, position = rng.choice(_COMPANIES), rng.choice(_POSITIONS)
+        data.append({"id": job_id, "company": {"name": company}, "position": position})
+        htmls.append(_detail_html(rng, job_id, company, position))
+    return Fixtures(
+        wanted_list={"data": data},
+        wanted_details=htmls,
+        saramin_list=_saramin_html(rng, list_size),
+        jobkorea_list=_jobkorea_html(rng, list_size),
+        recorded=False,
+    )
+
+
+def load_fixtures(directory: Path = FIXTURE_DIR) -> Fixtures:
+    """녹화된 픽스처가 있으면 그것을, 없으면 합성 픽스처."""
+    try:
+        fx = Fixtures(
+            wanted_list=json.loads((directory / "wanted_list.json").read_text(encoding="utf-8")),
+            wanted_details=[p.read_text(encoding="utf-8") for p in sorted((directory / "wanted_detail").glob("*.html"))],
+            saramin_list=(directory / "saramin_list.html").read_text(encoding="utf-8"),
+            jobkorea_list=(directory / "jobkorea_list.html").read_text(encoding="utf-8"),
+            recorded=True,
+        )
+    except FileNotFoundError:
+        fx = synthetic_fixtures()
+    if not fx.wanted_details:
+        fx = synthetic_fixtures()
+    fx.meta = {
+        "wanted_list_rows": len(fx.wanted_list.get("data", [])),
+        "wanted_details": len(fx.wanted_details),
+        "saramin_bytes": len(fx.saramin_list.encode()),
+        "jobkorea_bytes": len(fx.jobkorea_list.encode()),
+    }
+    return fx
@@ -0,0 +1,77 @@
+from __future__ import annotations
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+"""
+import 시간 벤치마크 (python -X importtime)
+
+MCP 서버는 stdio 세션마다 새 프로세스로 뜨므로 import 시간이 곧 기동 시간이다.
+모듈마다 새 인터프리터에서 repeat 번 import 해서 누적 시간(µs -> ms)의 중앙값을 잰다.
+- cumulative_ms : -X importtime 의 해당 모듈 cumulative (하위 import 포함)
+- top           : 그 실행에서 누적 시간이 큰 직속 하위 import (어디를 줄일지 볼 때)
+
+  python -m bench.run --only importtime
+"""
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MODULES = ("mcp_server", "client")
+
+
+def _parse(stderr: str) -> List[Tuple[int, int, str]]:
+    """'import time: self | cumulative | name' 줄 -> (self_us, cumulative_us, 들여쓰기 포함 이름)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # 헤더 줄
+        rows.append((int(parts[0]), int(parts[1]), parts[2].rstrip()[1:]))  # "|" 뒤 공백 한 칸 제외
+    return rows
+
+
+def _children(rows: List[Tuple[int, int, str]], module: str, n: int) -> List[Dict[str, Any]]:
+    # importtime 은 하위 import 를 먼저 찍고 들여쓰기로 깊이를 표시
+    # -> 대상 줄과 그 앞의 최상위 줄 사이에 있는, 한 단계 깊은 줄들이 직속 하위 import
+    out: List[Dict[str, Any]] = []
+    pending: List[Dict[str, Any]] = []
+    for _, cum_us, name in rows:
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 0:
+            if name.strip() == module:
+                out = pending
+            pending = []
+        elif depth == 1:
+            pending.append({"module": name.strip(), "cumulative_ms": round(cum_us / 1000, 1)})
+    out.sort(key=lambda r: -r["cumulative_ms"])
+    return out[:n]
+
+
+def measure(module: str, *, repeat: int = 5, top: int = 8) -> Dict[str, Any]:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    samples: List[float] = []
+    rows: List[Tuple[int, int, str]] = []
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                              cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+        rows = _parse(proc.stderr)
+        total = next((cum for _, cum, name in rows if name.strip() == module and name == name.lstrip()), None)
+        if total is None:
+            raise RuntimeError(f"no importtime line for {module}")
+        samples.append(total / 1000)
+    return {
+        "cumulative_ms": round(statistics.median(samples), 1),
+        "min_ms": round(min(samples), 1),
+        "repeat": repeat,
+        "top": _children(rows, module, top),
+    }
+
+
+def run_importtime(modules: Sequence[str] = MODULES, *, repeat: int = 5) -> Dict[str, Dict[str, Any]]:
+    return {m: measure(m, repeat=repeat) for m in modules}
@@ -0,0 +1,224 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+from bench.fixtures import _COMPANIES, _LOCATIONS, _POSITIONS, load_fixtures
+from lib.req import build_job_meta
+from lib.util import make_doc_id
+
+"""
+MCP 서버 부하 테스트 (streamable-HTTP, 저장소 루트에서)
+
+  python -m bench.mcp_load                                  # 워커 2개 서버를 띄워 payload 도구에 32 에이전트
+  python -m bench.mcp_load --workers 4 --agents 128 --tool search_jobs --fake-es
+  python -m bench.mcp_load --url http://127.0.0.1:8000/mcp --tool mixed
+
+- 에이전트 하나 = MCP 세션 하나, 응답 받자마자 다음 호출 (closed loop)
+- warmup 동안의 호출은 집계에서 뺌, 결과는 requests/s 와 지연 p50/p95/p99
+- --fake-es: bench.standins.FakeES 에 합성 공고를 넣고 서버의 URL 환경변수를 거기로 돌림
+- busy(백프레셔 거절)/timeout 은 도구 에러로 따로 센다
+"""
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TOOLS = ("wanted_detail_payload", "search_jobs", "get_job", "mixed")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(port: int, proc: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"mcp_server exited with {proc.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"mcp_server did not listen on :{port} within {timeout:g}s")
+
+
+def _seed_es(url: str, n: int, seed: int = 7) -> List[str]:
+    from elasticsearch import Elasticsearch, helpers
+
+    rng = random.Random(seed)
+    es = Elasticsearch(url)
+    es.indices.create(index="jobs")
+    urls, actions = [], []
+    for i in range(n):
+        position = rng.choice(_POSITIONS)
+        doc = {
+            "회사이름": rng.choice(_COMPANIES),
+            "포지션": position,
+            "회사 위치": rng.choice(_LOCATIONS),
+            "employmentType": "FULL_TIME",
+            "url": f"https://bench.local/wd/{400000 + i}",
+            "자격 요건": ["관련 경력 3년 이상"],
+            "주요업무": [f"{position} 업무"],
+            "occupationalCategory": ["개발", position.split()[-1]],
+            "experienceRequirements": None,
+            "datePosted": f"2025-11-{rng.randint(1, 28):02d}",
+            "validThrough": rng.choice(["2025-12-31", "2026-01-15", None]),
+        }
+        urls.append(doc["url"])
+        actions.append({"_index": "jobs", "_id": make_doc_id(doc), "_source": doc})
+    helpers.bulk(es, actions)
+    es.close()
+    return urls
+
+
+def _call_factory(tool: str, urls: List[str], rng: random.Random) -> Callable[[], Tuple[str, Dict[str, Any]]]:
+    fx = load_fixtures()
+    rows = fx.wanted_list.get("data", [])
+    jobs = []
+    for row, html in zip(rows, fx.wanted_details):
+        meta = build_job_meta(row["id"], html)
+        jobs.append({"id": row["id"], "name": row["company"]["name"], "position": row["position"], **meta})
+    # 에이전트들이 비슷한 것을 묻는다는 가정: 조합 수가 작아 결과 캐시가 일부 적중
+    searches = [{"position": p.split()[-1]} for p in _POSITIONS] + [{"location": loc.split()[0]} for loc in _LOCATIONS]
+    searches += [{"company": c, "size": 5} for c in _COMPANIES]
+
+    def one(name: str) -> Tuple[str, Dict[str, Any]]:
+        if name == "wanted_detail_payload":
+            return name, {"job_data": rng.choice(jobs)}
+        if name == "search_jobs":
+            return name, dict(rng.choice(searches))
+        return name, {"url": rng.choice(urls)}
+
+    if tool == "mixed":
+        names = ["search_jobs"] * 6 + ["get_job"] * 3 + ["wanted_detail_payload"]
+        return lambda: one(rng.choice(names))
+    return lambda: one(tool)
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def _agent(url: str, next_call: Callable[[], Tuple[str, Dict[str, Any]]], *, warmup_end: float, end: float,
+                 latencies: List[float], errors: Dict[str, int]) -> None:
+    async with streamablehttp_client(url) as (read, write, _):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            while time.perf_counter() < end:
+                name, arguments = next_call()
+                t0 = time.perf_counter()
+                try:
+                    res = await session.call_tool(name, arguments)
+                    err = None
+                    if res.isError:
+                        text = res.content[0].text if res.content else ""
+                        err = "busy" if "server busy" in text else "timeout" if "timed out" in text else "tool_error"
+                except Exception as e:  # 전송 오류도 집계만 하고 계속
+                    err = type(e).__name__
+                if t0 < warmup_end:
+                    continue
+                if err:
+                    errors[err] = errors.get(err, 0) + 1
+                else:
+                    latencies.append(time.perf_counter() - t0)
+
+
+async def run_load(url: str, *, tool: str, agents: int, duration: float, warmup: float,
+                   urls: List[str], seed: int = 7) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    next_call = _call_factory(tool, urls, rng)
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    start = time.perf_counter()
+    warmup_end, end = start + warmup, start + warmup + duration
+    await asyncio.gather(*(_agent(url, next_call, warmup_end=warmup_end, end=end,
+                                  latencies=latencies, errors=errors) for _ in range(agents)))
+    measured = max(1e-9, time.perf_counter() - warmup_end)
+    latencies.sort()
+    ms = lambda q: round(_percentile(latencies, q) * 1000, 2)
+    return {
+        "tool": tool,
+        "agents": agents,
+        "duration_s": round(measured, 2),
+        "requests": len(latencies),
+        "requests_per_s": round(len(latencies) / measured, 1),
+        "latency_ms": {"p50": ms(0.50), "p95": ms(0.95), "p99": ms(0.99),
+                       "max": round(latencies[-1] * 1000, 2) if latencies else 0.0},
+        "errors": errors,
+    }
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="MCP 서버 부하 테스트 (streamable-HTTP)")
+    ap.add_argument("--url", default=None, help="이미 떠 있는 서버 (예: http://127.0.0.1:8000/mcp). 없으면 직접 띄움")
+    ap.add_argument("--workers", type=int, default=2, help="직접 띄울 때 uvicorn 워커 수")
+    ap.add_argument("--max-concurrency", type=int, default=None, help="직접 띄울 때 워커당 동시 도구 호출 수")
+    ap.add_argument("--tool", choices=TOOLS, default="wanted_detail_payload")
+    ap.add_argument("--agents", type=int, default=32, help="동시 MCP 세션 수")
+    ap.add_argument("--duration", type=float, default=10.0, help="측정 시간(초)")
+    ap.add_argument("--warmup", type=float, default=2.0, help="집계에서 뺄 앞부분(초)")
+    ap.add_argument("--fake-es", action="store_true", help="FakeES 를 띄워 search_jobs/get_job 백엔드로 사용")
+    ap.add_argument("--docs", type=int, default=2000, help="--fake-es 에 넣을 공고 수")
+    ap.add_argument("--json", default=None, help="결과를 JSON 으로 저장할 경로")
+    return ap.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.tool in ("search_jobs", "get_job", "mixed") and not (args.fake_es or args.url or os.getenv("URL")):
+        print("search_jobs/get_job 은 ES 가 필요: --fake-es 를 주거나 URL 환경변수를 설정", file=sys.stderr)
+        return 2
+
+    with ExitStack() as stack:
+        env = dict(os.environ)
+        urls: List[str] = []
+        if args.fake_es:
+            from bench.standins import FakeES
+            fes = stack.enter_context(FakeES())
+            urls = _seed_es(fes.url, args.docs)
+            env["URL"] = fes.url
+            env.pop("ELASTIC_API", None)
+
+        url = args.url
+        if url is None:
+            port = _free_port()
+            cmd = [sys.executable, "mcp_server.py", "--transport", "streamable-http",
+                   "--port", str(port), "--workers", str(args.workers)]
+            if args.max_concurrency:
+                cmd += ["--max-concurrency", str(args.max_concurrency)]
+            proc = subprocess.Popen(cmd, cwd=REPO_ROOT, env=env)
+            stack.callback(proc.wait, 15)
+            stack.callback(proc.terminate)
+            _wait_ready(port, proc)
+            url = f"http://127.0.0.1:{port}/mcp"
+
+        result = asyncio.run(run_load(url, tool=args.tool, agents=args.agents, duration=args.duration,
+                                      warmup=args.warmup, urls=urls))
+
+    result["server"] = {"url": args.url or "spawned", "workers": None if args.url else args.workers}
+    lat = result["latency_ms"]
+    print(f"{result['tool']}: {result['requests']} req in {result['duration_s']}s = {result['requests_per_s']}/s  "
+          f"p50 {lat['p50']}ms  p95 {lat['p95']}ms  p99 {lat['p99']}ms  max {lat['max']}ms  "
+          f"errors {result['errors'] or 0}", file=sys.stderr)
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
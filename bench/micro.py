@@ -0,0 +1,93 @@
+from __future__ import annotations
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from bs4 import BeautifulSoup
+
+from bench.fixtures import Fixtures
+from lib.llm_backend import FakeBackend
+from lib.req import (
+    build_job_meta,
+    build_llm_payload,
+    extract_jobposting_jsonld_fields,
+    parse_jobkorea_li,
+    parse_saramin_list_html,
+)
+from lib.util import coerce_job_record, normalize_record, parse_job_json
+
+"""
+파서/정규화 함수 마이크로 벤치마크
+
+함수마다 min_time 초 이상 돌린 묶음을 repeat 번 재서 호출 1회당 중앙값(us)과 초당 호출 수를 낸다.
+입력은 bench/fixtures.py 의 픽스처 (녹화본이 있으면 녹화본).
+"""
+
+
+def _time(fn: Callable[[], Any], *, repeat: int, min_time: float) -> Dict[str, float]:
+    # 한 묶음이 min_time 을 넘도록 반복 횟수를 먼저 정함
+    n = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        dt = time.perf_counter() - t0
+        if dt >= min_time:
+            break
+        n *= 2
+    samples = [dt / n]
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        samples.append((time.perf_counter() - t0) / n)
+    med = statistics.median(samples)
+    return {
+        "per_call_us": round(med * 1e6, 2),
+        "min_us": round(min(samples) * 1e6, 2),
+        "ops_per_s": round(1.0 / med, 1) if med else None,
+        "loops": n,
+        "repeat": repeat,
+    }
+
+
+def _cases(fx: Fixtures) -> Dict[str, Callable[[], Any]]:
+    saramin = fx.saramin_list
+    lis = BeautifulSoup(fx.jobkorea_list, "html.parser").select("ol.rankList > li")
+    details = fx.wanted_details
+    row = fx.wanted_list["data"][0]
+    meta = build_job_meta(row["id"], details[0])
+    source = {"id": row["id"], "name": row["company"]["name"], "position": row["position"], **meta}
+    payload = build_llm_payload(source)
+    llm_obj = parse_job_json(FakeBackend()._one(payload))
+    normalized = normalize_record(source, llm_obj)
+
+    def jobkorea_li():
+        for li in lis:
+            parse_jobkorea_li(li)
+
+    state = {"i": 0}
+
+    def jsonld():
+        # 상세 페이지를 돌아가며 (같은 문자열만 반복하면 캐시 효과가 섞임)
+        state["i"] = (state["i"] + 1) % len(details)
+        extract_jobposting_jsonld_fields(details[state["i"]])
+
+    return {
+        "parse_saramin_list_html": lambda: parse_saramin_list_html(saramin),
+        f"parse_jobkorea_li x{len(lis)}": jobkorea_li,
+        "extract_jobposting_jsonld_fields": jsonld,
+        "build_job_meta": lambda: build_job_meta(row["id"], details[0]),
+        "build_llm_payload": lambda: build_llm_payload(source),
+        "coerce_job_record": lambda: coerce_job_record(dict(normalized)),
+    }
+
+
+def run_micro(fx: Fixtures, *, repeat: int = 5, min_time: float = 0.2,
+              only: List[str] | None = None) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, fn in _cases(fx).items():
+        if only and not any(o in name for o in only):
+            continue
+        results[name] = _time(fn, repeat=repeat, min_time=min_time)
+    return results
@@ -0,0 +1,64 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import sys
+
+from bench.fixtures import FIXTURE_DIR
+from lib.fetch import close_fetcher, configure_fetcher
+from lib.req import (
+    afetch_jobkorea_list_html,
+    afetch_job_html,
+    afetch_saramin_list_html,
+    afetch_wanted,
+)
+
+"""
+실제 사이트에서 벤치마크 픽스처 녹화 (네트워크 필요, 가끔만)
+
+  python -m bench.record --details 20
+
+bench/fixtures/ 아래에 원티드 목록 1페이지 + 상세 N개, 사람인/잡코리아 목록 1페이지를 저장한다.
+녹화본이 있으면 bench.run 이 합성 픽스처 대신 이것을 쓴다. HTTP 캐시/아카이브는 쓰지 않음.
+"""
+
+
+async def record(details: int, job_group_id: int, rate: float) -> None:
+    configure_fetcher(rate=rate, cache=None, archive=None)
+    try:
+        FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+        listing = await afetch_wanted(job_group_id, limit=max(details, 20), offset=0)
+        (FIXTURE_DIR / "wanted_list.json").write_text(json.dumps(listing, ensure_ascii=False), encoding="utf-8")
+
+        detail_dir = FIXTURE_DIR / "wanted_detail"
+        detail_dir.mkdir(exist_ok=True)
+        for old in detail_dir.glob("*.html"):
+            old.unlink()
+        ids = [row["id"] for row in listing.get("data", [])[:details]]
+        pages = await asyncio.gather(*(afetch_job_html(i) for i in ids), return_exceptions=True)
+        saved = 0
+        for job_id, html in zip(ids, pages):
+            if isinstance(html, Exception):
+                print(f"detail {job_id} failed: {html}", file=sys.stderr)
+                continue
+            (detail_dir / f"{job_id}.html").write_text(html, encoding="utf-8")
+            saved += 1
+
+        (FIXTURE_DIR / "saramin_list.html").write_text(await afetch_saramin_list_html(), encoding="utf-8")
+        (FIXTURE_DIR / "jobkorea_list.html").write_text(await afetch_jobkorea_list_html(), encoding="utf-8")
+        print(f"recorded {saved}/{len(ids)} detail page(s) -> {FIXTURE_DIR}", file=sys.stderr)
+    finally:
+        await close_fetcher()
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="벤치마크 픽스처 녹화 (실제 사이트 접속)")
+    ap.add_argument("--details", type=int, default=20, help="저장할 원티드 상세 페이지 수")
+    ap.add_argument("--job-group", type=int, default=518)
+    ap.add_argument("--rate", type=float, default=2.0, help="호스트별 초당 요청 수")
+    args = ap.parse_args(argv)
+    asyncio.run(record(args.details, args.job_group, args.rate))
+
+
+if __name__ == "__main__":
+    main()
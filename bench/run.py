@@ -0,0 +1,182 @@
+from __future__ import annotations
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from bench.fixtures import load_fixtures
+
+"""
+오프라인 벤치마크 실행기 (저장소 루트에서)
+
+  python -m bench.run                      # micro + e2e, 결과 저장 후 직전 결과와 비교
+  python -m bench.run --only micro
+  python -m bench.run --only importtime         # mcp_server / client import 시간 (-X importtime)
+  python -m bench.run --postings 500 --latency 0.05 --error-rate 0.02 --tokens-per-s 200
+  python -m bench.run --baseline bench/results/<파일>.json --fail-on-regression
+
+결과는 bench/results/<시각>-<커밋>.json. 비교는 같은 이름의 지표끼리만 하고,
+threshold(기본 10%) 넘게 나빠진 지표를 REGRESSION 으로 표시한다.
+"""
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# (경로, 클수록 좋은지)
+E2E_METRICS = [
+    ("cold.postings_per_s", True),
+    ("cold.wall_s", False),
+    ("warm.postings_per_s", True),
+    ("warm.wall_s", False),
+]
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _meta(fx_meta: Dict[str, Any], recorded: bool) -> Dict[str, Any]:
+    return {
+        "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "fixtures": {"recorded": recorded, **fx_meta},
+    }
+
+
+def _get(d: Dict[str, Any], path: str) -> Any:
+    for k in path.split("."):
+        if not isinstance(d, dict) or k not in d:
+            return None
+        d = d[k]
+    return d
+
+
+def _metrics(result: Dict[str, Any]) -> List[Tuple[str, Optional[float], bool]]:
+    out = [(f"micro.{name}.per_call_us", r.get("per_call_us"), False)
+           for name, r in (result.get("micro") or {}).items()]
+    out += [(f"importtime.{mod}.cumulative_ms", r.get("cumulative_ms"), False)
+            for mod, r in (result.get("importtime") or {}).items()]
+    out += [(f"e2e.{p}", _get(result.get("e2e") or {}, p), hib) for p, hib in E2E_METRICS]
+    return out
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], *, threshold: float) -> Tuple[List[str], int]:
+    """사람이 읽을 비교 줄들과 회귀 개수."""
+    base = {name: v for name, v, _ in _metrics(baseline)}
+    lines, regressions = [], 0
+    for name, cur, higher_is_better in _metrics(current):
+        old = base.get(name)
+        if cur is None or not old:
+            continue
+        change = (cur - old) / old
+        worse = -change if higher_is_better else change
+        flag = ""
+        if worse > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif worse < -threshold:
+            flag = "  improved"
+        lines.append(f"  {name:<55} {old:>12.2f} -> {cur:>12.2f}  {change:+7.1%}{flag}")
+    return lines, regressions
+
+
+def _previous(exclude: Path) -> Optional[Path]:
+    runs = sorted(p for p in RESULTS_DIR.glob("*.json") if p != exclude)
+    return runs[-1] if runs else None
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="오프라인 벤치마크 (픽스처 + 로컬 사이트/LLM/ES 대역)")
+    ap.add_argument("--only", choices=["micro", "importtime", "e2e"], default=None)
+    ap.add_argument("--filter", default="", help="마이크로 벤치 이름 일부 (쉼표로 여러 개)")
+    ap.add_argument("--repeat", type=int, default=5, help="마이크로 벤치 반복 횟수")
+    ap.add_argument("--min-time", type=float, default=0.2, help="마이크로 벤치 1회 측정 최소 시간(초)")
+    ap.add_argument("--import-repeat", type=int, default=5, help="import 시간 측정 반복 횟수 (새 인터프리터)")
+    ap.add_argument("--postings", type=int, default=200, help="e2e: 원티드 목록에 올릴 공고 수")
+    ap.add_argument("--latency", type=float, default=0.02, help="e2e: 사이트 응답 지연(초)")
+    ap.add_argument("--jitter", type=float, default=0.01, help="e2e: 지연 흔들림(±초)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="e2e: 503 응답 비율")
+    ap.add_argument("--tokens-per-s", type=float, default=400.0, help="e2e: LLM 요청 1건당 생성 속도")
+    ap.add_argument("--ttft", type=float, default=0.05, help="e2e: LLM 첫 토큰까지 시간(초)")
+    ap.add_argument("--max-batch", type=int, default=32, help="e2e: LLM 서버 동시 생성 수")
+    ap.add_argument("--no-warm", action="store_true", help="e2e: 두 번째(증분/304) 실행 생략")
+    ap.add_argument("--fastpath", action="store_true",
+                    help="e2e: 규칙 기반 추출 켜기 (기본은 --no-fastpath 로 모든 공고가 LLM 경로를 지남)")
+    ap.add_argument("--client-arg", action="append", default=[],
+                    help="e2e: client.py 에 그대로 넘길 인자 (예: --client-arg=--no-fastpath)")
+    ap.add_argument("--baseline", default=None, help="비교 기준 결과 JSON (기본: 직전 결과)")
+    ap.add_argument("--threshold", type=float, default=0.10, help="회귀로 볼 변화율")
+    ap.add_argument("--fail-on-regression", action="store_true")
+    ap.add_argument("--no-save", action="store_true")
+    return ap.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    fx = load_fixtures()
+    result: Dict[str, Any] = {"meta": _meta(fx.meta, fx.recorded)}
+
+    if args.only in (None, "micro"):
+        from bench.micro import run_micro
+        only = [f for f in args.filter.split(",") if f]
+        result["micro"] = run_micro(fx, repeat=args.repeat, min_time=args.min_time, only=only)
+        for name, r in result["micro"].items():
+            print(f"micro  {name:<40} {r['per_call_us']:>10.1f} us/call  {r['ops_per_s']:>10.1f}/s", file=sys.stderr)
+
+    if args.only in (None, "importtime"):
+        from bench.importtime import run_importtime
+        result["importtime"] = run_importtime(repeat=args.import_repeat)
+        for mod, r in result["importtime"].items():
+            heavy = ", ".join(f"{t['module']} {t['cumulative_ms']:.0f}" for t in r["top"][:3])
+            print(f"import {mod:<40} {r['cumulative_ms']:>10.1f} ms        ({heavy})", file=sys.stderr)
+
+    if args.only in (None, "e2e"):
+        from bench.e2e import run_e2e
+        result["e2e"] = run_e2e(
+            fx,
+            postings=args.postings,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            tokens_per_s=args.tokens_per_s,
+            ttft=args.ttft,
+            max_batch=args.max_batch,
+            warm=not args.no_warm,
+            client_args=(args.client_arg if args.fastpath else ["--no-fastpath", *args.client_arg]),
+        )
+        for run in ("cold", "warm"):
+            r = result["e2e"].get(run)
+            if r:
+                print(f"e2e    {run:<40} {r['postings']} postings in {r['wall_s']:.2f}s "
+                      f"= {r['postings_per_s']:.1f}/s (indexed {r['indexed']})", file=sys.stderr)
+
+    path = None
+    if not args.no_save:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = RESULTS_DIR / f"{stamp}-{result['meta']['commit'] or 'nogit'}.json"
+        path.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"saved {path}", file=sys.stderr)
+
+    base_path = Path(args.baseline) if args.baseline else _previous(path)
+    if base_path is None:
+        return 0
+    baseline = json.loads(base_path.read_text(encoding="utf-8"))
+    lines, regressions = compare(result, baseline, threshold=args.threshold)
+    print(f"vs {base_path.name} ({_get(baseline, 'meta.commit')}):", file=sys.stderr)
+    for line in lines:
+        print(line, file=sys.stderr)
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
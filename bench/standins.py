@@ -0,0 +1,597 @@
+from __future__ import annotations
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from bench.fixtures import Fixtures
+from lib.llm_backend import FakeBackend
+from lib.payload import approx_tokens
+
+"""
+벤치마크용 로컬 대역 서버 (모두 127.0.0.1 임의 포트, 데몬 스레드)
+
+- FixtureSite : 원티드 API/상세, 잡코리아 Top100, 사람인 목록 경로를 픽스처로 응답
+                latency/jitter(초), error_rate(503 비율), ETag/If-None-Match -> 304
+- FakeOpenAI  : /v1/chat/completions 스트리밍(SSE). 응답 내용은 FakeBackend 와 같고
+                tokens_per_s 속도로 흘려보내며 마지막에 usage 청크 (cached_tokens 포함)
+                max_batch 개까지 동시에 생성, 나머지는 대기 (vLLM 배치 크기 흉내)
+- FakeES      : 색인/매핑/설정/refresh/_bulk/_mget/_doc 과 db.search 가 쓰는 만큼의 _search 를 메모리에서 처리
+                (실제 elasticsearch 클라이언트가 붙음)
+"""
+
+
+class _Server:
+    """ThreadingHTTPServer 를 데몬 스레드로 띄우고 닫는 공통 부분."""
+    handler: type
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self.handler)
+        self._httpd.daemon_threads = True
+        self._httpd.owner = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def owner(self):
+        return self.server.owner
+
+    def log_message(self, *args):
+        pass
+
+    def _body(self) -> bytes:
+        n = int(self.headers.get("content-length") or 0)
+        return self.rfile.read(n) if n else b""
+
+    def _send(self, status: int, body: bytes = b"", ctype: str = "application/json",
+              headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("content-type", ctype)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+
+# ---- 사이트 ----
+@dataclass
+class SiteStats:
+    requests: int = 0
+    errors: int = 0
+    not_modified: int = 0
+    bytes_sent: int = 0
+
+    def as_dict(self) -> dict:
+        return {"requests": self.requests, "errors": self.errors,
+                "not_modified": self.not_modified, "bytes_sent": self.bytes_sent}
+
+
+class _SiteHandler(_Handler):
+    def do_GET(self):
+        site: FixtureSite = self.owner
+        delay, fail = site._draw()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            site._count(errors=1)
+            return self._send(503, b"unavailable", "text/plain", {"retry-after": "0"})
+
+        parts = urlsplit(self.path)
+        routed = site.route(parts.path, parse_qs(parts.query))
+        if routed is None:
+            return self._send(404, b"not found", "text/plain")
+        body, ctype = routed
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+        if self.headers.get("if-none-match") == etag:
+            site._count(not_modified=1)
+            return self._send(304, b"", ctype, {"etag": etag})
+        site._count(bytes_sent=len(body))
+        self._send(200, body, ctype, {"etag": etag})
+
+
+class FixtureSite(_Server):
+    handler = _SiteHandler
+
+    def __init__(self, fixtures: Fixtures, *, postings: int = 200, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, seed: int = 1):
+        self.fx = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.stats = SiteStats()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        # 원티드 목록은 픽스처 행을 postings 개까지 늘림 (상세는 id 로 픽스처를 돌려 씀)
+        # 복제 행은 회사이름을 바꿔서 보드 간 중복 묶기에 전부 걸리지 않게 함
+        base = fixtures.wanted_list.get("data") or []
+        self.wanted_rows = [
+            {**base[i % len(base)], "id": 900000 + i} if i < len(base) else
+            {**base[i % len(base)], "id": 900000 + i, "company": {"name": f"벤치기업{i:05d}"}}
+            for i in range(postings)
+        ] if base else []
+        self._detail_by_id = {}
+        self._jobkorea = fixtures.jobkorea_list.encode()
+        self._saramin = fixtures.saramin_list.encode()
+
+    def _draw(self) -> Tuple[float, bool]:
+        with self._lock:
+            self.stats.requests += 1
+            delay = self.latency + (self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+        return max(0.0, delay), fail
+
+    def _count(self, **kw: int) -> None:
+        with self._lock:
+            for k, v in kw.items():
+                setattr(self.stats, k, getattr(self.stats, k) + v)
+
+    def _detail(self, job_id: int) -> bytes:
+        body = self._detail_by_id.get(job_id)
+        if body is None:
+            html = self.fx.wanted_details[job_id % len(self.fx.wanted_details)]
+            body = self._detail_by_id[job_id] = html.encode()
+        return body
+
+    def route(self, path: str, query: Dict[str, List[str]]) -> Optional[Tuple[bytes, str]]:
+        if path == "/api/chaos/navigation/v1/results":
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", ["20"])[0])
+            data = self.wanted_rows[offset:offset + limit]
+            return json.dumps({"data": data}, ensure_ascii=False).encode(), "application/json"
+        m = re.fullmatch(r"/wd/(\d+)", path)
+        if m:
+            return self._detail(int(m.group(1))), "text/html; charset=utf-8"
+        # 목록 사이트는 페이지가 바뀌어도 같은 목록 -> 크롤러가 "새 행 없음" 으로 멈춤
+        if path.startswith("/Top100"):
+            return self._jobkorea, "text/html; charset=utf-8"
+        if path.startswith("/zf_user/jobs/list"):
+            return self._saramin, "text/html; charset=utf-8"
+        return None
+
+    def urls(self) -> Dict[str, str]:
+        """lib.req 의 URL 상수를 이 서버로 돌릴 값."""
+        return {
+            "API": f"{self.url}/api/chaos/navigation/v1/results",
+            "DETAIL_URL": f"{self.url}/wd/{{id}}",
+            "LIST_URL": f"{self.url}/Top100/",
+            "SARAMIN_LIST_URL": f"{self.url}/zf_user/jobs/list/job-category?cat_mcls=2",
+        }
+
+
+# ---- OpenAI 호환 LLM ----
+@dataclass
+class LLMServerStats:
+    requests: int = 0
+    completion_tokens: int = 0
+    max_running: int = 0
+
+    def as_dict(self) -> dict:
+        return {"requests": self.requests, "completion_tokens": self.completion_tokens,
+                "max_running": self.max_running}
+
+
+class _OpenAIHandler(_Handler):
+    def do_POST(self):
+        srv: FakeOpenAI = self.owner
+        if not self.path.endswith("/chat/completions"):
+            return self._send(404, b"{}")
+        req = json.loads(self._body() or b"{}")
+        messages = req.get("messages") or []
+        system = next((m.get("content") or "" for m in messages if m.get("role") == "system"), "")
+        user = next((m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), "")
+        content = srv.fake._one(user)
+        prompt_tokens = approx_tokens(system) + approx_tokens(user)
+        cached = srv.prefix_hit(system)
+
+        if not req.get("stream"):
+            srv.generate(content, None)
+            body = {
+                "id": "cmpl-bench", "object": "chat.completion", "created": int(time.time()), "model": req.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": srv.usage(prompt_tokens, content, cached),
+            }
+            return self._send(200, json.dumps(body).encode())
+
+        self.send_response(200)
+        self.send_header("content-type", "text/event-stream")
+        self.send_header("transfer-encoding", "chunked")
+        self.end_headers()
+        base = {"id": "cmpl-bench", "object": "chat.completion.chunk", "created": int(time.time()),
+                "model": req.get("model")}
+
+        def event(obj: Any) -> None:
+            data = b"data: " + (obj if isinstance(obj, bytes) else json.dumps(obj).encode()) + b"\n\n"
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+        srv.generate(content, lambda piece: event(
+            {**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": piece},
+                                  "finish_reason": None}]}))
+        event({**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""},
+                                    "finish_reason": "stop"}]})
+        if (req.get("stream_options") or {}).get("include_usage"):
+            event({**base, "choices": [], "usage": srv.usage(prompt_tokens, content, cached)})
+        event(b"[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class FakeOpenAI(_Server):
+    handler = _OpenAIHandler
+
+    def __init__(self, *, tokens_per_s: float = 400.0, ttft: float = 0.05, max_batch: int = 32,
+                 chunk_tokens: int = 8):
+        self.tokens_per_s = tokens_per_s
+        self.ttft = ttft
+        self.chunk_tokens = chunk_tokens
+        self.fake = FakeBackend()
+        self.stats = LLMServerStats()
+        self._slots = threading.BoundedSemaphore(max_batch)
+        self._lock = threading.Lock()
+        self._running = 0
+        self._seen_prefixes: set = set()
+
+    def prefix_hit(self, system: str) -> int:
+        """같은 시스템 프롬프트가 두 번째부터는 prefix cache 적중으로 셈."""
+        key = hashlib.sha1(system.encode()).digest()
+        with self._lock:
+            hit = key in self._seen_prefixes
+            self._seen_prefixes.add(key)
+        return approx_tokens(system) if hit else 0
+
+    def usage(self, prompt_tokens: int, content: str, cached: int) -> dict:
+        out = approx_tokens(content)
+        return {"prompt_tokens": prompt_tokens, "completion_tokens": out, "total_tokens": prompt_tokens + out,
+                "prompt_tokens_details": {"cached_tokens": cached}}
+
+    def generate(self, content: str, emit) -> None:
+        # 배치 자리가 날 때까지 대기 -> 첫 토큰까지 ttft -> chunk_tokens 씩 tokens_per_s 속도로
+        with self._slots:
+            with self._lock:
+                self.stats.requests += 1
+                self._running += 1
+                self.stats.max_running = max(self.stats.max_running, self._running)
+            try:
+                time.sleep(self.ttft)
+                step = self.chunk_tokens * 4  # approx_tokens 와 같은 4글자 = 1토큰
+                tokens = approx_tokens(content)
+                for i in range(0, len(content), step):
+                    if self.tokens_per_s:
+                        time.sleep(self.chunk_tokens / self.tokens_per_s)
+                    if emit is not None:
+                        emit(content[i:i + step])
+                with self._lock:
+                    self.stats.completion_tokens += tokens
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+    def base_url(self) -> str:
+        return f"{self.url}/v1"
+
+
+# ---- Elasticsearch ----
+_ES_HEADERS = {"x-elastic-product": "Elasticsearch"}
+
+
+@dataclass
+class ESStats:
+    bulk_requests: int = 0
+    bulk_items: int = 0
+    mget_requests: int = 0
+    mget_ids: int = 0
+    refreshes: int = 0
+    searches: int = 0
+    gets: int = 0
+
+    def as_dict(self) -> dict:
+        return {"bulk_requests": self.bulk_requests, "bulk_items": self.bulk_items,
+                "mget_requests": self.mget_requests, "mget_ids": self.mget_ids, "refreshes": self.refreshes,
+                "searches": self.searches, "gets": self.gets}
+
+
+@dataclass
+class _Index:
+    mappings: Dict[str, Any] = field(default_factory=dict)
+    settings: Dict[str, Any] = field(default_factory=dict)
+    docs: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+def _csv(query: Dict[str, List[str]], name: str) -> List[str]:
+    return [f for v in query.get(name, []) for f in v.split(",") if f]
+
+
+def _tokens(text: Any) -> List[str]:
+    return str(text or "").lower().split()
+
+
+def _es_score(q: Dict[str, Any], doc: Dict[str, Any]) -> Optional[float]:
+    """db.search.build_search_query 가 만드는 쿼리만 지원. 안 맞으면 None."""
+    kind, body = next(iter(q.items()))
+    if kind == "match_all":
+        return 1.0
+    if kind == "bool":
+        score = 0.0
+        for sub in body.get("must") or []:
+            s = _es_score(sub, doc)
+            if s is None:
+                return None
+            score += s
+        for sub in body.get("filter") or []:
+            if _es_score(sub, doc) is None:
+                return None
+        return score or 1.0
+    if kind == "match":
+        fname, spec = next(iter(body.items()))
+        spec = spec if isinstance(spec, dict) else {"query": spec}
+        words = _tokens(doc.get(fname))
+        hit = [t for t in _tokens(spec["query"]) if any(t in w for w in words)]
+        want = len(_tokens(spec["query"])) if spec.get("operator") == "and" else 1
+        return float(len(hit)) if len(hit) >= want else None
+    if kind == "multi_match":
+        words = [w for f in body["fields"] for w in _tokens(doc.get(f.split("^")[0]))]
+        hit = [t for t in _tokens(body["query"]) if any(t in w for w in words)]
+        return float(len(hit)) if hit else None
+    if kind == "prefix":
+        fname, prefix = next(iter(body.items()))
+        v = doc.get(fname.removesuffix(".keyword"))
+        return 0.0 if isinstance(v, str) and v.startswith(prefix) else None
+    if kind == "terms":
+        fname, wanted = next(iter(body.items()))
+        v = doc.get(fname)
+        vals = v if isinstance(v, list) else [v]
+        return 0.0 if any(x in wanted for x in vals) else None
+    if kind == "range":
+        fname, rng = next(iter(body.items()))
+        v = doc.get(fname)
+        if v is None:
+            return None
+        v = str(v)
+        if "gte" in rng and v[:len(rng["gte"])] < rng["gte"]:
+            return None
+        if "lte" in rng and v[:len(rng["lte"])] > rng["lte"]:
+            return None
+        return 0.0
+    raise ValueError(f"bench FakeES: unsupported query {kind}")
+
+
+class _SortKey:
+    """값 없음은 항상 뒤로 (missing=_last), desc 는 비교 반전."""
+    __slots__ = ("v", "desc")
+
+    def __init__(self, v: Any, desc: bool):
+        self.v, self.desc = v, desc
+
+    def __eq__(self, other):
+        return self.v == other.v
+
+    def __lt__(self, other):
+        if self.v is None or other.v is None:
+            return self.v is not None and other.v is None
+        return self.v > other.v if self.desc else self.v < other.v
+
+    def __gt__(self, other):
+        return other < self
+
+
+class _ESHandler(_Handler):
+    def _json(self, status: int, obj: Any) -> None:
+        self._send(status, json.dumps(obj, ensure_ascii=False).encode(), "application/json", _ES_HEADERS)
+
+    def _missing(self, index: str) -> None:
+        self._json(404, {"error": {"type": "index_not_found_exception", "reason": f"no such index [{index}]",
+                                   "index": index}, "status": 404})
+
+    def _dispatch(self):
+        es: FakeES = self.owner
+        parts = urlsplit(self.path)
+        segs = [s for s in parts.path.split("/") if s]
+        query = parse_qs(parts.query)
+        body = self._body()
+        with es.lock:
+            return es.handle(self, self.command, segs, query, body)
+
+    do_GET = do_PUT = do_POST = do_HEAD = do_DELETE = _dispatch
+
+
+class FakeES(_Server):
+    handler = _ESHandler
+
+    def __init__(self):
+        self.indices: Dict[str, _Index] = {}
+        self.stats = ESStats()
+        self.lock = threading.Lock()
+
+    def docs(self, index: str = "jobs") -> Dict[str, Dict[str, Any]]:
+        idx = self.indices.get(index)
+        return idx.docs if idx else {}
+
+    def handle(self, h: _ESHandler, method: str, segs: List[str], query: Dict[str, List[str]], body: bytes):
+        if not segs:
+            return h._json(200, {"name": "bench", "cluster_name": "bench", "version": {"number": "9.0.0"},
+                                 "tagline": "You Know, for Search"})
+        if segs[-1] == "_bulk":
+            return h._json(200, self._bulk(body, segs[0] if len(segs) == 2 else None))
+        if segs[-1] == "_mget":
+            return self._mget(h, segs[0] if len(segs) == 2 else None, query, body)
+
+        name, rest = segs[0], segs[1:]
+        idx = self.indices.get(name)
+        if method == "HEAD" and not rest:
+            return h._send(200 if idx else 404, b"", "application/json", _ES_HEADERS)
+        if method == "PUT" and not rest:
+            req = json.loads(body or b"{}")
+            self.indices[name] = _Index(mappings=req.get("mappings") or {}, settings=req.get("settings") or {})
+            return h._json(200, {"acknowledged": True, "shards_acknowledged": True, "index": name})
+        if idx is None:
+            return h._missing(name)
+        if rest[:1] == ["_mapping"] and method in ("PUT", "POST"):
+            req = json.loads(body or b"{}")
+            idx.mappings.setdefault("properties", {}).update(req.get("properties") or {})
+            return h._json(200, {"acknowledged": True})
+        if rest[:1] == ["_settings"]:
+            if method == "GET":
+                return h._json(200, {name: {"settings": {"index": dict(idx.settings.get("index", {}))},
+                                            "defaults": {"index": {"refresh_interval": "1s"}}}})
+            req = json.loads(body or b"{}")
+            idx.settings.setdefault("index", {}).update(req.get("index") or {})
+            return h._json(200, {"acknowledged": True})
+        if rest[:1] == ["_refresh"]:
+            self.stats.refreshes += 1
+            return h._json(200, {"_shards": {"total": 1, "successful": 1, "failed": 0}})
+        if rest[:1] == ["_doc"] and len(rest) == 2 and method == "GET":
+            self.stats.gets += 1
+            doc = idx.docs.get(rest[1])
+            if doc is not None:
+                excludes = _csv(query, "_source_excludes")
+                doc = {k: v for k, v in doc.items() if k not in excludes}
+            return h._json(200 if doc else 404, {"_index": name, "_id": rest[1], "found": doc is not None,
+                                                 **({"_source": doc} if doc else {})})
+        if rest == ["_search"]:
+            return h._json(200, self._search(idx, query, json.loads(body or b"{}")))
+        return h._json(400, {"error": {"type": "bench_unsupported", "reason": f"{method} /{'/'.join(segs)}"},
+                             "status": 400})
+
+    def _strict_error(self, idx: _Index, source: Dict[str, Any]) -> Optional[dict]:
+        props = idx.mappings.get("properties") or {}
+        if idx.mappings.get("dynamic") != "strict" or not props:
+            return None
+        extra = [k for k in source if k not in props]
+        if not extra:
+            return None
+        return {"type": "strict_dynamic_mapping_exception",
+                "reason": f"mapping set to strict, dynamic introduction of [{extra[0]}] is not allowed"}
+
+    def _bulk(self, body: bytes, default_index: Optional[str]) -> dict:
+        t0 = time.perf_counter()
+        lines = [ln for ln in body.split(b"\n") if ln.strip()]
+        items, errors, i = [], False, 0
+        while i < len(lines):
+            action = json.loads(lines[i])
+            op, meta = next(iter(action.items()))
+            i += 1
+            src = None
+            if op != "delete":
+                src = json.loads(lines[i])
+                i += 1
+            name = meta.get("_index") or default_index
+            idx = self.indices.setdefault(name, _Index())
+            doc_id = meta.get("_id")
+            res = {"_index": name, "_id": doc_id}
+            if op in ("index", "create"):
+                err = self._strict_error(idx, src)
+                if err:
+                    res.update(status=400, error=err)
+                elif op == "create" and doc_id in idx.docs:
+                    res.update(status=409, error={"type": "version_conflict_engine_exception"})
+                else:
+                    res.update(status=200 if doc_id in idx.docs else 201,
+                               result="updated" if doc_id in idx.docs else "created")
+                    idx.docs[doc_id] = src
+            elif op == "update":
+                doc = idx.docs.get(doc_id)
+                if doc is None:
+                    res.update(status=404, error={"type": "document_missing_exception",
+                                                  "reason": f"[{doc_id}]: document missing"})
+                elif "doc" in src:
+                    doc.update(src["doc"])
+                    res.update(status=200, result="updated")
+                else:
+                    # same_as_update 의 painless 스크립트만 흉내: params.url 을 sameAs 에 추가
+                    url = ((src.get("script") or {}).get("params") or {}).get("url")
+                    same = doc.get("sameAs") or []
+                    if url is not None and url not in same:
+                        doc["sameAs"] = same + [url]
+                    res.update(status=200, result="updated")
+            elif op == "delete":
+                found = idx.docs.pop(doc_id, None) is not None
+                res.update(status=200 if found else 404, result="deleted" if found else "not_found")
+            errors = errors or res["status"] >= 300
+            items.append({op: res})
+        self.stats.bulk_requests += 1
+        self.stats.bulk_items += len(items)
+        return {"took": int((time.perf_counter() - t0) * 1000), "errors": errors, "items": items}
+
+    def _search(self, idx: _Index, query: Dict[str, List[str]], req: Dict[str, Any]) -> dict:
+        # 점수는 검색어 토큰이 걸린 개수, 정렬/search_after 는 (값 있음, 값) 튜플 비교로 흉내
+        t0 = time.perf_counter()
+        includes = _csv(query, "_source_includes")
+        sort = [next(iter(s.items())) if isinstance(s, dict) else (s, "asc") for s in req.get("sort") or []]
+        scored = []
+        for doc_id, doc in idx.docs.items():
+            score = _es_score(req.get("query") or {"match_all": {}}, doc)
+            if score is not None:
+                scored.append((doc_id, doc, score))
+
+        def values(doc, score):
+            out = []
+            for fname, spec in sort:
+                out.append(score if fname == "_score" else doc.get(fname))
+            return out
+
+        def key(item):
+            doc_id, doc, score = item
+            k = []
+            for (fname, spec), v in zip(sort, values(doc, score)):
+                order = spec.get("order", "asc") if isinstance(spec, dict) else spec
+                k.append(_SortKey(v, order == "desc"))
+            return k
+
+        scored.sort(key=key)
+        after = req.get("search_after")
+        if after:
+            pivot = [_SortKey(v, (spec.get("order", "asc") if isinstance(spec, dict) else spec) == "desc")
+                     for v, (_, spec) in zip(after, sort)]
+            scored = [it for it in scored if key(it) > pivot]
+        hits = []
+        for doc_id, doc, score in scored[:req.get("size", 10)]:
+            src = {k: doc[k] for k in includes if k in doc} if includes else doc
+            hits.append({"_index": "jobs", "_id": doc_id, "_score": score, "_source": src,
+                         "sort": values(doc, score)})
+        self.stats.searches += 1
+        return {"took": int((time.perf_counter() - t0) * 1000), "timed_out": False,
+                "hits": {"max_score": None, "hits": hits}}
+
+    def _mget(self, h: _ESHandler, index: Optional[str], query: Dict[str, List[str]], body: bytes):
+        req = json.loads(body or b"{}")
+        includes = _csv(query, "_source_includes")
+        specs = req.get("docs") or [{"_id": i} for i in req.get("ids", [])]
+        if index is not None and index not in self.indices:
+            return h._missing(index)
+        docs = []
+        for spec in specs:
+            name = spec.get("_index") or index
+            doc = self.indices.get(name, _Index()).docs.get(spec["_id"])
+            out = {"_index": name, "_id": spec["_id"], "found": doc is not None}
+            if doc is not None:
+                out["_source"] = {k: doc[k] for k in includes if k in doc} if includes else doc
+            docs.append(out)
+        self.stats.mget_requests += 1
+        self.stats.mget_ids += len(specs)
+        return h._json(200, {"docs": docs})
@@ -1,24 +1,145 @@
-import asyncio, hashlib, json
-from langchain_mcp_adapters.client import MultiServerMCPClient
-from langchain.agents import create_agent
+import argparse, asyncio, json, logging
 from pathlib import Path
 from datetime import datetime
-from elasticsearch import helpers
 
-from lib.lchain import llm
-from lib.req import *
-from lib.util import *
-from db.server import es
+from lib.lchain import LLM_PARAMS, LLMUsage
+from lib.llm_backend import BACKENDS, get_backend
+from lib.aimd import AdaptiveConcurrency
+from lib.journal import RunJournal, DEFAULT_JOURNAL_PATH
+from lib.prompt import SYSTEM_PROMPT, PROMPT_VERSION
+from lib.req import (
+    DETAIL_URL, aiter_enriched_jobs, aiter_jobkorea_rows, aiter_saramin_rows, aiter_wanted_rows, shutdown_parse_pool,
+)
+from lib.util import append_ndjson, coerce_job_record, make_doc_id, normalize_record, parse_job_json, row_fingerprint
+from lib.mcp_pool import MCPSessionPool, MCPUnavailable
+from lib.llm_cache import LLMCache, DEFAULT_CACHE_PATH
+from lib.fastpath import fastpath_extract
+from lib.pipeline import Stage, run_pipeline
+from lib.fetch import close_fetcher, configure_fetcher
+from lib.ratelimit import backoff_delay
+from lib.httpcache import HTTPCache, DEFAULT_HTTP_CACHE_PATH
+from lib.archive import PageArchive, DEFAULT_ARCHIVE_DIR
+from lib.dedup import DedupIndex, DEFAULT_DEDUP_PATH, same_as_update
+from lib import metrics
+from db.server import get_es
+from db.indexer import BulkIndexer
+from db.incremental import IncrementalFilter
 
+log = logging.getLogger(__name__)
 
-def make_doc_id(doc: dict) -> str:
-    base = doc.get("url") or json.dumps(doc, ensure_ascii=False, sort_keys=True)
-    return hashlib.sha1(base.encode("utf-8")).hexdigest()
+# ---- crawl sources: fetch는 공용 async 클라이언트(호스트별 풀), HTML 파싱은 프로세스 풀, 결과는 끝나는 순서대로 ----
+def crawl_wanted(args, incremental=None):
+    # 원티드 크롤링: 직군 여러 개 x offset 페이지, 이미 색인된 페이지에 닿으면 그 직군은 중단
+    async def seen_page(rows):
+        urls = [DETAIL_URL.format(id=r["id"]) for r in rows]
+        return await asyncio.to_thread(incremental.all_indexed, urls)
 
-async def main():
-    index_name = "jobs"
+    rows = aiter_wanted_rows(
+        args.wanted_groups,
+        page_size=args.wanted_page_size,
+        max_pages=args.max_pages,
+        stop_when=seen_page if incremental is not None else None,
+    )
+    # 실제 요청 속도/동시성은 fetch 계층의 호스트별 토큰 버킷과 --per-host 가 정한다
+    return aiter_enriched_jobs(rows, max_workers=16)
+
+def crawl_jobkorea(args):
+    # 잡코리아 크롤링
+    return aiter_jobkorea_rows(max_pages=args.jobkorea_pages)
+
+def crawl_saramin(args):
+    # 사람인 크롤링
+    return aiter_saramin_rows(max_pages=args.saramin_pages)
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="채용공고 크롤링 -> 구조화(LLM) -> Elasticsearch 색인")
+    ap.add_argument("--index", default="jobs")
+    ap.add_argument("--wanted-groups", type=lambda v: [int(x) for x in v.split(",") if x],
+                    default=[518], help="원티드 job_group_id 목록 (쉼표 구분)")
+    ap.add_argument("--wanted-page-size", type=int, default=20)
+    ap.add_argument("--max-pages", type=int, default=5, help="원티드 직군별 최대 페이지 수")
+    ap.add_argument("--saramin-pages", type=int, default=5)
+    ap.add_argument("--jobkorea-pages", type=int, default=1)
+    ap.add_argument("--per-host", type=int, default=4, help="호스트별 동시 요청 상한")
+    ap.add_argument("--host-rate", type=float, default=2.0,
+                    help="호스트별 시작 요청/초 (응답 지연·429를 보고 자동 조정)")
+    ap.add_argument("--no-http2", action="store_true", help="h2가 설치돼 있어도 HTTP/1.1 사용")
+    ap.add_argument("--http-cache", default=str(DEFAULT_HTTP_CACHE_PATH), help="조건부 요청 HTTP 캐시(sqlite) 경로")
+    ap.add_argument("--http-cache-mb", type=int, default=512, help="HTTP 캐시 최대 크기(MB, 압축 후)")
+    ap.add_argument("--no-http-cache", action="store_true", help="HTTP 캐시 끄고 항상 전체 다운로드")
+    ap.add_argument("--archive", default=str(DEFAULT_ARCHIVE_DIR), help="원본 페이지 아카이브 디렉터리")
+    ap.add_argument("--no-archive", action="store_true", help="가져온 페이지를 아카이브에 기록하지 않음")
+    ap.add_argument("--replay", action="store_true",
+                    help="네트워크 없이 아카이브에서 페이지를 읽어 파싱/LLM/색인만 다시 실행 (--full 포함)")
+    ap.add_argument("--mcp-sessions", type=int, default=2, help="상시 띄워둘 MCP 서버 프로세스 수")
+    ap.add_argument("--payload-batch", type=int, default=50, help="build_payloads_batch 1회당 공고 수")
+    ap.add_argument("--llm-concurrency", type=int, default=8, help="동시에 보낼 LLM 요청 수 (적응형이면 시작값)")
+    ap.add_argument("--llm-max-concurrency", type=int, default=64, help="적응형 동시성 상한")
+    ap.add_argument("--no-adaptive-llm", action="store_true", help="LLM 동시 요청 수를 --llm-concurrency 로 고정")
+    ap.add_argument("--llm-timeout", type=float, default=120.0, help="LLM 요청 1건 타임아웃(초), 넘으면 취소 후 재시도")
+    ap.add_argument("--index-batch", type=int, default=200, help="bulk 1회당 문서 수")
+    ap.add_argument("--index-threads", type=int, default=1, help=">1 이면 parallel_bulk 사용")
+    ap.add_argument("--bulk-load", action="store_true", help="적재 동안 refresh_interval=-1")
+    ap.add_argument("--full", action="store_true", help="증분 필터 끄고 전체 공고를 다시 구조화")
+    ap.add_argument("--fastpath-threshold", type=float, default=0.7,
+                    help="규칙 기반 추출 신뢰도가 이 값 이상이면 LLM 생략")
+    ap.add_argument("--no-fastpath", action="store_true", help="모든 공고를 LLM으로 구조화")
+    ap.add_argument("--llm-cache", default=str(DEFAULT_CACHE_PATH), help="LLM 응답 캐시(sqlite) 경로")
+    ap.add_argument("--no-llm-cache", action="store_true", help="캐시 읽기를 건너뛰고 항상 추론 (결과는 기록)")
+    ap.add_argument("--llm-backend", choices=list(BACKENDS), default="http",
+                    help="http: vLLM 서버 / vllm: 프로세스 안 오프라인 배치(GPU) / fake: 모델 없이 파이프라인 확인")
+    ap.add_argument("--llm-batch", type=int, default=None,
+                    help="LLM 단계 배치 크기 (기본: vllm 백엔드는 256, 그 외 1)")
+    ap.add_argument("--llm-retries", type=int, default=2, help="공고 1건당 LLM 재시도 횟수 (잘못된 JSON/호출 오류)")
+    ap.add_argument("--llm-failures", default=str(Path("out") / "llm_failures.ndjson"),
+                    help="재시도 후에도 실패한 공고 기록(NDJSON)")
+    ap.add_argument("--dedup-db", default=str(DEFAULT_DEDUP_PATH), help="보드 간 중복 공고 LSH 인덱스(sqlite) 경로")
+    ap.add_argument("--no-dedup", action="store_true", help="보드 간 중복 공고 묶기 끄기")
+    ap.add_argument("--journal", default=str(DEFAULT_JOURNAL_PATH), help="실행 저널(NDJSON) 경로")
+    ap.add_argument("--resume", action="store_true",
+                    help="저널을 이어서: 끝난 공고는 건너뛰고 저널의 문서는 바로 색인기로")
+    ap.add_argument("--queue-size", type=int, default=64, help="stage 사이 큐 크기 (메모리 상한)")
+    ap.add_argument("--metrics-json", default=None,
+                    help="실행 지표 JSON 요약 경로 (지연시간 히스토그램/바이트/재시도/큐 깊이/토큰)")
+    ap.add_argument("--metrics-port", type=int, default=None,
+                    help="실행 중 Prometheus 텍스트 지표를 127.0.0.1:PORT/metrics 로 노출")
+    ap.add_argument("--profile", default=None,
+                    help="샘플링 프로파일러 켜고 stage 별 folded stack 을 이 경로에 기록")
+    ap.add_argument("--profile-interval", type=float, default=0.005, help="프로파일러 샘플 간격(초)")
+    args = ap.parse_args(argv)
+    if args.llm_batch is None:
+        args.llm_batch = 256 if args.llm_backend == "vllm" else 1
+    return args
+
+
+async def main(args):
+    index_name = args.index
+    # 지표는 켠 경우에만 모음 (꺼져 있으면 계측 지점은 플래그 확인만 하고 지나감)
+    if args.metrics_json or args.metrics_port or args.profile:
+        metrics.enable()
+    metrics_server = metrics.serve(args.metrics_port) if args.metrics_port else None
+    profiler = metrics.SamplingProfiler(args.profile_interval).start() if args.profile else None
+    if args.replay:
+        # 파서가 바뀌어서 다시 만드는 경우이므로 지문이 같아도 전부 다시 처리
+        args.full = True
+        http_cache = None
+        archive = PageArchive(args.archive, readonly=True)
+    else:
+        http_cache = None if args.no_http_cache else HTTPCache(args.http_cache, max_bytes=args.http_cache_mb * 1024 * 1024)
+        archive = None if args.no_archive else PageArchive(args.archive)
+    configure_fetcher(
+        per_host_limit=args.per_host,
+        http2=not args.no_http2,
+        rate=args.host_rate,
+        cache=http_cache,
+        archive=archive,
+        replay=args.replay,
+    )
     # ndjson_path = Path("./out") / f"jobs_{datetime.now().strftime('%Y%m%d')}.ndjson"
 
+    # langchain/mcp 어댑터 import 는 무거워서 실제 실행 때만 (--help 등은 빠르게)
+    from langchain_mcp_adapters.client import MultiServerMCPClient
     client = MultiServerMCPClient(
         {
             "wanted": {
@@ -29,131 +150,316 @@ async def main():
         }
     )
 
-    SYSTEM_PROMPT = """역할: 채용공고 구조화(Structuring) 에이전트
-
-목표
-- 입력으로 받은 “공고 문자열”(예: id/company_name/position/title_tag/meta_description/url 포함)을 분석해
-- 아래 스키마의 JSON 객체 1개를 “오직 JSON만” 반환한다.
-
-입력 형식(예시)
-첫번째 버전:
-  - id: ...
-  - company_name: ...
-  - position: ...
-  - title_tag: ...
-  - meta_description: ...
-  - url: ...
-두번째 버전:
-    "회사이름",
-    "포지션",
-    "title",
-    "title_tag",
-    "description",
-    "meta_description",
-    "url",
-    "employmentType",
-    "datePosted",
-    "occupationalCategory",
-    "validThrough",
-    "experienceRequirements",
-반드시 두 버전 중 하나를 사용 할 것.
-
-출력 스키마(반드시 이 키만 사용)
-{
-  "회사이름": string|null,
-  "포지션": string|null,
-  "회사 위치": string|null,
-  "자격 요건": string[],            // 없으면 []
-  "주요업무": string[],             // 없으면 []
-  "employmentType": string|null,     // 정규직/계약직/인턴 등 명시된 경우만, 없으면 null
-  "datePosted": string|null,         // ISO-8601(YYYY-MM-DD)로 명시된 경우만, 없으면 null
-  "occupationalCategory": string[],  // 입력에서 확실한 경우만, 없으면 []
-  "validThrough": string|null,       // 마감일/지원마감이 명시된 경우만 ISO-8601, 없으면 null
-  "experienceRequirements": string[],// “n년 이상/신입/경력” 등 경험 요구사항만 추려서, 없으면 []
-  "url": string|null
-}
-
-규칙(중요)
-1) 절대 추측하지 말 것
-- 입력 문자열에 근거가 없는 값은 만들지 않는다.
-- 모호하면 null 또는 [].
-
-2) meta_description 파싱 규칙
-- meta_description 내에서 다음 라벨을 탐색해 섹션을 분리:
-  - "회사 위치:" / "회사위치:" / "근무지:" / "위치:"
-  - "자격 요건:" / "자격요건:" / "Requirements:"
-  - "주요 업무:" / "주요업무:" / "업무:" / "Responsibilities:"
-  - "마감:" / "마감일:" / "지원 마감:" / "validThrough:" 등
-- 불릿은 아래 형태를 모두 허용:
-  - "• 항목", "- 항목", "· 항목", "1) 항목", 줄바꿈
-- 불릿을 배열로 만들 때는:
-  - 앞뒤 공백 제거, 비어있으면 제외
-  - 같은 항목 중복 제거
-
-3) experienceRequirements 구성
-- "자격 요건" 항목 중 경험/연차/신입/경력 관련 문장만 추려 배열로 만든다.
-  예: "Python 기반 ... 1년 이상", "경력 무관", "신입 가능"
-- 경험 요구가 meta_description 다른 구간에 분명히 있으면(예: "경력: 3년+") 그것도 포함.
-
-4) 날짜 형식
-- validThrough/datePosted는 입력에 “정확한 날짜”가 있을 때만 ISO-8601(YYYY-MM-DD)로 변환.
-- “상시채용/채용시 마감/마감 임박”처럼 날짜가 없으면 null.
-
-5) 출력 형식 강제
-- 반환은 JSON 한 덩어리만.
-- 코드블록, 설명, 주석, 추가 텍스트 금지.
-
-검증 체크리스트(반환 직전 자체 점검)
-- 모든 키가 스키마와 정확히 일치하는가?
-- 배열 필드는 항상 배열인가?
-- 근거 없는 값(추측)이 들어가 있지 않은가?
-- JSON 파싱 가능한가?
-"""
-    tools = await client.get_tools()
-    tool_map = {t.name: t for t in tools}
-
-    payload = fetch_wanted(limit=20)
-    # 원티드 크롤링
-    rows = extract_name_id_position(payload)
-    enriched = enrich_jobs_with_detail_meta(rows, max_workers=3)
+    # 서버 프로세스는 한 번만 띄우고 모든 호출에서 재사용 (못 띄우면 MCPUnavailable 로 바로 끝냄)
+    try:
+        pool = await MCPSessionPool(client, "wanted", size=args.mcp_sessions).start()
+    except BaseException:
+        await close_fetcher()
+        raise
 
-    # 잡코리아 크롤링
-    job_item = extract_jobkorea_metadata()
-    items = enriched + job_item
+    # 색인기: 버퍼가 차면(문서 수/바이트/시간) streaming bulk, refresh는 마지막에 한 번
+    es = get_es()
+    indexer = BulkIndexer(
+        es, index_name,
+        max_docs=args.index_batch,
+        thread_count=args.index_threads,
+        bulk_load=args.bulk_load,
+    )
 
-    # 사람인 크롤링
-    saram_item = fetch_saramin_list_html()
-    content = parse_saramin_list_html(saram_item)
-    items = items + content
-    actions = []
-    for row in items:
-        # 2) 상세 1건 문자열 확보 (LLM에 한 번에 하나만)
-        text = await tool_map["wanted_detail_payload"].ainvoke({"job_data": row})
-        
-        print(text)
-        # 3) 구조화 LLM 호출(1건 -> JSON 1개)
-        msg = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": text},
-        ]
-        out = await llm.ainvoke(msg)
+    # 0) 실행 저널: 공고별 payload/최종 색인 액션을 먼저 기록 -> 중간에 죽어도 --resume 으로 이어감
+    journal = RunJournal(args.journal, resume=args.resume)
+
+    def row_key(row):
+        return make_doc_id({"url": row["url"]}) if row.get("url") else make_doc_id(row)
+
+    async def resume_stage(rows):
+        return [None if journal.is_done(row_key(r)) else r for r in rows]
+
+    # 1) 증분 필터: 이미 색인돼 있고 내용이 같은 공고는 LLM 앞에서 버림
+    incremental = IncrementalFilter(es, index_name)
+
+    async def changed_stage(rows):
+        return await asyncio.to_thread(incremental.filter, rows)
 
-        # (선택) JSON 파싱 확인
-        obj = json.loads(out.content)
-        obj_normalize = normalize_record(row, obj)
-        doc = coerce_job_record(obj_normalize)
-        # append_ndjson(ndjson_path, obj_normalize)            # 누적 NDJSON
+    # 1.2) 보드 간 중복: 묶음의 대표만 다음 단계로, 나머지는 대표 문서의 sameAs 로
+    dedup = None if args.no_dedup else DedupIndex(args.dedup_db)
 
-        actions.append({
+    def dedup_rows(rows):
+        out, links = [], []
+        for row in rows:
+            res = dedup.assign(row)
+            if res is None or res[0] == row.get("url"):
+                out.append(row)
+                continue
+            rep, rep_emitted = res
+            out.append(None)
+            if rep_emitted:
+                # 대표의 index 액션이 이미 색인기에 있으면 update 로 붙임 (아니면 대표가 들어갈 때 add_actions 에서)
+                link = same_as_update(index_name, make_doc_id({"url": rep}), row["url"])
+                journal.record(row_key(row), "action", link)
+                links.append(link)
+        if links:
+            indexer.add_many(links)
+        return out
+
+    def add_actions(actions):
+        # 대표 문서는 색인기에 넣은 다음에 emitted 표시: 그 전에 sameAs update 가 먼저 나가면
+        # 문서가 아직 없어서(document_missing) 링크가 사라진다. 색인기는 update 를 index 뒤에 보냄
+        indexer.add_many(actions)
+        if dedup is None:
+            return
+        links = []
+        for a in actions:
+            src = a.get("_source") or {}
+            if a.get("_op_type") != "index" or not src.get("url"):
+                continue
+            for dup in dedup.mark_emitted(src["url"], src.get("sameAs") or []):
+                link = same_as_update(index_name, a["_id"], dup)
+                journal.record(make_doc_id({"url": dup}), "action", link)
+                links.append(link)
+        if links:
+            indexer.add_many(links)
+
+    async def dedup_stage(rows):
+        return await asyncio.to_thread(dedup_rows, rows)
+
+    def to_action(row, obj):
+        with metrics.timed("normalize_seconds"):
+            obj_normalize = normalize_record(row, obj)
+            doc = coerce_job_record(obj_normalize)
+            doc["content_fingerprint"] = row_fingerprint(row)
+        if dedup is not None and row.get("url"):
+            doc["sameAs"] = dedup.same_as(row["url"])
+        action = {
             "_op_type": "index",
             "_index": index_name,
             "_id": make_doc_id(doc),
             "_source": doc,
-        })
+        }
+        journal.record(row_key(row), "action", action)
+        return action
+
+    # 1.5) 규칙 기반 추출: 신뢰도가 충분한 행은 LLM 없이 바로 색인으로
+    fastpath_hits = 0
+
+    async def fastpath_stage(rows):
+        nonlocal fastpath_hits
+        rest, done = [], []
+        for row in rows:
+            rec, conf = fastpath_extract(row)
+            if conf >= args.fastpath_threshold:
+                done.append(to_action(row, rec))
+            else:
+                rest.append(row)
+        if done:
+            fastpath_hits += len(done)
+            await asyncio.to_thread(add_actions, done)
+        return rest
+
+    # 2) 입력 문자열: 모인 만큼 묶어서 JSON-RPC 한 번에
+    async def payload_stage(rows):
+        # 저널에 payload 가 있는 공고(LLM 단계에서 멈춘 것)는 MCP 호출 생략
+        known = [journal.payload_for(row_key(r)) for r in rows]
+        todo = [r for r, p in zip(rows, known) if p is None]
+        results = iter(await pool.call_tool("build_payloads_batch", {"jobs": todo}) if todo else [])
+        out = []
+        for row, payload in zip(rows, known):
+            if payload is not None:
+                out.append((row, payload))
+                continue
+            res = next(results)
+            if not res.get("ok"):
+                metrics.inc("payload_errors_total")
+                log.warning("payload error: %s", res.get("error"))
+                out.append(None)
+                continue
+            journal.record(row_key(row), "payload", res["payload"])
+            out.append((row, res["payload"]))
+        return out
+
+    # 같은 입력(프롬프트+공고 문자열+샘플링 파라미터)은 다시 추론하지 않음
+    llm_cache = LLMCache(args.llm_cache, bypass=args.no_llm_cache)
+    llm_usage = LLMUsage()
 
-        if actions:
-          helpers.bulk(es, actions)
-          es.indices.refresh(index=index_name)
+    # 3) 구조화 LLM 호출(1건 -> JSON 1개)
+    #    http: 워커 N개가 1건씩 동시에 보내 vLLM 배치를 채움 / vllm(offline): 모인 만큼 한 번에 LLM.chat
+    #    잘못된 응답/호출 오류는 공고 단위로 최대 --llm-retries 번 다시 시도, 그래도 안 되면 기록만 하고 건너뜀
+    # http 백엔드: 동시 요청 수를 지연시간/처리량 보고 조절 (--no-adaptive-llm 이면 --llm-concurrency 고정)
+    llm_ctrl = None
+    backend_opts = {}
+    if args.llm_backend == "http":
+        llm_ctrl = AdaptiveConcurrency(
+            args.llm_concurrency,
+            min_limit=args.llm_concurrency if args.no_adaptive_llm else 1,
+            max_limit=args.llm_concurrency if args.no_adaptive_llm else args.llm_max_concurrency,
+            timeout=args.llm_timeout,
+        )
+        backend_opts["controller"] = llm_ctrl
+    backend = get_backend(args.llm_backend, llm_usage, **backend_opts)
+    # 가짜 백엔드 응답이 실제 응답 캐시에 섞이지 않도록 키를 분리
+    cache_params = LLM_PARAMS if backend.name != "fake" else {**LLM_PARAMS, "backend": "fake"}
+    llm_failures = 0
+    failures_path = Path(args.llm_failures)
+
+    async def llm_batch(items):
+        nonlocal llm_failures
+        out = [None] * len(items)
+        keys = [llm_cache.make_key(SYSTEM_PROMPT, text, cache_params) for _, text in items]
+        pending = []
+        for i, key in enumerate(keys):
+            content = llm_cache.get(key)
+            if content is not None:
+                out[i] = to_action(items[i][0], parse_job_json(content))
+            else:
+                pending.append(i)
+
+        errors = {}
+        for attempt in range(args.llm_retries + 1):
+            if not pending:
+                break
+            if attempt:
+                metrics.inc("llm_retries_total", len(pending))
+                await asyncio.sleep(backoff_delay(attempt - 1))
+            # 시스템 프롬프트는 모든 요청에서 바이트 단위로 같음 -> vLLM prefix cache 재사용
+            results = await backend.complete_batch([items[i][1] for i in pending])
+            retry = []
+            for i, content in zip(pending, results):
+                try:
+                    if isinstance(content, Exception):
+                        raise content
+                    obj = parse_job_json(content)
+                except Exception as e:
+                    errors[i] = (e, content if isinstance(content, str) else None)
+                    retry.append(i)
+                    continue
+                # 파싱되는 응답만 캐시에 남긴다
+                llm_cache.put(keys[i], content)
+                out[i] = to_action(items[i][0], obj)
+            pending = retry
+
+        for i in pending:
+            llm_failures += 1
+            metrics.inc("llm_failures_total")
+            err, content = errors[i]
+            journal.record(row_key(items[i][0]), "failed", f"{type(err).__name__}: {err}")
+            await asyncio.to_thread(append_ndjson, failures_path, {
+                "url": items[i][0].get("url"),
+                "attempts": args.llm_retries + 1,
+                "error": f"{type(err).__name__}: {err}",
+                "content": content[:500] if content else None,
+                "at": datetime.now().isoformat(timespec="seconds"),
+            })
+        return out
+
+    async def llm_stage(item):
+        return (await llm_batch([item]))[0]
+
+    # 4) 색인
+    async def index_stage(actions):
+        await asyncio.to_thread(add_actions, actions)
+        return actions
+
+    stages = [] if not args.resume else [
+        Stage("resume", resume_stage, concurrency=1, queue_size=args.queue_size, batch_size=args.payload_batch),
+    ]
+    stages += [] if args.full else [
+        Stage("changed", changed_stage, concurrency=1, queue_size=args.queue_size,
+              batch_size=args.payload_batch),
+    ]
+    if dedup is not None:
+        stages.append(Stage("dedup", dedup_stage, concurrency=1, queue_size=args.queue_size,
+                            batch_size=args.payload_batch))
+    if not args.no_fastpath:
+        stages.append(Stage("fastpath", fastpath_stage, concurrency=1, queue_size=args.queue_size,
+                            batch_size=args.payload_batch))
+    stages += [
+        # 도구 오류는 배치만 건너뛰지만, 서버가 재시작 한도를 넘겨 죽으면 실행 전체를 실패로
+        Stage("payload", payload_stage, concurrency=1, queue_size=args.queue_size,
+              batch_size=args.payload_batch, fatal=(MCPUnavailable,)),
+        # 워커는 상한만큼 띄우고 실제 동시 요청 수는 컨트롤러가 정함
+        Stage("llm", llm_stage, concurrency=int(llm_ctrl.max_limit) if llm_ctrl else args.llm_concurrency,
+              queue_size=args.queue_size)
+        if args.llm_batch <= 1 else
+        Stage("llm", llm_batch, concurrency=1, queue_size=max(args.queue_size, args.llm_batch),
+              batch_size=args.llm_batch, batch_timeout=5.0),
+        Stage("index", index_stage, concurrency=1, queue_size=args.queue_size,
+              batch_size=args.index_batch, batch_timeout=1.0),
+    ]
+    await asyncio.to_thread(backend.open)
+    await asyncio.to_thread(indexer.open)
+    if args.resume:
+        # 저널에 있던 문서는 색인 전에 죽었을 수 있으므로 다시 넣음 (같은 _id 라 중복 없음)
+        print(f"resume: {journal.state.as_dict()}")
+        await asyncio.to_thread(add_actions, journal.state.actions)
+    autosync = asyncio.create_task(journal.autosync())
+    try:
+        sources = [
+            crawl_wanted(args, None if args.full else incremental),
+            crawl_jobkorea(args),
+            crawl_saramin(args),
+        ]
+        report = await run_pipeline(sources, stages)
+    finally:
+        autosync.cancel()
+        await asyncio.gather(autosync, return_exceptions=True)
+        journal.close()
+        await pool.close()
+        await close_fetcher()
+        stats = await asyncio.to_thread(indexer.close)
+        llm_cache.close()
+        backend.close()
+        if http_cache is not None:
+            http_cache.close()
+        if archive is not None:
+            archive.close()
+        if dedup is not None:
+            dedup.close()
+        shutdown_parse_pool()
+        if profiler is not None:
+            profiler.stop()
+        if metrics_server is not None:
+            metrics_server.shutdown()
+
+    print(report.format())
+    if not args.full:
+        print(f"incremental: {incremental.stats.as_dict()}")
+    if dedup is not None:
+        print(f"dedup: {dedup.stats.as_dict()}")
+    print(f"fastpath: {fastpath_hits} posting(s) indexed without LLM")
+    print(f"llm cache: {llm_cache.stats.as_dict()}")
+    print(f"llm usage (prompt {PROMPT_VERSION}): {llm_usage.as_dict()}")
+    if llm_ctrl is not None:
+        print(f"llm concurrency: {llm_ctrl.snapshot()}")
+    if llm_failures:
+        print(f"llm failures: {llm_failures} posting(s) skipped, see {failures_path}")
+    if http_cache is not None:
+        print(f"http cache: {http_cache.stats.as_dict()}")
+    if archive is not None:
+        print(f"archive: {archive.stats.as_dict()}")
+    print(f"journal: {journal.written} record(s), {journal.syncs} fsync(s) -> {journal.path}")
+    print(f"indexer: {stats.as_dict()}")
+    for f in stats.failures[:20]:
+        print(f"  index failure: {f}")
+    if profiler is not None:
+        print(f"profile: {profiler.taken} sample(s) -> {profiler.write(args.profile)}")
+    if args.metrics_json:
+        path = metrics.write_summary(args.metrics_json, {
+            "pipeline": report.as_dict(),
+            "incremental": incremental.stats.as_dict() if not args.full else None,
+            "dedup": dedup.stats.as_dict() if dedup is not None else None,
+            "fastpath_hits": fastpath_hits,
+            "llm_cache": llm_cache.stats.as_dict(),
+            "llm_usage": {"prompt_version": PROMPT_VERSION, **llm_usage.as_dict()},
+            "llm_concurrency": llm_ctrl.snapshot() if llm_ctrl is not None else None,
+            "llm_failures": llm_failures,
+            "http_cache": http_cache.stats.as_dict() if http_cache is not None else None,
+            "archive": archive.stats.as_dict() if archive is not None else None,
+            "indexer": stats.as_dict(),
+            "profile": profiler.top() if profiler is not None else None,
+        })
+        print(f"metrics: {path}")
+    return report
 
 
-asyncio.run(main())
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
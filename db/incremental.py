@@ -0,0 +1,89 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from elasticsearch import Elasticsearch, NotFoundError
+
+from lib import metrics
+from lib.util import make_doc_id, row_fingerprint
+
+"""
+증분 크롤링 필터
+
+LLM 단계 전에 후보 행들의 문서 id(make_doc_id)를 mget 한 번으로 조회해서
+이미 색인돼 있고 content_fingerprint 가 같은 행은 버린다.
+새 공고 / 내용이 바뀐 공고만 vLLM 으로 보내므로 LLM 비용이 변경량에 비례한다.
+"""
+
+
+@dataclass
+class IncrementalStats:
+    checked: int = 0
+    new: int = 0
+    changed: int = 0
+    unchanged: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "checked": self.checked,
+            "new": self.new,
+            "changed": self.changed,
+            "unchanged": self.unchanged,
+        }
+
+
+class IncrementalFilter:
+    def __init__(self, es: Elasticsearch, index_name: str = "jobs", *, chunk_size: int = 500):
+        self.es = es
+        self.index_name = index_name
+        self.chunk_size = chunk_size
+        self.stats = IncrementalStats()
+
+    def _indexed_fingerprints(self, ids: List[str]) -> Dict[str, Optional[str]]:
+        """id -> 저장된 지문 (문서가 없으면 키 자체가 없음)."""
+        found: Dict[str, Optional[str]] = {}
+        for start in range(0, len(ids), self.chunk_size):
+            chunk = ids[start:start + self.chunk_size]
+            try:
+                with metrics.timed("es_mget_seconds"):
+                    resp = self.es.mget(
+                        index=self.index_name,
+                        ids=chunk,
+                        source_includes=["content_fingerprint"],
+                    )
+            except NotFoundError:
+                # 인덱스가 (아직/더는) 없으면 남은 공고는 전부 새 공고. 앞 묶음에서 찾은 지문은 그대로 둠
+                break
+            for d in resp.get("docs", []):
+                if d.get("found"):
+                    found[d["_id"]] = (d.get("_source") or {}).get("content_fingerprint")
+        return found
+
+    def all_indexed(self, urls: List[str]) -> bool:
+        """url 들이 전부 이미 색인돼 있는지 (목록 페이지 크롤링을 어디서 멈출지 판단용)."""
+        ids = list(dict.fromkeys(make_doc_id({"url": u}) for u in urls if u))
+        if not ids:
+            return False
+        return len(self._indexed_fingerprints(ids)) == len(ids)
+
+    def filter(self, rows: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        rows와 같은 길이의 리스트를 반환. 건너뛸 행은 None.
+        url이 없는 행은 문서 id가 LLM 결과에 따라 달라지므로 항상 새 공고로 취급.
+        """
+        ids = [make_doc_id(r) if r.get("url") else None for r in rows]
+        indexed = self._indexed_fingerprints(list(dict.fromkeys(i for i in ids if i)))
+
+        out: List[Optional[Dict[str, Any]]] = []
+        for row, doc_id in zip(rows, ids):
+            self.stats.checked += 1
+            if doc_id is None or doc_id not in indexed:
+                self.stats.new += 1
+            elif indexed[doc_id] != row_fingerprint(row):
+                self.stats.changed += 1
+            else:
+                self.stats.unchanged += 1
+                out.append(None)
+                continue
+            out.append(row)
+        return out
@@ -0,0 +1,213 @@
+from __future__ import annotations
+import itertools
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from elasticsearch import Elasticsearch, helpers
+
+from db.search import touch_refresh_stamp
+from db.server import ensure_job_index
+from lib import metrics
+
+"""
+스트리밍 bulk 색인기
+
+- 문서를 버퍼에 모았다가 (문서 수 / 바이트 / 경과 시간) 중 하나라도 넘으면 flush
+- flush는 helpers.streaming_bulk (thread_count > 1 이면 parallel_bulk)
+- flush 는 한 번에 하나씩 (들어온 순서대로 나감), 한 flush 안에서는 update 를 index/delete 다음에 보냄
+  (parallel_bulk 청크 순서가 섞여도 sameAs update 가 아직 없는 대표 문서에 먼저 닿지 않게)
+- refresh는 close() 때 한 번, 또는 refresh_every 초마다
+- 문서 단위 실패는 예외 대신 failures 에 쌓는다
+- bulk_load=True 면 적재 동안 refresh_interval=-1, 끝나면 원래 값으로 복구
+"""
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class IndexerStats:
+    indexed: int = 0
+    failed: int = 0
+    flushes: int = 0
+    bytes_sent: int = 0
+    refreshes: int = 0
+    failures: List[Dict[str, Any]] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "indexed": self.indexed,
+            "failed": self.failed,
+            "flushes": self.flushes,
+            "bytes_sent": self.bytes_sent,
+            "refreshes": self.refreshes,
+        }
+
+
+class BulkIndexer:
+    def __init__(
+        self,
+        es: Elasticsearch,
+        index_name: str = "jobs",
+        *,
+        max_docs: int = 500,
+        max_bytes: int = 5 * 1024 * 1024,
+        max_age: float = 5.0,
+        refresh_every: Optional[float] = None,
+        thread_count: int = 1,
+        bulk_load: bool = False,
+        max_failures_kept: int = 1000,
+    ):
+        self.es = es
+        self.index_name = index_name
+        self.max_docs = max_docs
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.refresh_every = refresh_every
+        self.thread_count = thread_count
+        self.bulk_load = bulk_load
+        self.max_failures_kept = max_failures_kept
+
+        self.stats = IndexerStats()
+        self._buf: List[Dict[str, Any]] = []
+        self._buf_bytes = 0
+        self._buf_since: Optional[float] = None
+        self._last_refresh = time.monotonic()
+        self._saved_refresh_interval: Optional[str] = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    # ---- lifecycle ----
+    def open(self) -> "BulkIndexer":
+        ensure_job_index(self.es, self.index_name)
+        if self.bulk_load:
+            settings = self.es.indices.get_settings(
+                index=self.index_name, name="index.refresh_interval", include_defaults=True
+            )
+            idx = settings.get(self.index_name, {})
+            cur = (
+                idx.get("settings", {}).get("index", {}).get("refresh_interval")
+                or idx.get("defaults", {}).get("index", {}).get("refresh_interval")
+                or "1s"
+            )
+            self._saved_refresh_interval = cur
+            self.es.indices.put_settings(index=self.index_name, settings={"index": {"refresh_interval": "-1"}})
+            log.info("bulk load: %s refresh_interval %s -> -1", self.index_name, cur)
+        return self
+
+    def close(self) -> IndexerStats:
+        try:
+            self.flush()
+        finally:
+            if self._saved_refresh_interval is not None:
+                self.es.indices.put_settings(
+                    index=self.index_name,
+                    settings={"index": {"refresh_interval": self._saved_refresh_interval}},
+                )
+                self._saved_refresh_interval = None
+            self.refresh()
+        return self.stats
+
+    def __enter__(self) -> "BulkIndexer":
+        return self.open()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---- write path ----
+    def add(self, action: Dict[str, Any]) -> None:
+        """index/update/delete 액션 1건. 임계치를 넘으면 바로 flush."""
+        action.setdefault("_index", self.index_name)
+        size = len(json.dumps(action.get("_source") or action.get("doc") or {}, ensure_ascii=False).encode("utf-8"))
+        with self._lock:
+            if self._buf_since is None:
+                self._buf_since = time.monotonic()
+            self._buf.append(action)
+            self._buf_bytes += size
+            due = self._due()
+        if due:
+            self.flush()
+
+    def add_many(self, actions: Iterable[Dict[str, Any]]) -> None:
+        for a in actions:
+            self.add(a)
+        self.maybe_flush()
+
+    def maybe_flush(self) -> None:
+        """시간 기준 임계치 점검 (주기적으로 불러주면 됨)."""
+        with self._lock:
+            due = self._due()
+        if due:
+            self.flush()
+        if self.refresh_every is not None and time.monotonic() - self._last_refresh >= self.refresh_every:
+            self.refresh()
+
+    def _due(self) -> bool:
+        if not self._buf:
+            return False
+        if len(self._buf) >= self.max_docs or self._buf_bytes >= self.max_bytes:
+            return True
+        return self._buf_since is not None and time.monotonic() - self._buf_since >= self.max_age
+
+    def flush(self) -> None:
+        # 버퍼를 꺼내는 것부터 전송 끝까지 한 flush 씩: 나중 배치가 앞 배치를 앞지르지 않게
+        with self._flush_lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        with self._lock:
+            batch, nbytes = self._buf, self._buf_bytes
+            self._buf, self._buf_bytes, self._buf_since = [], 0, None
+        if not batch:
+            return
+
+        t0 = time.perf_counter()
+        kwargs = dict(
+            chunk_size=self.max_docs,
+            max_chunk_bytes=self.max_bytes,
+            raise_on_error=False,
+            raise_on_exception=False,
+        )
+        primary = [a for a in batch if a.get("_op_type") != "update"]
+        updates = [a for a in batch if a.get("_op_type") == "update"]
+        if self.thread_count > 1:
+            results = helpers.parallel_bulk(self.es, primary, thread_count=self.thread_count, **kwargs)
+        else:
+            results = helpers.streaming_bulk(self.es, primary, **kwargs)
+        if updates:
+            results = itertools.chain(results, helpers.streaming_bulk(self.es, updates, **kwargs))
+
+        ok_n = fail_n = 0
+        for ok, item in results:
+            if ok:
+                ok_n += 1
+                continue
+            fail_n += 1
+            if len(self.stats.failures) < self.max_failures_kept:
+                op, info = next(iter(item.items()))
+                self.stats.failures.append({
+                    "op": op,
+                    "_id": info.get("_id"),
+                    "status": info.get("status"),
+                    "error": info.get("error") or info.get("exception"),
+                })
+
+        self.stats.indexed += ok_n
+        self.stats.failed += fail_n
+        self.stats.flushes += 1
+        self.stats.bytes_sent += nbytes
+        metrics.observe("index_flush_seconds", time.perf_counter() - t0)
+        metrics.inc("index_docs_total", ok_n, result="ok")
+        metrics.inc("index_docs_total", fail_n, result="failed")
+        metrics.inc("index_bytes_total", nbytes)
+        if fail_n:
+            log.warning("bulk flush: %d ok, %d failed", ok_n, fail_n)
+
+    def refresh(self) -> None:
+        self.es.indices.refresh(index=self.index_name)
+        self.stats.refreshes += 1
+        touch_refresh_stamp(self.index_name)  # 검색 결과 캐시 무효화
+        self._last_refresh = time.monotonic()
@@ -0,0 +1,375 @@
+from __future__ import annotations
+import asyncio
+import base64
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional
+
+from lib import metrics
+from lib.util import make_doc_id
+
+if TYPE_CHECKING:
+    from elasticsearch import Elasticsearch
+
+"""
+jobs 인덱스 검색 (MCP 도구 search_jobs / get_job 용)
+
+- 필드는 JOB_INDEX_TEMPLATE 그대로: 회사이름/포지션(text), 회사 위치.keyword(접두어),
+  occupationalCategory(keyword), validThrough(date 범위)
+- 검색어 조건만 점수 계산(must), 나머지는 filter (ES 쪽 필터 캐시 대상)
+- _source 는 목록에 필요한 필드만, 전체 건수는 세지 않고 size+1 개로 다음 페이지 유무만 판단
+- 페이지는 search_after (마지막 정렬값을 불투명 cursor 문자열로 돌려줌), url 로 동점 정렬
+- 결과 캐시: 프로세스 안 TTL + LRU. 색인기가 refresh 할 때 stamp 파일을 건드리면(touch_refresh_stamp)
+  다음 조회에서 mtime 이 바뀐 것을 보고 캐시를 비움 (다른 호스트면 TTL 만큼만 늦음)
+- 같은 조회가 동시에 여러 개 오면 ES 에는 한 번만 보냄
+- elasticsearch 패키지는 첫 조회 때 import (MCP 서버 기동 시간)
+"""
+
+# 목록에 돌려줄 필드 (긴 본문 필드는 get_job 에서만)
+SEARCH_SOURCE_FIELDS = [
+    "회사이름", "포지션", "회사 위치", "employmentType", "occupationalCategory",
+    "datePosted", "validThrough", "url",
+]
+# get_job 에서 뺄 내부 필드
+GET_SOURCE_EXCLUDES = ["content_fingerprint"]
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 50
+# MCP 서버와 색인기가 다른 디렉터리에서 떠도 같은 파일을 보도록 CWD 가 아니라 저장소 기준 (환경변수로 바꿀 수 있음)
+REFRESH_STAMP_DIR = Path(os.getenv("ES_REFRESH_STAMP_DIR") or Path(__file__).resolve().parent.parent / ".cache")
+
+
+def refresh_stamp_path(index_name: str = "jobs") -> Path:
+    return REFRESH_STAMP_DIR / f"es-refresh-{index_name}.stamp"
+
+
+def touch_refresh_stamp(index_name: str = "jobs") -> None:
+    """색인기가 refresh 한 뒤 호출: 검색 결과 캐시를 무효화하라는 신호."""
+    p = refresh_stamp_path(index_name)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(str(time.time()), encoding="utf-8")
+
+
+class _LeaderCancelled(Exception):
+    """_load: 같은 조회를 먼저 시작한 호출이 취소됨 (기다리던 쪽이 다시 시도)."""
+
+
+# ---- 결과 캐시 ----
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evicted: int = 0
+    invalidations: int = 0
+    coalesced: int = 0
+
+    def as_dict(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "invalidations": self.invalidations,
+            "coalesced": self.coalesced,
+        }
+
+
+class ResultCache:
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0, *,
+                 stamp_path: Optional[Path] = None, check_interval: float = 0.5):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stamp_path = stamp_path
+        self.check_interval = check_interval
+        self.stats = CacheStats()
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stamp: Optional[int] = None
+        self._next_check = 0.0
+
+    def _stamp_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.stamp_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _check_stamp(self, now: float) -> None:
+        # stat 은 check_interval 마다 한 번만
+        if self.stamp_path is None or now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+        mtime = self._stamp_mtime()
+        if mtime != self._stamp:
+            if self._stamp is not None or self._data:
+                self._data.clear()
+                self.stats.invalidations += 1
+            self._stamp = mtime
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            self._check_stamp(now)
+            item = self._data.get(key)
+            if item is None:
+                self.stats.misses += 1
+                return None
+            expires, value = item
+            if expires < now:
+                del self._data[key]
+                self.stats.expired += 1
+                self.stats.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats.evicted += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.stats.invalidations += 1
+
+
+# ---- 쿼리 ----
+def build_search_query(
+    *,
+    query: Optional[str] = None,
+    company: Optional[str] = None,
+    position: Optional[str] = None,
+    location: Optional[str] = None,
+    occupational_category: Optional[List[str]] = None,
+    valid_through_from: Optional[str] = None,
+    valid_through_to: Optional[str] = None,
+) -> Dict[str, Any]:
+    must: List[Dict[str, Any]] = []
+    filters: List[Dict[str, Any]] = []
+    if query:
+        must.append({"multi_match": {"query": query, "fields": ["포지션^2", "회사이름", "주요업무", "자격 요건"]}})
+    if company:
+        must.append({"match": {"회사이름": {"query": company, "operator": "and"}}})
+    if position:
+        must.append({"match": {"포지션": {"query": position, "operator": "and"}}})
+    if location:
+        # "서울" -> "서울 강남구" 도 걸리도록 keyword 접두어
+        filters.append({"prefix": {"회사 위치.keyword": location}})
+    if occupational_category:
+        filters.append({"terms": {"occupationalCategory": list(occupational_category)}})
+    if valid_through_from or valid_through_to:
+        rng = {k: v for k, v in (("gte", valid_through_from), ("lte", valid_through_to)) if v}
+        filters.append({"range": {"validThrough": rng}})
+    if not must and not filters:
+        return {"match_all": {}}
+    return {"bool": {"must": must, "filter": filters}}
+
+
+def _sort(scored: bool) -> List[Dict[str, Any]]:
+    # url 은 문서마다 유일 -> search_after 동점 정렬용
+    if scored:
+        return [{"_score": "desc"}, {"url": "asc"}]
+    return [{"datePosted": {"order": "desc", "missing": "_last"}}, {"url": "asc"}]
+
+
+def encode_cursor(sort_values: List[Any]) -> str:
+    raw = json.dumps(sort_values, ensure_ascii=False, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, json.JSONDecodeError) as e:
+        raise ValueError(f"invalid cursor: {cursor!r}") from e
+    if not isinstance(values, list):
+        raise ValueError(f"invalid cursor: {cursor!r}")
+    return values
+
+
+class JobSearch:
+    """
+    es 는 프로세스에 하나 두고 재사용 (urllib3 커넥션 풀). ES 호출은 스레드로 넘기고
+    동시에 ES 로 나가는 요청 수는 max_concurrency 로 제한 (캐시 적중은 스레드 전환 없이 바로 응답).
+    """
+
+    def __init__(
+        self,
+        es: Optional[Elasticsearch] = None,
+        index_name: str = "jobs",
+        *,
+        cache: Optional[ResultCache] = None,
+        max_concurrency: int = 16,
+        timeout: float = 5.0,
+    ):
+        self._es = es
+        self.index_name = index_name
+        self.cache = cache if cache is not None else ResultCache(stamp_path=refresh_stamp_path(index_name))
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._es_lock = threading.Lock()
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def es(self) -> Elasticsearch:
+        if self._es is None:
+            with self._es_lock:
+                if self._es is None:
+                    from elasticsearch import Elasticsearch
+                    from db.server import API_KEY, URL
+                    # 동시 에이전트 요청용으로 노드당 커넥션을 넉넉히
+                    self._es = Elasticsearch(URL, api_key=API_KEY, connections_per_node=self.max_concurrency,
+                                             request_timeout=self.timeout)
+        return self._es
+
+    # ---- 동기 ----
+    def _search_uncached(self, params: Dict[str, Any], size: int, cursor: Optional[str]) -> Dict[str, Any]:
+        from elasticsearch import NotFoundError
+        q = build_search_query(**params)
+        scored = bool(params.get("query") or params.get("company") or params.get("position"))
+        kwargs: Dict[str, Any] = dict(
+            index=self.index_name,
+            query=q,
+            sort=_sort(scored),
+            size=size + 1,
+            source_includes=SEARCH_SOURCE_FIELDS,
+            track_total_hits=False,
+        )
+        if cursor:
+            kwargs["search_after"] = decode_cursor(cursor)
+        t0 = time.perf_counter()
+        try:
+            resp = self.es.search(**kwargs)
+        except NotFoundError:
+            return {"hits": [], "next_cursor": None, "took_ms": 0}
+        finally:
+            metrics.observe("search_es_seconds", time.perf_counter() - t0, op="search")
+        raw = resp["hits"]["hits"]
+        hits = [{"id": h["_id"], **(h.get("_source") or {})} for h in raw[:size]]
+        more = len(raw) > size
+        return {
+            "hits": hits,
+            "next_cursor": encode_cursor(raw[size - 1]["sort"]) if more and size else None,
+            "took_ms": resp.get("took"),
+        }
+
+    def _get_uncached(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        from elasticsearch import NotFoundError
+        t0 = time.perf_counter()
+        try:
+            resp = self.es.get(index=self.index_name, id=doc_id, source_excludes=GET_SOURCE_EXCLUDES)
+        except NotFoundError:
+            return None
+        finally:
+            metrics.observe("search_es_seconds", time.perf_counter() - t0, op="get")
+        return {"id": resp["_id"], **(resp.get("_source") or {})}
+
+    @staticmethod
+    def _search_key(params: Dict[str, Any], size: int, cursor: Optional[str]) -> Hashable:
+        norm = {k: (tuple(sorted(v)) if isinstance(v, list) else v) for k, v in params.items() if v}
+        return ("search", tuple(sorted(norm.items())), size, cursor)
+
+    @staticmethod
+    def _clamp(size: Optional[int]) -> int:
+        return max(1, min(MAX_PAGE_SIZE, size or DEFAULT_PAGE_SIZE))
+
+    def search(self, *, size: Optional[int] = None, cursor: Optional[str] = None, **params: Any) -> Dict[str, Any]:
+        size = self._clamp(size)
+        key = self._search_key(params, size, cursor)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return {**hit, "cached": True}
+        res = self._search_uncached(params, size, cursor)
+        self.cache.put(key, res)
+        return {**res, "cached": False}
+
+    def get(self, *, job_id: Optional[str] = None, url: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        doc_id = job_id or (make_doc_id({"url": url}) if url else None)
+        if not doc_id:
+            raise ValueError("job_id or url is required")
+        key = ("get", doc_id)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit
+        doc = self._get_uncached(doc_id)
+        if doc is not None:
+            self.cache.put(key, doc)
+        return doc
+
+    # ---- 비동기 (MCP 도구) ----
+    async def _load(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        같은 key 의 ES 호출이 이미 진행 중이면 그 결과를 같이 기다림.
+        먼저 호출한 쪽이 취소되면(도구 타임아웃 등) 기다리던 쪽 중 하나가 이어서 직접 호출한다.
+        """
+        while True:
+            fut = self._inflight.get(key)
+            if fut is None:
+                return await self._load_leader(key, fn)
+            self.cache.stats.coalesced += 1
+            try:
+                return await asyncio.shield(fut)
+            except _LeaderCancelled:
+                continue
+
+    async def _load_leader(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            if self._sem is None:
+                self._sem = asyncio.Semaphore(self.max_concurrency)
+            async with self._sem:
+                value = await asyncio.wait_for(asyncio.to_thread(fn), self.timeout * 2)
+            fut.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            # 취소는 이 호출만의 일: 기다리던 쪽에 CancelledError 를 넘기면 자기 작업이 취소된 것으로 보임
+            fut.set_exception(_LeaderCancelled())
+            fut.exception()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # 기다리는 쪽이 없어도 경고가 안 나도록
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def asearch(self, *, size: Optional[int] = None, cursor: Optional[str] = None,
+                      **params: Any) -> Dict[str, Any]:
+        size = self._clamp(size)
+        key = self._search_key(params, size, cursor)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return {**hit, "cached": True}
+        if cursor:
+            decode_cursor(cursor)  # 잘못된 cursor 는 스레드로 넘기기 전에
+        res = await self._load(key, lambda: self._search_uncached(params, size, cursor))
+        self.cache.put(key, res)
+        return {**res, "cached": False}
+
+    async def aget(self, *, job_id: Optional[str] = None, url: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        doc_id = job_id or (make_doc_id({"url": url}) if url else None)
+        if not doc_id:
+            raise ValueError("job_id or url is required")
+        key = ("get", doc_id)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit
+        doc = await self._load(key, lambda: self._get_uncached(doc_id))
+        if doc is not None:
+            self.cache.put(key, doc)
+        return doc
@@ -1,8 +1,12 @@
 from __future__ import annotations
-from elasticsearch import Elasticsearch, helpers
+from functools import lru_cache
+from typing import TYPE_CHECKING
 from dotenv import load_dotenv
 import os
 
+if TYPE_CHECKING:
+    from elasticsearch import Elasticsearch
+
 JOB_INDEX_TEMPLATE = {
     "settings": {
         "number_of_shards": 1,
@@ -37,13 +41,20 @@ JOB_INDEX_TEMPLATE = {
             # date|string|null (YYYY-MM-DD만 들어온다는 전제)
             "datePosted": {"type": "date", "format": "yyyy-MM-dd"},
             "validThrough": {"type": "date", "format": "yyyy-MM-dd"},
+
+            # 증분 크롤링용: LLM 이전 원본 행의 지문 (검색 대상 아님)
+            "content_fingerprint": {"type": "keyword", "index": False},
+            # 보드 간 중복 공고: 대표 문서에 나머지 공고 url 들을 연결
+            "sameAs": {"type": "keyword"},
         }
     },
 }
 
 def ensure_job_index(es: Elasticsearch, index_name: str = "jobs") -> None:
-    """jobs 인덱스가 없으면, 위 스키마로 생성."""
+    """jobs 인덱스가 없으면, 위 스키마로 생성. 있으면 새로 추가된 필드만 매핑에 반영."""
     if es.indices.exists(index=index_name):
+        # put_mapping은 필드 추가만 하므로 기존 인덱스에도 안전 (dynamic=strict 대응)
+        es.indices.put_mapping(index=index_name, properties=JOB_INDEX_TEMPLATE["mappings"]["properties"])
         return
     es.indices.create(index=index_name, body=JOB_INDEX_TEMPLATE)
 
@@ -51,7 +62,19 @@ load_dotenv()
 API_KEY = os.getenv("ELASTIC_API")
 URL = os.getenv("URL")
 
-es = Elasticsearch(
-    URL,
-    api_key=API_KEY,
-)
\ No newline at end of file
+
+@lru_cache(maxsize=None)
+def get_es() -> Elasticsearch:
+    """공용 클라이언트. import 만으로는 만들지 않고 처음 쓸 때 한 번 (elasticsearch 패키지 import 포함)."""
+    from elasticsearch import Elasticsearch
+    return Elasticsearch(
+        URL,
+        api_key=API_KEY,
+    )
+
+
+def __getattr__(name: str):
+    # 예전 `from db.server import es` 호환
+    if name == "es":
+        return get_es()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
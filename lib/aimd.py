@@ -0,0 +1,214 @@
+from __future__ import annotations
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Awaitable, Optional, TypeVar
+
+from lib import metrics
+
+"""
+LLM 호출용 적응형 동시성 제어 (AIMD)
+
+고정 동시성은 vLLM 배치를 덜 채우거나(처리량 손해) 서버 큐에 쌓여 타임아웃이 난다.
+- window 초마다 완료된 요청의 평균 지연시간과 생성 토큰/초를 본다
+- 슬롯을 다 쓰고 있었으면(포화) limit += 1 (additive increase),
+  늘렸는데 처리량은 gain 배 이상 안 오르고 지연만 늘면 한 칸 물러남 (서버 배치가 꽉 찬 지점 근처에서 머묾)
+- 지연시간이 기준선의 latency_tolerance 배를 넘거나 타임아웃/오류가 나면 limit *= backoff
+- 요청마다 timeout: 넘으면 취소(스트림 연결도 닫힘)하고 TimeoutError, limit 을 줄인다
+"""
+
+T = TypeVar("T")
+
+
+class AdaptiveConcurrency:
+    def __init__(
+        self,
+        initial: int = 8,
+        *,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        timeout: Optional[float] = 120.0,
+        window: float = 2.0,
+        latency_tolerance: float = 2.0,
+        backoff: float = 0.7,
+        gain: float = 1.02,
+    ):
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.timeout = timeout
+        self.window = window
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.gain = gain
+
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+        # 현재 window 집계
+        self._w_start = time.monotonic()
+        self._w_done = 0
+        self._w_tokens = 0
+        self._w_latency = 0.0
+        self._w_failed = 0
+        self._w_saturated = False
+
+        self._prev_tput: Optional[float] = None
+        self._last_action = "hold"
+        self._baseline: Optional[float] = None
+        self.tokens_per_s = 0.0
+        self.requests_per_s = 0.0
+        self.latency = 0.0
+
+        self.completed = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.increases = 0
+        self.decreases = 0
+
+    # ---- 슬롯 ----
+    def _free(self) -> bool:
+        return self._in_flight < int(self.limit)
+
+    def _wake(self) -> None:
+        while self._waiters and self._free():
+            fut = self._waiters.popleft()
+            if not fut.done():
+                self._in_flight += 1
+                fut.set_result(None)
+
+    async def acquire(self) -> None:
+        if not self._waiters and self._free():
+            self._in_flight += 1
+        else:
+            fut = asyncio.get_running_loop().create_future()
+            self._waiters.append(fut)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut.done() and not fut.cancelled():
+                    # 슬롯을 받은 직후 취소됨 -> 돌려줌
+                    self.release()
+                else:
+                    try:
+                        self._waiters.remove(fut)
+                    except ValueError:
+                        pass
+                raise
+        if self._in_flight >= int(self.limit):
+            self._w_saturated = True
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def run(self, coro: Awaitable[T]) -> T:
+        """슬롯을 잡고 timeout 안에 coro 실행. 결과(성공/실패/타임아웃)는 컨트롤러에 반영하지 않음 -> on_* 로."""
+        try:
+            await self.acquire()
+        except BaseException:
+            # 대기 중 취소: 시작도 안 한 코루틴 정리
+            getattr(coro, "close", lambda: None)()
+            raise
+        try:
+            if self.timeout is None:
+                return await coro
+            return await asyncio.wait_for(coro, self.timeout)
+        finally:
+            self.release()
+
+    # ---- 피드백 ----
+    def on_success(self, latency: float, tokens: int = 0) -> None:
+        self.completed += 1
+        self._w_done += 1
+        self._w_tokens += tokens
+        self._w_latency += latency
+        self._maybe_adjust()
+
+    def on_timeout(self) -> None:
+        self.timeouts += 1
+        self._w_failed += 1
+        self._maybe_adjust()
+
+    def on_error(self) -> None:
+        self.errors += 1
+        self._w_failed += 1
+        self._maybe_adjust()
+
+    def _set_limit(self, value: float) -> None:
+        old = int(self.limit)
+        self.limit = max(float(self.min_limit), min(float(self.max_limit), value))
+        if int(self.limit) > old:
+            self.increases += 1
+            self._wake()
+        elif int(self.limit) < old:
+            self.decreases += 1
+        metrics.set_gauge("llm_concurrency_limit", int(self.limit))
+
+    def _maybe_adjust(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._w_start
+        if elapsed < self.window:
+            return
+        done, failed = self._w_done, self._w_failed
+        tput = self._w_tokens / elapsed
+        lat = self._w_latency / done if done else None
+        saturated = self._w_saturated
+
+        self.requests_per_s = done / elapsed
+        self.tokens_per_s = tput
+        if lat is not None:
+            self.latency = lat
+            self._baseline = lat if self._baseline is None else min(self._baseline, lat)
+
+        if failed:
+            self._set_limit(self.limit * self.backoff)
+            self._last_action = "decrease"
+        elif lat is not None and lat > self._baseline * self.latency_tolerance:
+            self._set_limit(self.limit * self.backoff)
+            # 부하가 빠지면 기준선도 새로 잡히도록 조금 올려 둠
+            self._baseline *= 1.1
+            self._last_action = "decrease"
+        elif saturated:
+            if (self._last_action == "increase" and self._prev_tput is not None
+                    and tput <= self._prev_tput * self.gain and lat is not None and lat > self._baseline * 1.2):
+                # 늘렸는데 처리량은 그대로고 지연만 늘었음 -> 서버 배치가 이미 꽉 참, 한 칸 물러남
+                self._set_limit(self.limit - 1)
+                self._last_action = "step_back"
+            else:
+                self._set_limit(self.limit + 1)
+                self._last_action = "increase"
+        else:
+            self._last_action = "hold"
+        if done:
+            self._prev_tput = tput
+
+        self._w_start = now
+        self._w_done = self._w_tokens = self._w_failed = 0
+        self._w_latency = 0.0
+        self._w_saturated = self._in_flight >= int(self.limit)
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "tokens_per_s": round(self.tokens_per_s, 1),
+            "requests_per_s": round(self.requests_per_s, 2),
+            "latency": round(self.latency, 3),
+            "latency_baseline": round(self._baseline, 3) if self._baseline is not None else None,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
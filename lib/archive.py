@@ -0,0 +1,212 @@
+from __future__ import annotations
+import gzip
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+"""
+원본 페이지 아카이브 (WARC 비슷한 append-only 세그먼트)
+
+- 가져온 페이지를 레코드마다 독립 gzip 멤버로 segment-NNNNNN.warc.gz 에 이어 붙인다
+  (세그먼트 파일 자체도 zcat 으로 읽히는 정상 gzip 스트림)
+- index.sqlite: (url, fetched_at) -> (segment, offset, length)
+- 읽기는 세그먼트를 mmap 해서 레코드 구간만 풀기 때문에 아카이브 크기와 무관하게 메모리가 일정
+- client.py --replay: fetch 계층이 네트워크 대신 여기서 응답 -> 파서/LLM/색인만 다시 돌림
+"""
+
+DEFAULT_ARCHIVE_DIR = Path(".cache") / "archive"
+DEFAULT_SEGMENT_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    url          TEXT NOT NULL,
+    fetched_at   REAL NOT NULL,
+    segment      INTEGER NOT NULL,
+    offset       INTEGER NOT NULL,
+    length       INTEGER NOT NULL,
+    status       INTEGER NOT NULL,
+    content_type TEXT
+);
+CREATE INDEX IF NOT EXISTS records_url ON records(url, fetched_at);
+"""
+
+
+class NotInArchive(LookupError):
+    pass
+
+
+@dataclass
+class ArchivedPage:
+    url: str
+    fetched_at: float
+    status: int
+    content_type: Optional[str]
+    body: bytes
+
+
+@dataclass
+class ArchiveStats:
+    written: int = 0
+    bytes_raw: int = 0
+    bytes_stored: int = 0
+    read: int = 0
+    missing: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "written": self.written,
+            "bytes_raw": self.bytes_raw,
+            "bytes_stored": self.bytes_stored,
+            "read": self.read,
+            "missing": self.missing,
+        }
+
+
+def _encode_record(url: str, fetched_at: float, status: int, content_type: Optional[str], body: bytes) -> bytes:
+    head = (
+        "WARC/1.1\r\n"
+        "WARC-Type: response\r\n"
+        f"WARC-Target-URI: {url}\r\n"
+        f"WARC-Date: {time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(fetched_at))}\r\n"
+        f"X-Status: {status}\r\n"
+        f"Content-Type: {content_type or ''}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "\r\n"
+    ).encode()
+    return gzip.compress(head + body + b"\r\n\r\n", compresslevel=6, mtime=0)
+
+
+def _decode_body(raw: bytes) -> bytes:
+    data = gzip.decompress(raw)
+    head, _, rest = data.partition(b"\r\n\r\n")
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            return rest[: int(line.split(b":", 1)[1])]
+    return rest[:-4]
+
+
+class PageArchive:
+    def __init__(
+        self,
+        root: Path | str = DEFAULT_ARCHIVE_DIR,
+        *,
+        readonly: bool = False,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+    ):
+        self.root = Path(root)
+        self.readonly = readonly
+        self.segment_bytes = segment_bytes
+        self.stats = ArchiveStats()
+        self._lock = threading.Lock()
+        self._maps: Dict[int, Tuple[int, mmap.mmap]] = {}
+
+        if readonly and not (self.root / "index.sqlite").exists():
+            raise FileNotFoundError(f"no archive index under {self.root}")
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.root / "index.sqlite"), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+        self._segment = 0
+        self._fh = None
+        if not readonly:
+            last = self._db.execute("SELECT MAX(segment) FROM records").fetchone()[0]
+            self._open_segment(last or 1)
+
+    def _segment_path(self, n: int) -> Path:
+        return self.root / f"segment-{n:06d}.warc.gz"
+
+    def _open_segment(self, n: int) -> None:
+        if self._fh is not None:
+            self._fh.close()
+        self._segment = n
+        self._fh = open(self._segment_path(n), "ab")
+
+    # ---- 쓰기 ----
+    def append(self, url: str, body: bytes, *, status: int = 200, content_type: Optional[str] = None,
+               fetched_at: Optional[float] = None) -> None:
+        if self.readonly:
+            raise RuntimeError("archive opened read-only")
+        fetched_at = fetched_at or time.time()
+        rec = _encode_record(url, fetched_at, status, content_type, body)
+        with self._lock:
+            if self._fh.tell() and self._fh.tell() + len(rec) > self.segment_bytes:
+                self._open_segment(self._segment + 1)
+            offset = self._fh.tell()
+            self._fh.write(rec)
+            # 인덱스가 가리키는 바이트는 항상 파일에 있어야 함
+            self._fh.flush()
+            self._db.execute(
+                "INSERT INTO records(url, fetched_at, segment, offset, length, status, content_type) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, fetched_at, self._segment, offset, len(rec), status, content_type),
+            )
+            self.stats.written += 1
+            self.stats.bytes_raw += len(body)
+            self.stats.bytes_stored += len(rec)
+
+    def has(self, url: str) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM records WHERE url = ? LIMIT 1", (url,)).fetchone() is not None
+
+    # ---- 읽기 ----
+    def _map(self, segment: int, end: int) -> mmap.mmap:
+        cur = self._maps.get(segment)
+        if cur is None or cur[0] < end:
+            # 쓰는 중인 세그먼트는 커졌을 수 있으므로 필요하면 다시 매핑
+            if cur is not None:
+                cur[1].close()
+            with open(self._segment_path(segment), "rb") as fh:
+                size = os.fstat(fh.fileno()).st_size
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            cur = self._maps[segment] = (size, mm)
+        return cur[1]
+
+    def _read(self, url: str, fetched_at: float, segment: int, offset: int, length: int, status: int,
+              content_type: Optional[str]) -> ArchivedPage:
+        with self._lock:
+            if not self.readonly:
+                self._fh.flush()
+            raw = self._map(segment, offset + length)[offset:offset + length]
+        self.stats.read += 1
+        return ArchivedPage(url, fetched_at, status, content_type, _decode_body(raw))
+
+    def get(self, url: str, *, as_of: Optional[float] = None) -> ArchivedPage:
+        """url 의 가장 최근 레코드 (as_of 가 있으면 그 시각 이전 중 최신)."""
+        sql = "SELECT url, fetched_at, segment, offset, length, status, content_type FROM records WHERE url = ?"
+        params: list = [url]
+        if as_of is not None:
+            sql += " AND fetched_at <= ?"
+            params.append(as_of)
+        with self._lock:
+            row = self._db.execute(sql + " ORDER BY fetched_at DESC LIMIT 1", params).fetchone()
+        if row is None:
+            self.stats.missing += 1
+            raise NotInArchive(url)
+        return self._read(*row)
+
+    def iter_latest(self, *, prefix: str = "") -> Iterator[ArchivedPage]:
+        """url 별 최신 레코드를 세그먼트/오프셋 순서로 (디스크 순차 읽기)."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT url, MAX(fetched_at), segment, offset, length, status, content_type FROM records "
+                "WHERE url LIKE ? GROUP BY url ORDER BY segment, offset",
+                (prefix + "%",),
+            ).fetchall()
+        for row in rows:
+            yield self._read(*row)
+
+    def close(self) -> None:
+        with self._lock:
+            for _, mm in self._maps.values():
+                mm.close()
+            self._maps.clear()
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            self._db.close()
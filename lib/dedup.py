@@ -0,0 +1,308 @@
+from __future__ import annotations
+import hashlib
+import re
+import sqlite3
+import struct
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+"""
+보드 간 중복 공고 묶기 (LLM 단계 앞)
+
+같은 공고가 원티드/잡코리아/사람인에 동시에 올라오면 url이 달라서 LLM 호출과 ES 문서가 따로 생긴다.
+- 회사이름/포지션/위치 정규화 ("(주)", "주식회사", 공백/기호 제거)
+  포지션은 핵심 이름(괄호 태그/연차 단어 뺀 것)과 태그 집합(position_qualifiers)으로 나눠 둘 다 비교
+- 후보 찾기: 회사 + 포지션 문자 3-gram 의 MinHash -> LSH 밴드 버킷 (sqlite에 저장, 실행 간 유지)
+- 확인: url 호스트가 다름(같은 보드 안의 공고는 묶지 않음) + 정규화 회사 일치
+  + 괄호 태그/연차 단어("[경력]", "(Java)", 시니어/주니어 ...)가 양쪽에 있으면 같아야 함
+  + 핵심 이름 3-gram 자카드 + 본문 SimHash 해밍 거리
+  둘 중 한쪽이라도 본문이 없으면 핵심 이름과 태그가 모두 같을 때만 (목록 행은 본문이 없음)
+- 묶음마다 처음 본 공고가 대표. 대표만 LLM 으로 가고 나머지 url 은 대표 문서의 sameAs 로 연결
+  (대표의 index 액션이 색인기에 들어가기 전에 찾은 중복은 sameAs 에, 그 뒤에 찾은 것은 same_as_update 로)
+"""
+
+DEFAULT_DEDUP_PATH = Path(".cache") / "dedup.sqlite"
+
+NUM_PERM = 32
+BANDS = 8            # 밴드당 4행 -> 자카드 ~0.6 이상이면 높은 확률로 같은 버킷
+_ROWS = NUM_PERM // BANDS
+_MASK64 = (1 << 64) - 1
+_PRIME = (1 << 61) - 1
+
+# 고정 시드: 실행이 바뀌어도 서명이 같아야 저장된 버킷을 재사용할 수 있음
+_PERMS = [
+    (int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % _PRIME | 1,
+     int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % _PRIME)
+    for i in range(NUM_PERM)
+]
+
+_COMPANY_NOISE_RE = re.compile(r"\(주\)|㈜|주식회사|\(유\)|유한회사|\bco\.?,?\s*ltd\.?|\binc\.?|\bcorp\.?", re.I)
+_BRACKET_RE = re.compile(r"\[[^\]]*\]|\([^)]*\)|【[^】]*】|<[^>]*>")
+_NON_WORD_RE = re.compile(r"[^0-9a-z가-힣]+")
+# 같은 회사의 다른 공고를 가르는 연차 단어 (괄호 밖에 있어도 구분자로 취급)
+_SENIORITY_RE = re.compile(r"신입|주니어|시니어|경력|인턴|리드|수석|책임|선임|junior|senior|lead|principal|staff|intern")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    url      TEXT PRIMARY KEY,
+    rep      TEXT NOT NULL,
+    company  TEXT NOT NULL,
+    position TEXT NOT NULL,
+    location TEXT,
+    simhash  INTEGER,
+    emitted  INTEGER NOT NULL DEFAULT 0,
+    qualifiers TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS postings_rep ON postings(rep);
+CREATE TABLE IF NOT EXISTS buckets (
+    band   INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    url    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS buckets_key ON buckets(band, bucket);
+"""
+
+
+def normalize_company(s: Optional[str]) -> str:
+    s = _COMPANY_NOISE_RE.sub(" ", (s or "").lower())
+    return _NON_WORD_RE.sub("", s)
+
+
+def normalize_position(s: Optional[str]) -> str:
+    # 핵심 이름: "[경력] 시니어 백엔드 개발자 (Java)" -> "백엔드개발자" (뺀 부분은 position_qualifiers 로 따로 비교)
+    s = _BRACKET_RE.sub(" ", (s or "").lower())
+    return _NON_WORD_RE.sub("", _SENIORITY_RE.sub(" ", s))
+
+
+def position_qualifiers(s: Optional[str]) -> str:
+    # "[경력] 시니어 백엔드 (Java)" -> "java|경력|시니어" (괄호 안 내용 + 연차 단어, 정렬해서 비교용 문자열)
+    s = (s or "").lower()
+    tags = {_NON_WORD_RE.sub("", m.group(0)) for m in _BRACKET_RE.finditer(s)}
+    tags |= set(_SENIORITY_RE.findall(_BRACKET_RE.sub(" ", s)))
+    return "|".join(sorted(t for t in tags if t))
+
+
+def _host(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def normalize_location(s: Optional[str]) -> str:
+    # 시/구 수준까지만 비교 ("서울 강남구 테헤란로 ..." -> "서울강남구")
+    parts = (s or "").replace(">", " ").split()
+    return _NON_WORD_RE.sub("", " ".join(parts[:2]).lower())
+
+
+def _hash64(s: str) -> int:
+    return int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def char_ngrams(s: str, n: int = 3) -> Set[str]:
+    if len(s) <= n:
+        return {s} if s else set()
+    return {s[i:i + n] for i in range(len(s) - n + 1)}
+
+
+def minhash(shingles: Set[str]) -> Tuple[int, ...]:
+    hs = [_hash64(x) for x in shingles] or [0]
+    return tuple(min((a * h + b) % _PRIME for h in hs) for a, b in _PERMS)
+
+
+def lsh_buckets(sig: Tuple[int, ...]) -> List[Tuple[int, int]]:
+    out = []
+    for band in range(BANDS):
+        chunk = sig[band * _ROWS:(band + 1) * _ROWS]
+        digest = hashlib.blake2b(struct.pack(f">{_ROWS}Q", *(v & _MASK64 for v in chunk)), digest_size=8).digest()
+        # sqlite INTEGER 는 부호 있는 64비트
+        out.append((band, int.from_bytes(digest, "big", signed=True)))
+    return out
+
+
+def simhash(text: str, n: int = 4) -> Optional[int]:
+    grams = char_ngrams(_NON_WORD_RE.sub("", (text or "").lower()), n)
+    if not grams:
+        return None
+    acc = [0] * 64
+    for g in grams:
+        h = _hash64(g)
+        for i in range(64):
+            acc[i] += 1 if (h >> i) & 1 else -1
+    v = sum(1 << i for i in range(64) if acc[i] > 0)
+    return v - (1 << 64) if v >= 1 << 63 else v
+
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK64).count("1")
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def _description(row: Dict[str, Any]) -> str:
+    parts = [row.get("meta_description") or ""]
+    for k in ("자격 요건", "주요업무"):
+        v = row.get(k)
+        parts.append(" ".join(v) if isinstance(v, list) else (v or ""))
+    return " ".join(p for p in parts if p)
+
+
+@dataclass
+class DedupStats:
+    checked: int = 0
+    representatives: int = 0
+    duplicates: int = 0
+    skipped: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "checked": self.checked,
+            "representatives": self.representatives,
+            "duplicates": self.duplicates,
+            "skipped": self.skipped,
+        }
+
+
+class DedupIndex:
+    def __init__(
+        self,
+        path: Path | str = DEFAULT_DEDUP_PATH,
+        *,
+        position_threshold: float = 0.6,
+        max_hamming: int = 10,
+    ):
+        self.path = Path(path)
+        self.position_threshold = position_threshold
+        self.max_hamming = max_hamming
+        self.stats = DedupStats()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        cols = {r[1] for r in self._db.execute("PRAGMA table_info(postings)")}
+        if "qualifiers" not in cols:
+            # 이전 버전 인덱스: 태그 정보가 없는 행은 본문 일치나 포지션 완전 일치로만 묶인다
+            self._db.execute("ALTER TABLE postings ADD COLUMN qualifiers TEXT NOT NULL DEFAULT ''")
+
+    def _find_rep(self, url: str, company: str, position: str, qualifiers: str, location: str,
+                  sh: Optional[int], buckets: List[Tuple[int, int]]) -> Optional[str]:
+        host = _host(url)
+        grams = char_ngrams(position)
+        seen: Set[str] = set()
+        for band, bucket in buckets:
+            for (cand,) in self._db.execute("SELECT url FROM buckets WHERE band = ? AND bucket = ?", (band, bucket)):
+                if cand == url or cand in seen:
+                    continue
+                seen.add(cand)
+                # 같은 보드 안에서 비슷한 공고는 서로 다른 공고 (시니어/주니어, Java/Python 등)
+                if _host(cand) == host:
+                    continue
+                row = self._db.execute(
+                    "SELECT rep, company, position, location, simhash, qualifiers FROM postings WHERE url = ?",
+                    (cand,),
+                ).fetchone()
+                if row is None:
+                    continue
+                rep, c_company, c_position, c_location, c_sh, c_qualifiers = row
+                if c_company != company:
+                    continue
+                if location and c_location and location != c_location:
+                    continue
+                if qualifiers and c_qualifiers and qualifiers != c_qualifiers:
+                    continue
+                if sh is None or c_sh is None:
+                    # 본문으로 확인할 수 없으면 포지션(핵심 이름 + 태그)이 완전히 같을 때만
+                    if position != c_position or qualifiers != c_qualifiers:
+                        continue
+                elif (jaccard(grams, char_ngrams(c_position)) < self.position_threshold
+                      or hamming(sh, c_sh) > self.max_hamming):
+                    continue
+                return rep
+        return None
+
+    def assign(self, row: Dict[str, Any]) -> Optional[Tuple[str, bool]]:
+        """
+        row 를 묶음에 넣고 (대표 url, 대표 문서가 이미 색인기로 넘어갔는지) 를 돌려준다.
+        row 자신이 대표면 대표 url 은 row 의 url. 회사/포지션/url 이 없으면 판단하지 않고 None.
+        """
+        url = row.get("url")
+        company = normalize_company(row.get("회사이름") or row.get("name") or row.get("company_name"))
+        raw_position = row.get("포지션") or row.get("position")
+        position = normalize_position(raw_position)
+        self.stats.checked += 1
+        if not (url and company and position):
+            self.stats.skipped += 1
+            return None
+        location = normalize_location(row.get("회사 위치"))
+        qualifiers = position_qualifiers(raw_position)
+        sh = simhash(_description(row))
+        buckets = lsh_buckets(minhash({"c:" + company} | char_ngrams(position)))
+
+        with self._lock:
+            known = self._db.execute("SELECT rep FROM postings WHERE url = ?", (url,)).fetchone()
+            if known is not None:
+                rep = known[0]
+            else:
+                rep = self._find_rep(url, company, position, qualifiers, location, sh, buckets) or url
+                self._db.execute(
+                    "INSERT INTO postings(url, rep, company, position, location, simhash, qualifiers)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (url, rep, company, position, location or None, sh, qualifiers),
+                )
+                self._db.executemany(
+                    "INSERT INTO buckets(band, bucket, url) VALUES (?, ?, ?)",
+                    [(band, bucket, url) for band, bucket in buckets],
+                )
+            emitted = self._db.execute("SELECT emitted FROM postings WHERE url = ?", (rep,)).fetchone()
+        if rep == url:
+            self.stats.representatives += 1
+        else:
+            self.stats.duplicates += 1
+        return rep, bool(emitted and emitted[0])
+
+    def same_as(self, rep: str) -> List[str]:
+        """대표 문서를 만들 때 넣을 sameAs (지금까지 묶인 중복 url). 아직 emitted 표시는 하지 않는다."""
+        with self._lock:
+            return [u for (u,) in self._db.execute(
+                "SELECT url FROM postings WHERE rep = ? AND url != ? ORDER BY url", (rep, rep)
+            )]
+
+    def mark_emitted(self, rep: str, linked: Iterable[str]) -> List[str]:
+        """
+        대표 문서의 index 액션이 색인기에 들어간 뒤 호출. 이후에 찾는 중복은 assign 이 emitted=True 로
+        알려 주므로 same_as_update 로 붙이면 된다. same_as() 이후 여기까지 사이에 묶인 중복 url
+        (linked 에 없는 것) 을 돌려주니 호출한 쪽이 같은 방식으로 붙인다. (assign 과 같은 락 안에서)
+        """
+        linked = set(linked)
+        with self._lock:
+            self._db.execute("UPDATE postings SET emitted = 1 WHERE url = ?", (rep,))
+            return [u for (u,) in self._db.execute(
+                "SELECT url FROM postings WHERE rep = ? AND url != ? ORDER BY url", (rep, rep)
+            ) if u not in linked]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def same_as_update(index_name: str, rep_doc_id: str, dup_url: str) -> Dict[str, Any]:
+    """이미 색인된 대표 문서의 sameAs 에 url 하나를 추가하는 bulk action."""
+    return {
+        "_op_type": "update",
+        "_index": index_name,
+        "_id": rep_doc_id,
+        "retry_on_conflict": 3,
+        "script": {
+            "lang": "painless",
+            "source": (
+                "if (ctx._source.sameAs == null) { ctx._source.sameAs = []; }"
+                "if (!ctx._source.sameAs.contains(params.url)) { ctx._source.sameAs.add(params.url); }"
+            ),
+            "params": {"url": dup_url},
+        },
+    }
@@ -0,0 +1,158 @@
+from __future__ import annotations
+import copy
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from lib.req import DATA_STRUCT, _parse_iso_date
+
+"""
+규칙 기반 구조화 (LLM 우회 경로)
+
+SYSTEM_PROMPT 의 파싱 규칙(섹션 라벨, 불릿 형태, 경험 요건 추리기, 날짜 형식)을
+meta_description 에 그대로 적용한다.
+- 잡코리아/사람인 목록 행은 이미 DATA_STRUCT 스키마라서 거의 그대로 통과
+- 원티드 행은 JSON-LD 필드 + meta_description 섹션 파싱
+- (record, confidence) 를 반환하고, confidence 가 임계치 미만인 행만 LLM 으로 보낸다
+"""
+
+# 라벨 -> 스키마 키 (긴 라벨이 먼저 매칭되도록 길이순 정렬해서 사용)
+SECTION_LABELS: Dict[str, Optional[str]] = {
+    "회사 위치": "회사 위치",
+    "회사위치": "회사 위치",
+    "근무지": "회사 위치",
+    "위치": "회사 위치",
+    "자격 요건": "자격 요건",
+    "자격요건": "자격 요건",
+    "Requirements": "자격 요건",
+    "주요 업무": "주요업무",
+    "주요업무": "주요업무",
+    "업무": "주요업무",
+    "Responsibilities": "주요업무",
+    "지원 마감": "validThrough",
+    "마감일": "validThrough",
+    "마감": "validThrough",
+    "validThrough": "validThrough",
+    # 아래는 스키마에 없는 섹션: 앞 섹션이 여기서 끝나도록 경계로만 사용
+    "우대 사항": None,
+    "우대사항": None,
+    "혜택 및 복지": None,
+    "복지": None,
+    "채용 절차": None,
+    "기술 스택": None,
+    "기술스택": None,
+}
+
+_LABEL_RE = re.compile(
+    r"(?:^|(?<=[\s•·\-]))("
+    + "|".join(re.escape(k) for k in sorted(SECTION_LABELS, key=len, reverse=True))
+    + r")\s*(?:[:：]|\n|(?=[•·]|-\s|\d+\)))",
+    re.MULTILINE,
+)
+_BULLET_SPLIT_RE = re.compile(r"(?:^|\s)(?:[•·]|-(?=\s)|\d+\))\s*")
+_EXPERIENCE_RE = re.compile(r"\d+\s*년|신입|경력|연차|경험")
+
+CORE_KEYS = ("회사이름", "포지션", "url")
+ARRAY_FIELDS = ("자격 요건", "주요업무", "occupationalCategory", "experienceRequirements")
+
+
+def split_bullets(text: str) -> List[str]:
+    """"• 항목", "- 항목", "· 항목", "1) 항목", 줄바꿈을 모두 불릿 경계로 보고 정리."""
+    out: List[str] = []
+    seen = set()
+    parts = [p for line in (text or "").splitlines() for p in _BULLET_SPLIT_RE.split(line)]
+    for part in parts:
+        item = part.strip(" \t\r\n,;")
+        if not item or item in seen:
+            continue
+        seen.add(item)
+        out.append(item)
+    return out
+
+
+def extract_sections(meta_description: str) -> Dict[str, str]:
+    """라벨 위치로 meta_description 을 섹션별 원문으로 자른다. (스키마 키 -> 원문)"""
+    text = meta_description or ""
+    matches = list(_LABEL_RE.finditer(text))
+    sections: Dict[str, str] = {}
+    for i, m in enumerate(matches):
+        key = SECTION_LABELS[m.group(1)]
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        if key is None:
+            continue
+        body = text[m.end():end].strip()
+        if body and key not in sections:
+            sections[key] = body
+    return sections
+
+
+def _as_list(v: Any) -> List[str]:
+    if v is None:
+        return []
+    if isinstance(v, list):
+        return [str(x).strip() for x in v if str(x).strip()]
+    if isinstance(v, dict):
+        # JSON-LD OccupationalExperienceRequirements 등
+        v = v.get("description") or v.get("name") or ""
+    s = str(v).strip()
+    return [s] if s else []
+
+
+def _iso_or_none(v: Any) -> Optional[str]:
+    return _parse_iso_date(str(v)) if v else None
+
+
+def _is_list_board_row(row: Dict[str, Any]) -> bool:
+    return set(DATA_STRUCT) <= set(row) and not row.get("meta_description")
+
+
+def fastpath_extract(row: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+    """
+    LLM 없이 만들 수 있는 만큼 스키마 레코드를 만든다.
+    confidence: 0.0 ~ 1.0 (필수 필드와 핵심 섹션을 근거 있게 채운 정도)
+    """
+    rec: Dict[str, Any] = copy.deepcopy(DATA_STRUCT)
+    for k in rec:
+        if row.get(k) not in (None, "", []):
+            rec[k] = copy.deepcopy(row[k])
+    # 원티드 목록 행의 키 이름
+    rec["회사이름"] = rec["회사이름"] or row.get("name") or row.get("company_name")
+    rec["포지션"] = rec["포지션"] or row.get("position")
+
+    core_ok = all(rec.get(k) for k in CORE_KEYS)
+
+    if _is_list_board_row(row):
+        # 목록 파서가 이미 최종 스키마로 만든 행: 필수 필드만 확인
+        for k in ARRAY_FIELDS:
+            rec[k] = _as_list(rec[k])
+        # 사람인 마감일은 "~12.24(수)" 같은 원문이 남아 있을 수 있음 (ES date 필드)
+        rec["validThrough"] = _iso_or_none(rec["validThrough"])
+        rec["datePosted"] = _iso_or_none(rec["datePosted"])
+        return rec, 1.0 if core_ok else 0.5
+
+    sections = extract_sections(row.get("meta_description") or "")
+
+    if not rec["회사 위치"] and sections.get("회사 위치"):
+        rec["회사 위치"] = (split_bullets(sections["회사 위치"]) or [None])[0]
+    reqs = split_bullets(sections.get("자격 요건", ""))
+    tasks = split_bullets(sections.get("주요업무", ""))
+    rec["자격 요건"] = reqs
+    rec["주요업무"] = tasks
+
+    # 경험 요건: JSON-LD 값 + 자격 요건 중 경험/연차 관련 항목
+    exp = _as_list(row.get("experienceRequirements"))
+    exp += [r for r in reqs if _EXPERIENCE_RE.search(r)]
+    rec["experienceRequirements"] = list(dict.fromkeys(exp))
+    rec["occupationalCategory"] = _as_list(row.get("occupationalCategory"))
+
+    # 날짜: 정확한 날짜가 있을 때만 ISO-8601
+    rec["validThrough"] = _iso_or_none(row.get("validThrough") or sections.get("validThrough"))
+    rec["datePosted"] = _iso_or_none(row.get("datePosted"))
+
+    et = row.get("employmentType")
+    rec["employmentType"] = ", ".join(_as_list(et)) or None
+
+    conf = 0.2 if core_ok else 0.0
+    conf += 0.35 if reqs else 0.0
+    conf += 0.35 if tasks else 0.0
+    conf += 0.1 if (rec["회사 위치"] or rec["validThrough"] or rec["experienceRequirements"]) else 0.0
+    return rec, round(conf, 2)
@@ -0,0 +1,336 @@
+from __future__ import annotations
+import asyncio
+import atexit
+import importlib.util
+import logging
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from lib import metrics
+from lib.archive import PageArchive
+from lib.httpcache import CachedPage, HTTPCache
+from lib.ratelimit import AdaptiveTokenBucket, backoff_delay, parse_retry_after
+
+"""
+공용 비동기 fetch 계층
+
+- 호스트마다 httpx.AsyncClient 하나 (keep-alive 커넥션 풀 재사용)
+- 호스트마다 동시 요청 수 상한 (asyncio.Semaphore) + 적응형 토큰 버킷 (lib/ratelimit.py)
+- 429/5xx/네트워크 오류만 재시도, Retry-After 존중, 백오프 대기 중에는 슬롯을 잡지 않음
+- h2 패키지가 있으면 HTTP/2, brotli/zstandard 가 있으면 br/zstd 디코딩
+- cache(HTTPCache)를 주면 GET 에 조건부 요청을 붙이고 304 는 디스크 본문으로 응답 (lib/httpcache.py)
+- archive(PageArchive)를 주면 받은 페이지를 원본 아카이브에 기록, replay=True 면 네트워크 없이 아카이브에서 응답
+- lib/req.py 의 동기 fetch 함수들은 백그라운드 이벤트 루프 하나에서 이 계층을 돌리는 얇은 래퍼
+"""
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_PER_HOST_LIMIT = 4
+DEFAULT_TIMEOUT = 20.0
+DEFAULT_RATE = 2.0  # 호스트별 시작 요청/초 (이후 응답을 보고 자동 조정)
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+THROTTLE_STATUS = {429, 503}
+
+
+def _has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+HTTP2_AVAILABLE = _has_module("h2")
+
+
+def accept_encoding() -> str:
+    enc = ["gzip", "deflate"]
+    if _has_module("brotli") or _has_module("brotlicffi"):
+        enc.append("br")
+    if _has_module("zstandard"):
+        enc.append("zstd")
+    return ", ".join(enc)
+
+
+@dataclass
+class FetchStats:
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    throttled: int = 0
+    bytes_in: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "bytes_in": self.bytes_in,
+        }
+
+
+class _Host:
+    def __init__(self, client: httpx.AsyncClient, limit: int, limiter: AdaptiveTokenBucket):
+        self.client = client
+        self.sem = asyncio.Semaphore(limit)
+        self.limiter = limiter
+
+
+class HTTPStatusError(RuntimeError):
+    def __init__(self, url: str, status: int):
+        super().__init__(f"{status} for {url}")
+        self.status = status
+
+
+class Fetcher:
+    """
+    이벤트 루프 하나에 묶인 fetcher. (httpx.AsyncClient 는 루프를 넘나들 수 없음)
+    루프마다 get_fetcher() 로 얻어 쓰면 된다.
+    """
+
+    def __init__(
+        self,
+        *,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+        host_limits: Optional[Dict[str, int]] = None,
+        http2: Optional[bool] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        rate: float = DEFAULT_RATE,
+        host_rates: Optional[Dict[str, float]] = None,
+        cache: Optional[HTTPCache] = None,
+        archive: Optional[PageArchive] = None,
+        replay: bool = False,
+    ):
+        if replay and archive is None:
+            raise ValueError("replay requires an archive")
+        self.cache = cache
+        self.archive = archive
+        self.replay = replay
+        self.per_host_limit = per_host_limit
+        self.rate = rate
+        self.host_rates = dict(host_rates or {})
+        self.host_limits = dict(host_limits or {})
+        self.http2 = HTTP2_AVAILABLE if http2 is None else (http2 and HTTP2_AVAILABLE)
+        self.timeout = timeout
+        self.stats = FetchStats()
+        self._hosts: Dict[str, _Host] = {}
+
+    def _host(self, host: str) -> _Host:
+        h = self._hosts.get(host)
+        if h is None:
+            limit = self.host_limits.get(host, self.per_host_limit)
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"accept-encoding": accept_encoding()},
+                limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit),
+            )
+            limiter = AdaptiveTokenBucket(self.host_rates.get(host, self.rate), burst=limit)
+            h = self._hosts[host] = _Host(client, limit, limiter)
+        return h
+
+    def limiter_stats(self) -> Dict[str, dict]:
+        return {name: h.limiter.snapshot() for name, h in self._hosts.items()}
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        max_retries: int = 3,
+    ) -> httpx.Response:
+        cache_key = str(httpx.URL(url, params=params)) if params else url
+        if self.replay:
+            return await asyncio.to_thread(self._replay, method, cache_key)
+        netloc = urlsplit(url).netloc
+        host = self._host(netloc)
+        cached: Optional[CachedPage] = None
+        if self.cache is not None and method == "GET":
+            # 캐시/아카이브는 sqlite+zlib/gzip 동기 I/O -> 이벤트 루프를 막지 않도록 스레드에서
+            cached = await asyncio.to_thread(self.cache.lookup, cache_key)
+            if cached is not None:
+                headers = {**(headers or {}), **self.cache.conditional_headers(cached)}
+        last_err: Optional[Exception] = None
+        for i in range(max_retries):
+            retry_after: Optional[float] = None
+            await host.limiter.acquire()
+            try:
+                async with host.sem:
+                    t0 = time.monotonic()
+                    r = await host.client.request(method, url, params=params, headers=headers)
+                    latency = time.monotonic() - t0
+                self.stats.requests += 1
+                self.stats.bytes_in += len(r.content)
+                metrics.observe("fetch_seconds", latency, host=netloc)
+                metrics.inc("fetch_bytes_total", len(r.content), host=netloc)
+                metrics.inc("fetch_responses_total", host=netloc, status=r.status_code)
+                log.debug("%s %s -> %s (%d bytes, %.3fs)", method, url, r.status_code, len(r.content), latency)
+            except httpx.TransportError as e:
+                # 네트워크 오류는 재시도 대상
+                self.stats.errors += 1
+                metrics.inc("fetch_transport_errors_total", host=netloc)
+                host.limiter.on_error()
+                last_err = e
+            else:
+                if r.status_code == 304 and cached is not None:
+                    host.limiter.on_success(latency)
+                    metrics.inc("fetch_cache_hits_total", host=netloc)
+                    r = _from_cache(r, cached)
+                    await asyncio.to_thread(self._save_revalidated, cache_key, cached, r)
+                    return r
+                if r.status_code < 400:
+                    host.limiter.on_success(latency)
+                    if method == "GET" and r.status_code == 200 and (self.cache is not None or self.archive is not None):
+                        await asyncio.to_thread(self._save, cache_key, r)
+                    return r
+                self.stats.errors += 1
+                last_err = HTTPStatusError(url, r.status_code)
+                if r.status_code in THROTTLE_STATUS:
+                    self.stats.throttled += 1
+                    retry_after = parse_retry_after(r.headers.get("retry-after"))
+                    host.limiter.on_throttle(retry_after)
+                elif r.status_code in RETRY_STATUS:
+                    host.limiter.on_error()
+                else:
+                    # 404 등은 다시 해도 같으므로 바로 실패
+                    break
+
+            if i + 1 < max_retries:
+                self.stats.retries += 1
+                metrics.inc("fetch_retries_total", host=netloc)
+                delay = retry_after if retry_after is not None else backoff_delay(i)
+                log.debug("retry %d/%d %s in %.2fs: %s", i + 1, max_retries, url, delay, last_err)
+                # 세마포어 밖에서 대기: 다른 요청이 슬롯을 쓸 수 있음
+                await asyncio.sleep(delay)
+        raise RuntimeError(f"Failed to fetch {url}: {last_err}")
+
+    def _archive(self, key: str, r: httpx.Response) -> None:
+        self.archive.append(key, r.content, status=r.status_code, content_type=r.headers.get("content-type"))
+
+    # 아래 둘은 asyncio.to_thread 로 부름 (HTTPCache/PageArchive 는 자체 락으로 스레드 안전)
+    def _save(self, key: str, r: httpx.Response) -> None:
+        if self.cache is not None:
+            self.cache.store(key, r.headers, r.content)
+        if self.archive is not None:
+            self._archive(key, r)
+
+    def _save_revalidated(self, key: str, cached: CachedPage, r: httpx.Response) -> None:
+        self.cache.mark_hit(cached)
+        # 캐시가 아카이브보다 먼저 켜져 있었던 경우에만 새로 기록
+        if self.archive is not None and not self.archive.has(key):
+            self._archive(key, r)
+
+    def _replay(self, method: str, key: str) -> httpx.Response:
+        # 아카이브에 없는 페이지는 NotInArchive (목록 페이지 순회는 여기서 멈춤)
+        page = self.archive.get(key)
+        self.stats.requests += 1
+        headers = {"content-type": page.content_type} if page.content_type else {}
+        return httpx.Response(
+            page.status,
+            headers=headers,
+            content=page.body,
+            request=httpx.Request(method, key),
+            extensions={"from_archive": True},
+        )
+
+    async def get(self, url: str, **kw) -> httpx.Response:
+        return await self.request("GET", url, **kw)
+
+    async def get_text(self, url: str, **kw) -> str:
+        return (await self.get(url, **kw)).text
+
+    async def get_json(self, url: str, **kw) -> Any:
+        return (await self.get(url, **kw)).json()
+
+    async def aclose(self) -> None:
+        hosts, self._hosts = self._hosts, {}
+        await asyncio.gather(*(h.client.aclose() for h in hosts.values()), return_exceptions=True)
+
+
+def _from_cache(r: httpx.Response, page: CachedPage) -> httpx.Response:
+    """304 응답을 캐시 본문으로 채운 200 응답으로 바꾼다. extensions["from_cache"] 로 구분 가능."""
+    headers = {**page.headers}
+    for k in ("etag", "last-modified", "date"):
+        if k in r.headers:
+            headers[k] = r.headers[k]
+    return httpx.Response(
+        200,
+        headers=headers,
+        content=page.body,
+        request=r.request,
+        extensions={"from_cache": True},
+    )
+
+
+# ---- 루프별 기본 fetcher ----
+_FETCHERS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Fetcher]" = weakref.WeakKeyDictionary()
+_FETCHER_OPTS: Dict[str, Any] = {}
+
+
+def configure_fetcher(**opts: Any) -> None:
+    """이후 새로 만들어지는 기본 fetcher 의 옵션 (per_host_limit, host_limits, http2, timeout, rate, host_rates, cache, archive, replay)."""
+    _FETCHER_OPTS.update(opts)
+
+
+def get_fetcher() -> Fetcher:
+    loop = asyncio.get_running_loop()
+    f = _FETCHERS.get(loop)
+    if f is None:
+        f = _FETCHERS[loop] = Fetcher(**_FETCHER_OPTS)
+    return f
+
+
+async def close_fetcher() -> None:
+    f = _FETCHERS.pop(asyncio.get_running_loop(), None)
+    if f is not None:
+        await f.aclose()
+
+
+# ---- 동기 래퍼용 백그라운드 루프 ----
+class _BackgroundLoop:
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="fetch-loop", daemon=True)
+        self.thread.start()
+
+    def run(self, coro: Awaitable[T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def stop(self) -> None:
+        try:
+            asyncio.run_coroutine_threadsafe(close_fetcher(), self.loop).result(timeout=5)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+_BG: Optional[_BackgroundLoop] = None
+_BG_LOCK = threading.Lock()
+
+
+def run_sync(fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+    """
+    async fetch 함수를 동기 코드에서 호출. 모든 동기 호출이 같은 루프/커넥션 풀을 공유한다.
+    (이벤트 루프 안에서는 async 버전을 직접 await 할 것)
+    """
+    global _BG
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError(f"{fn.__name__}: called from a running event loop, await the async version")
+    with _BG_LOCK:
+        if _BG is None:
+            _BG = _BackgroundLoop()
+            atexit.register(_BG.stop)
+    return _BG.run(fn(*args, **kwargs))
@@ -0,0 +1,172 @@
+from __future__ import annotations
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+"""
+조건부 요청 HTTP 캐시 (ETag / Last-Modified)
+
+- 200 응답 중 검증자(ETag/Last-Modified)가 있는 것만 zlib 압축 본문과 함께 sqlite에 저장
+- 다음 요청에 If-None-Match / If-Modified-Since 를 붙이고, 304면 디스크 본문을 돌려준다
+  -> 바뀌지 않은 페이지는 헤더 왕복 한 번으로 끝남
+- 압축 후 총 크기가 max_bytes 를 넘으면 오래 안 쓴 것부터 삭제
+- stats: 조건부 요청 수, 304 hit 비율, 절약한 바이트
+"""
+
+DEFAULT_HTTP_CACHE_PATH = Path(".cache") / "http_cache.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url           TEXT PRIMARY KEY,
+    etag          TEXT,
+    last_modified TEXT,
+    headers       TEXT NOT NULL,
+    body          BLOB NOT NULL,
+    raw_size      INTEGER NOT NULL,
+    stored_size   INTEGER NOT NULL,
+    fetched_at    REAL NOT NULL,
+    accessed_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_accessed ON pages(accessed_at);
+"""
+
+# 304 응답으로 본문을 되살릴 때 같이 복원할 헤더
+_KEEP_HEADERS = ("content-type",)
+
+
+@dataclass
+class CachedPage:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    headers: Dict[str, str]
+    body: bytes
+
+
+@dataclass
+class HTTPCacheStats:
+    lookups: int = 0
+    conditional: int = 0
+    hits: int = 0
+    stores: int = 0
+    evicted: int = 0
+    bytes_saved: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / self.conditional if self.conditional else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "lookups": self.lookups,
+            "conditional": self.conditional,
+            "hits_304": self.hits,
+            "hit_ratio": round(self.hit_ratio, 3),
+            "stores": self.stores,
+            "evicted": self.evicted,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+class HTTPCache:
+    def __init__(
+        self,
+        path: Path | str = DEFAULT_HTTP_CACHE_PATH,
+        *,
+        max_bytes: int = 512 * 1024 * 1024,
+        evict_every: int = 200,
+        level: int = 6,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self.level = level
+        self.stats = HTTPCacheStats()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._stores_since_evict = 0
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        with self._lock:
+            self.stats.lookups += 1
+            row = self._db.execute(
+                "SELECT etag, last_modified, headers, body FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, lm, headers, body = row
+        return CachedPage(url, etag, lm, json.loads(headers), zlib.decompress(body))
+
+    def conditional_headers(self, page: CachedPage) -> Dict[str, str]:
+        h: Dict[str, str] = {}
+        if page.etag:
+            h["if-none-match"] = page.etag
+        if page.last_modified:
+            h["if-modified-since"] = page.last_modified
+        if h:
+            self.stats.conditional += 1
+        return h
+
+    def mark_hit(self, page: CachedPage) -> None:
+        """304 를 받아 캐시 본문을 그대로 쓴 경우."""
+        with self._lock:
+            self.stats.hits += 1
+            self.stats.bytes_saved += len(page.body)
+            self._db.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), page.url))
+
+    def store(self, url: str, headers: Dict[str, str], body: bytes) -> bool:
+        """검증자가 있는 응답만 저장. 저장했으면 True."""
+        h = {k.lower(): v for k, v in headers.items()}
+        etag, lm = h.get("etag"), h.get("last-modified")
+        if not etag and not lm:
+            return False
+        if "no-store" in h.get("cache-control", ""):
+            return False
+        keep = {k: h[k] for k in _KEEP_HEADERS if k in h}
+        blob = zlib.compress(body, self.level)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages"
+                "(url, etag, last_modified, headers, body, raw_size, stored_size, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, lm, json.dumps(keep), blob, len(body), len(blob), now, now),
+            )
+            self.stats.stores += 1
+            self._stores_since_evict += 1
+            due = self._stores_since_evict >= self.evict_every
+        if due:
+            self.evict()
+        return True
+
+    def evict(self) -> int:
+        removed = 0
+        with self._lock:
+            self._stores_since_evict = 0
+            total = self._db.execute("SELECT COALESCE(SUM(stored_size), 0) FROM pages").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                victims = []
+                for url, size in self._db.execute("SELECT url, stored_size FROM pages ORDER BY accessed_at"):
+                    if excess <= 0:
+                        break
+                    victims.append((url,))
+                    excess -= size
+                self._db.executemany("DELETE FROM pages WHERE url = ?", victims)
+                removed = len(victims)
+        self.stats.evicted += removed
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+import asyncio
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+"""
+실행 저널 (write-ahead NDJSON)
+
+공고 단위로 stage 결과를 한 줄씩 기록한다: {"id": 문서 id, "stage": "payload"|"action"|"failed", "data": ...}
+- append_ndjson 처럼 줄마다 파일을 여닫지 않고, 열린 파일에 쓰고 줄마다 OS 로 flush
+  (프로세스가 죽어도 이미 기록한 줄은 남음)
+- fsync 만 묶어서: fsync_records 줄마다, 그리고 sync() 를 주기적으로 불러 fsync_interval 초마다
+  (파이프라인이 멈춰 새 기록이 없어도 client 의 타이머가 sync() 를 부름)
+- --resume: 저널의 action 은 색인기로 바로 다시 넣고(색인 전에 죽었을 수 있으므로), 그 공고들은 건너뜀
+  payload 만 있는 공고는 MCP 호출 없이 LLM 단계부터
+- 마지막 줄이 쓰다 만 상태로 끊겼으면 무시
+"""
+
+DEFAULT_JOURNAL_PATH = Path("out") / "run.journal.ndjson"
+
+
+@dataclass
+class JournalState:
+    """이전 실행 저널을 읽은 결과."""
+    actions: List[Dict[str, Any]] = field(default_factory=list)
+    done: Set[str] = field(default_factory=set)
+    payloads: Dict[str, str] = field(default_factory=dict)
+    failed: Set[str] = field(default_factory=set)
+    corrupt_lines: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "done": len(self.done),
+            "actions": len(self.actions),
+            "payloads": len(self.payloads),
+            "failed": len(self.failed - self.done),
+            "corrupt_lines": self.corrupt_lines,
+        }
+
+
+def load_journal(path: Path | str) -> JournalState:
+    state = JournalState()
+    p = Path(path)
+    if not p.exists():
+        return state
+    with p.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                state.corrupt_lines += 1
+                continue
+            key, stage, data = rec.get("id"), rec.get("stage"), rec.get("data")
+            if key is None:
+                continue
+            if stage == "action":
+                state.done.add(key)
+                state.actions.append(data)
+            elif stage == "payload":
+                state.payloads[key] = data
+            elif stage == "failed":
+                state.failed.add(key)
+    return state
+
+
+def _ends_with_newline(path: Path) -> bool:
+    with path.open("rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+class RunJournal:
+    def __init__(
+        self,
+        path: Path | str = DEFAULT_JOURNAL_PATH,
+        *,
+        resume: bool = False,
+        fsync_interval: float = 2.0,
+        fsync_records: int = 200,
+    ):
+        self.path = Path(path)
+        self.fsync_interval = fsync_interval
+        self.fsync_records = fsync_records
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 이어서 할 때는 기존 저널 뒤에 붙이고, 새 실행이면 비우고 시작
+        self.state = load_journal(self.path) if resume else JournalState()
+        self._f = self.path.open("a" if resume else "w", encoding="utf-8")
+        if resume and self._f.tell() and not _ends_with_newline(self.path):
+            # 쓰다 만 마지막 줄 뒤에 바로 붙으면 다음 레코드까지 깨지므로 줄을 끊어 줌
+            self._f.write("\n")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self.written = 0
+        self.syncs = 0
+
+    def record(self, key: str, stage: str, data: Any = None) -> None:
+        line = json.dumps({"id": key, "stage": stage, "data": data}, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._f.write(line)
+            self._f.flush()
+            self.written += 1
+            self._pending += 1
+            if self._pending >= self.fsync_records or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync()
+
+    def _sync(self) -> None:
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self.syncs += 1
+
+    def sync(self) -> None:
+        with self._lock:
+            if self._pending and not self._f.closed:
+                self._sync()
+
+    async def autosync(self) -> None:
+        """fsync_interval 초마다 sync() (새 기록이 없어도 버퍼에 남은 줄을 디스크로). 취소될 때까지 돈다."""
+        while True:
+            await asyncio.sleep(self.fsync_interval)
+            await asyncio.to_thread(self.sync)
+
+    def is_done(self, key: str) -> bool:
+        return key in self.state.done
+
+    def payload_for(self, key: str) -> Optional[str]:
+        return self.state.payloads.get(key)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._f.closed:
+                return
+            self._sync()
+            self._f.close()
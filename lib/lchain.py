@@ -1,13 +1,156 @@
-from langchain_openai import ChatOpenAI
-
-llm = ChatOpenAI(
-    base_url="http://localhost:3434/v1",
-    api_key="EMPTY",  # vLLM 서버에서 강제하지 않으면 더미로 OK
-    model="Qwen/Qwen2.5-7B-Instruct",
-    temperature=0.3,
-    top_p=0.8,
-    max_tokens=1024,
-    # OpenAI 표준 밖 파라미터는 vLLM/OpenAI-client 관례대로 extra_body로 전달
-    extra_body={"repetition_penalty": 1.05},
-    model_kwargs={"response_format": {"type": "json_object"}},  # ✅ JSON 강제
-)
+from __future__ import annotations
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional
+
+from lib import metrics
+from lib.util import JOB_JSON_SCHEMA
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+# 샘플링 파라미터는 응답 캐시 키에도 들어가므로 한 곳에서 관리
+LLM_PARAMS = {
+    "model": "Qwen/Qwen2.5-7B-Instruct",
+    "temperature": 0.3,
+    "top_p": 0.8,
+    "max_tokens": 1024,
+    "repetition_penalty": 1.05,
+    # vLLM guided decoding: 스키마 밖 키/잘못된 JSON 은 애초에 생성되지 않음
+    "response_format": {
+        "type": "json_schema",
+        "json_schema": {"name": "job_posting", "schema": JOB_JSON_SCHEMA, "strict": True},
+    },
+}
+
+LLM_BASE_URL = "http://localhost:3434/v1"
+
+
+def make_llm(base_url: str = LLM_BASE_URL) -> ChatOpenAI:
+    # langchain_openai(openai 포함) import 가 수백 ms 라 실제로 만들 때만
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        base_url=base_url,
+        api_key="EMPTY",  # vLLM 서버에서 강제하지 않으면 더미로 OK
+        model=LLM_PARAMS["model"],
+        temperature=LLM_PARAMS["temperature"],
+        top_p=LLM_PARAMS["top_p"],
+        max_tokens=LLM_PARAMS["max_tokens"],
+        # OpenAI 표준 밖 파라미터는 vLLM/OpenAI-client 관례대로 extra_body로 전달
+        extra_body={"repetition_penalty": LLM_PARAMS["repetition_penalty"]},
+        model_kwargs={"response_format": LLM_PARAMS["response_format"]},  # ✅ 스키마 강제
+        # 스트리밍 마지막 청크에 usage 를 받아서 토큰 수 / prefix cache 적중을 기록
+        stream_usage=True,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_llm() -> ChatOpenAI:
+    """기본 vLLM 서버용 공용 인스턴스 (처음 쓸 때 생성)."""
+    return make_llm()
+
+
+def __getattr__(name: str):
+    # 예전 `from lib.lchain import llm` 호환
+    if name == "llm":
+        return get_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _pct(xs: List[float], q: float) -> Optional[float]:
+    if not xs:
+        return None
+    xs = sorted(xs)
+    return round(xs[min(len(xs) - 1, int(q * len(xs)))], 3)
+
+
+@dataclass
+class LLMUsage:
+    """
+    실행 단위 토큰/지연시간 집계.
+    cached_tokens 는 vLLM 을 --enable-prompt-tokens-details 로 띄워야 채워진다 (아니면 0).
+    """
+    requests: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    ttft: List[float] = field(default_factory=list)
+    latency: List[float] = field(default_factory=list)
+
+    def record(self, usage: Optional[dict], ttft: Optional[float], latency: float) -> None:
+        self.requests += 1
+        usage = usage or {}
+        prompt = usage.get("input_tokens", 0)
+        completion = usage.get("output_tokens", 0)
+        cached = (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+        self.prompt_tokens += prompt
+        self.completion_tokens += completion
+        self.cached_tokens += cached
+        if ttft is not None:
+            self.ttft.append(ttft)
+            metrics.observe("llm_ttft_seconds", ttft)
+        self.latency.append(latency)
+        metrics.observe("llm_latency_seconds", latency)
+        metrics.inc("llm_prompt_tokens_total", prompt)
+        metrics.inc("llm_completion_tokens_total", completion)
+        metrics.inc("llm_cached_prompt_tokens_total", cached)
+
+    @property
+    def prefix_cache_hit_rate(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    def as_dict(self) -> dict:
+        n = self.requests or 1
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "prompt_tokens_per_request": round(self.prompt_tokens / n, 1),
+            "completion_tokens_per_request": round(self.completion_tokens / n, 1),
+            "cached_prompt_tokens": self.cached_tokens,
+            "prefix_cache_hit_rate": round(self.prefix_cache_hit_rate, 3),
+            "ttft_p50": _pct(self.ttft, 0.5),
+            "ttft_p95": _pct(self.ttft, 0.95),
+            "latency_p50": _pct(self.latency, 0.5),
+            "latency_p95": _pct(self.latency, 0.95),
+        }
+
+
+def _usage_from_token_usage(token_usage: Optional[dict]) -> Optional[dict]:
+    """OpenAI 형식 usage -> usage_metadata 형식."""
+    if not token_usage:
+        return None
+    details = token_usage.get("prompt_tokens_details") or {}
+    return {
+        "input_tokens": token_usage.get("prompt_tokens") or 0,
+        "output_tokens": token_usage.get("completion_tokens") or 0,
+        "total_tokens": token_usage.get("total_tokens") or 0,
+        "input_token_details": {"cache_read": details.get("cached_tokens") or 0},
+    }
+
+
+async def astream_with_usage(model, messages):
+    """스트리밍으로 호출. (응답 본문, usage_metadata, TTFT, 전체 지연시간)"""
+    t0 = time.perf_counter()
+    ttft = None
+    msg = None
+    async for chunk in model.astream(messages):
+        if ttft is None and chunk.content:
+            ttft = time.perf_counter() - t0
+        msg = chunk if msg is None else msg + chunk
+    latency = time.perf_counter() - t0
+    content = msg.content if msg is not None else ""
+    usage = getattr(msg, "usage_metadata", None)
+    if usage is None and msg is not None:
+        # response_format 이 있으면 beta 스트림 경로를 타서 usage 가 response_metadata 에만 남음
+        usage = _usage_from_token_usage(msg.response_metadata.get("token_usage"))
+    return content, usage, ttft, latency
+
+
+async def ainvoke_tracked(model, messages, usage: Optional[LLMUsage] = None) -> str:
+    """스트리밍으로 호출해서 첫 토큰까지 시간(TTFT)과 usage 를 기록하고, 응답 본문을 돌려준다."""
+    content, meta, ttft, latency = await astream_with_usage(model, messages)
+    if usage is not None:
+        usage.record(meta, ttft, latency)
+    return content
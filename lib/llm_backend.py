@@ -0,0 +1,198 @@
+from __future__ import annotations
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from lib.aimd import AdaptiveConcurrency
+from lib.lchain import LLM_PARAMS, LLMUsage, astream_with_usage, get_llm
+from lib.prompt import build_messages
+from lib.util import JOB_JSON_SCHEMA, SCHEMA_KEY_ORDER, ARRAY_KEYS
+
+"""
+구조화 LLM 백엔드
+
+모두 같은 인터페이스: await backend.complete_batch(texts) -> [응답 문자열 | Exception, ...] (texts 와 같은 순서)
+- http : vLLM OpenAI 호환 서버 (lib/lchain.py 의 ChatOpenAI), 요청을 동시에 보냄
+         (controller 를 주면 동시 요청 수/타임아웃을 AdaptiveConcurrency 가 정함, lib/aimd.py)
+- vllm : 프로세스 안에서 vllm.LLM 으로 모델을 올리고 한 번에 큰 배치로 chat (야간 백필용, GPU 필요)
+- fake : 입력 문자열의 "키: 값" 줄로 스키마 JSON 을 만드는 가짜 (CPU 전용 환경에서 파이프라인 확인용)
+"""
+
+
+Result = Union[str, Exception]
+
+
+class BackendUnavailable(RuntimeError):
+    pass
+
+
+class HTTPBackend:
+    name = "http"
+
+    def __init__(self, llm=None, usage: Optional[LLMUsage] = None,
+                 controller: Optional[AdaptiveConcurrency] = None):
+        self.llm = llm or get_llm()
+        self.usage = usage
+        self.controller = controller
+
+    async def _one(self, text: str) -> str:
+        call = astream_with_usage(self.llm, build_messages(text))
+        ctrl = self.controller
+        if ctrl is None:
+            content, meta, ttft, latency = await call
+        else:
+            try:
+                content, meta, ttft, latency = await ctrl.run(call)
+            except asyncio.TimeoutError:
+                ctrl.on_timeout()
+                raise
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                ctrl.on_error()
+                raise
+            ctrl.on_success(latency, (meta or {}).get("output_tokens", 0))
+        if self.usage is not None:
+            self.usage.record(meta, ttft, latency)
+        return content
+
+    async def complete_batch(self, texts: List[str]) -> List[Result]:
+        return await asyncio.gather(*(self._one(t) for t in texts), return_exceptions=True)
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class VLLMOfflineBackend:
+    """
+    vllm.LLM.chat 으로 배치 전체를 한 번에 생성. 샘플링 파라미터/스키마는 HTTP 백엔드와 같음(LLM_PARAMS).
+    모델 로딩이 무거우므로 open() 에서 한 번만 올린다.
+    """
+    name = "vllm"
+
+    def __init__(self, usage: Optional[LLMUsage] = None, **engine_kwargs: Any):
+        self.usage = usage
+        self.engine_kwargs = {"enable_prefix_caching": True, **engine_kwargs}
+        self._llm = None
+        self._sampling = None
+
+    def _load(self):
+        if self._llm is None:
+            try:
+                import vllm
+            except ImportError as e:
+                raise BackendUnavailable("llm backend 'vllm' needs the vllm package (and a GPU)") from e
+            try:
+                # vllm 0.12 부터 guided_decoding(GuidedDecodingParams) 제거 -> structured_outputs
+                from vllm import LLM, SamplingParams
+                from vllm.sampling_params import StructuredOutputsParams
+            except ImportError as e:
+                version = getattr(vllm, "__version__", "?")
+                raise BackendUnavailable(
+                    f"llm backend 'vllm' needs vllm>=0.12 (StructuredOutputsParams), found {version}: {e}"
+                ) from e
+            self._llm = LLM(model=LLM_PARAMS["model"], **self.engine_kwargs)
+            self._sampling = SamplingParams(
+                temperature=LLM_PARAMS["temperature"],
+                top_p=LLM_PARAMS["top_p"],
+                max_tokens=LLM_PARAMS["max_tokens"],
+                repetition_penalty=LLM_PARAMS["repetition_penalty"],
+                structured_outputs=StructuredOutputsParams(json=JOB_JSON_SCHEMA),
+            )
+        return self._llm
+
+    def _generate(self, texts: List[str]) -> List[Result]:
+        llm = self._load()
+        t0 = time.perf_counter()
+        outputs = llm.chat([build_messages(t) for t in texts], self._sampling, use_tqdm=False)
+        elapsed = time.perf_counter() - t0
+        results: List[Result] = []
+        for out in outputs:
+            if self.usage is not None:
+                self.usage.record(
+                    {
+                        "input_tokens": len(out.prompt_token_ids or []),
+                        "output_tokens": len(out.outputs[0].token_ids),
+                        "input_token_details": {"cache_read": getattr(out, "num_cached_tokens", 0) or 0},
+                    },
+                    None,
+                    # 배치 안에서 개별 지연시간은 알 수 없으므로 배치 전체 시간
+                    elapsed,
+                )
+            results.append(out.outputs[0].text)
+        return results
+
+    async def complete_batch(self, texts: List[str]) -> List[Result]:
+        try:
+            return await asyncio.to_thread(self._generate, texts)
+        except BackendUnavailable:
+            raise
+        except Exception as e:
+            return [e] * len(texts)
+
+    def open(self) -> None:
+        # 모델 로딩(수십 초)과 의존성 오류를 파이프라인 시작 전에
+        self._load()
+
+    def close(self) -> None:
+        self._llm = None
+
+
+class FakeBackend:
+    """payload 의 "키: 값" 줄에서 스키마 키만 골라 JSON 을 만든다. (모델 없이 normalize/색인 경로 확인)"""
+    name = "fake"
+
+    def __init__(self, usage: Optional[LLMUsage] = None, *, delay: float = 0.0):
+        self.usage = usage
+        self.delay = delay
+
+    def _one(self, text: str) -> str:
+        fields: Dict[str, str] = {}
+        for line in text.splitlines():
+            k, sep, v = line.partition(": ")
+            if sep and k in SCHEMA_KEY_ORDER and k not in fields:
+                fields[k] = v.strip()
+        obj: Dict[str, Any] = {}
+        for k in SCHEMA_KEY_ORDER:
+            v = fields.get(k)
+            if k in ARRAY_KEYS:
+                try:
+                    parsed = json.loads(v) if v else []
+                except json.JSONDecodeError:
+                    parsed = [v]
+                obj[k] = parsed if isinstance(parsed, list) else [str(parsed)]
+            else:
+                obj[k] = v or None
+        return json.dumps(obj, ensure_ascii=False)
+
+    async def complete_batch(self, texts: List[str]) -> List[Result]:
+        t0 = time.perf_counter()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        out = [self._one(t) for t in texts]
+        if self.usage is not None:
+            elapsed = time.perf_counter() - t0
+            for t, o in zip(texts, out):
+                self.usage.record({"input_tokens": len(t), "output_tokens": len(o)}, elapsed, elapsed)
+        return out
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+BACKENDS = {"http": HTTPBackend, "vllm": VLLMOfflineBackend, "fake": FakeBackend}
+
+
+def get_backend(name: str, usage: Optional[LLMUsage] = None, **kwargs: Any):
+    try:
+        cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"unknown llm backend: {name} (choose from {', '.join(BACKENDS)})") from None
+    return cls(usage=usage, **kwargs)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+"""
+LLM 응답 캐시 (content-addressed, sqlite)
+
+키 = sha256(system prompt, payload 문자열, 모델/샘플링 파라미터)
+- 같은 공고 문자열은 실행이 바뀌어도, 한 실행 안에서 중복돼도 추론을 다시 하지 않는다
+- 크래시 후 재실행 / coerce_job_record 스키마 수정 후 재실행도 캐시로 처리
+- 크기(바이트)·나이 기준 LRU 삭제, hit/miss 카운터
+- bypass=True 면 읽기만 건너뛰고 새 응답은 계속 기록
+"""
+
+DEFAULT_CACHE_PATH = Path(".cache") / "llm_responses.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key         TEXT PRIMARY KEY,
+    value       TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed_at);
+"""
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evicted: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        n = self.hits + self.misses
+        return self.hits / n if n else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evicted": self.evicted,
+            "hit_ratio": round(self.hit_ratio, 3),
+        }
+
+
+class LLMCache:
+    def __init__(
+        self,
+        path: Path | str = DEFAULT_CACHE_PATH,
+        *,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age: Optional[float] = 30 * 24 * 3600,
+        bypass: bool = False,
+        evict_every: int = 200,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.bypass = bypass
+        self.evict_every = evict_every
+        self.stats = CacheStats()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._puts_since_evict = 0
+
+    @staticmethod
+    def make_key(system: str, payload: str, params: Dict[str, Any]) -> str:
+        base = json.dumps([system, payload, params], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        if self.bypass:
+            self.stats.misses += 1
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.max_age is not None and now - row[1] > self.max_age):
+                self.stats.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        self.stats.hits += 1
+        return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses(key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self.stats.writes += 1
+            self._puts_since_evict += 1
+            due = self._puts_since_evict >= self.evict_every
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """나이 초과분 삭제 후, 총 크기가 max_bytes 이하가 될 때까지 오래 안 쓴 것부터 삭제."""
+        removed = 0
+        with self._lock:
+            self._puts_since_evict = 0
+            if self.max_age is not None:
+                cur = self._db.execute(
+                    "DELETE FROM responses WHERE created_at < ?", (time.time() - self.max_age,)
+                )
+                removed += cur.rowcount
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                victims = []
+                for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+                    if excess <= 0:
+                        break
+                    victims.append((key,))
+                    excess -= size
+                self._db.executemany("DELETE FROM responses WHERE key = ?", victims)
+                removed += len(victims)
+        self.stats.evicted += removed
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,223 @@
+from __future__ import annotations
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from lib import metrics
+
+if TYPE_CHECKING:
+    from langchain_mcp_adapters.client import MultiServerMCPClient
+    from mcp import ClientSession
+
+"""
+MCP 세션 풀
+
+MultiServerMCPClient의 tool.ainvoke()는 호출마다 stdio 서버 프로세스를 새로 띄우고
+핸드셰이크를 다시 한다. 이 풀은 서버 프로세스 N개를 한 번만 띄워서 계속 재사용한다.
+
+- 슬롯 하나 = 서버 프로세스 하나 + ClientSession 하나
+- 동시에 실행되는 call_tool 수는 슬롯 수로 제한
+- 서버가 죽으면(전송 오류/타임아웃) 해당 슬롯만 재시작하고 다른 슬롯으로 1회 재시도
+- 재시작은 연속 실패마다 backoff 를 두 배로(상한 max_backoff), max_restarts 번 연속 실패하면 그 슬롯은 포기
+- start() 는 start_timeout 안에 모든 슬롯이 뜨지 않으면 MCPUnavailable, call_tool 은 슬롯 대기까지 call_timeout 안에서
+"""
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class _Slot:
+    index: int
+    session: Optional[ClientSession] = None
+    ready: asyncio.Event = field(default_factory=asyncio.Event)
+    dead: asyncio.Event = field(default_factory=asyncio.Event)
+    restarts: int = 0
+    failures: int = 0                       # 연속 실패 (정상 호출 한 번이면 0으로)
+    error: Optional[BaseException] = None   # 재시작 한도를 넘겨 포기한 이유
+    task: Optional[asyncio.Task] = None
+
+
+class MCPToolError(RuntimeError):
+    """서버가 isError=True 로 응답한 경우 (세션은 정상)."""
+
+
+class MCPUnavailable(RuntimeError):
+    """서버 프로세스를 띄우지 못함 (기동 시간 초과 또는 재시작 한도 초과)."""
+
+
+class MCPSessionPool:
+    def __init__(
+        self,
+        client: MultiServerMCPClient,
+        server_name: str,
+        *,
+        size: int = 2,
+        call_timeout: float = 60.0,
+        start_timeout: float = 30.0,
+        restart_backoff: float = 0.5,
+        max_backoff: float = 10.0,
+        max_restarts: int = 5,
+    ):
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        self._client = client
+        self._server_name = server_name
+        self._size = size
+        self._call_timeout = call_timeout
+        self._start_timeout = start_timeout
+        self._restart_backoff = restart_backoff
+        self._max_backoff = max_backoff
+        self._max_restarts = max_restarts
+        # mcp 패키지는 start() 에서 import (client 기동 시간) -> 그 전엔 아무것도 안 잡음
+        self._protocol_errors: tuple = ()
+
+        self._slots: list[_Slot] = []
+        self._idle: asyncio.Queue[_Slot] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+        self._closing = False
+
+    # ---- lifecycle ----
+    async def start(self) -> "MCPSessionPool":
+        from mcp.shared.exceptions import McpError
+        self._protocol_errors = (McpError,)
+        for i in range(self._size):
+            slot = _Slot(index=i)
+            self._slots.append(slot)
+            # 세션 open/close는 반드시 같은 task 안에서 (anyio cancel scope 제약)
+            slot.task = asyncio.create_task(self._run_slot(slot))
+            self._tasks.append(slot.task)
+            self._idle.put_nowait(slot)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._start_timeout
+        try:
+            await asyncio.gather(*(self._wait_ready(s, deadline) for s in self._slots))
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    async def close(self) -> None:
+        self._closing = True
+        for slot in self._slots:
+            slot.dead.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def __aenter__(self) -> "MCPSessionPool":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _run_slot(self, slot: _Slot) -> None:
+        last: BaseException = ConnectionError("session closed")
+        while not self._closing:
+            slot.dead.clear()
+            try:
+                # 핸드셰이크가 끝나지 않는 서버도 start_timeout 안에 포기 (열린 뒤에는 시간 제한 없음)
+                async with asyncio.timeout(self._start_timeout) as started:
+                    async with self._client.session(self._server_name) as session:
+                        started.reschedule(None)
+                        slot.session = session
+                        slot.ready.set()
+                        await slot.dead.wait()
+            except Exception as e:
+                last = e
+                log.warning("mcp slot %d (%s) crashed: %s", slot.index, self._server_name, str(e) or type(e).__name__)
+            finally:
+                slot.session = None
+                slot.ready.clear()
+
+            if self._closing:
+                break
+            slot.failures += 1
+            if slot.failures > self._max_restarts:
+                slot.error = last
+                log.error("mcp slot %d (%s) gave up after %d restarts: %s",
+                          slot.index, self._server_name, slot.failures - 1, last)
+                return
+            slot.restarts += 1
+            delay = min(self._max_backoff, self._restart_backoff * 2 ** (slot.failures - 1))
+            log.info("mcp slot %d restarting (#%d) in %.1fs", slot.index, slot.restarts, delay)
+            await asyncio.sleep(delay)
+
+    async def _wait_ready(self, slot: _Slot, deadline: float) -> None:
+        """슬롯이 뜰 때까지 deadline(loop.time 기준)까지 대기. 슬롯이 포기했으면 바로 MCPUnavailable."""
+        if slot.ready.is_set():
+            return
+        waiter = asyncio.ensure_future(slot.ready.wait())
+        try:
+            timeout = max(0.0, deadline - asyncio.get_running_loop().time())
+            await asyncio.wait({waiter, slot.task}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waiter.cancel()
+        if slot.ready.is_set():
+            return
+        if slot.task.done():
+            raise MCPUnavailable(f"mcp server {self._server_name!r} (slot {slot.index}) failed to start: {slot.error}")
+        raise TimeoutError(f"mcp server {self._server_name!r} (slot {slot.index}) not ready in time")
+
+    def _alive(self) -> bool:
+        return any(not s.task.done() for s in self._slots)
+
+    # ---- calls ----
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """
+        도구 1회 호출. 텍스트 응답이면 str, 구조화 응답이면 그 값을 반환.
+        전송 계층 오류는 슬롯을 재시작하고 다른 슬롯으로 한 번 더 시도한다.
+        """
+        last_err: Optional[BaseException] = None
+        loop = asyncio.get_running_loop()
+        # 빈 슬롯 대기 + 세션 준비 대기 + 호출까지 전부 call_timeout 안에서
+        deadline = loop.time() + self._call_timeout
+        for _ in range(2):
+            if not self._alive():
+                raise MCPUnavailable(f"mcp server {self._server_name!r}: all slots gave up ({last_err})")
+            slot = await asyncio.wait_for(self._idle.get(), timeout=max(0.0, deadline - loop.time()))
+            try:
+                await self._wait_ready(slot, deadline)
+                session = slot.session
+                if session is None:
+                    raise ConnectionError("session not ready")
+                with metrics.timed("mcp_call_seconds", tool=name):
+                    res = await asyncio.wait_for(
+                        session.call_tool(name, arguments), timeout=max(0.0, deadline - loop.time())
+                    )
+                slot.failures = 0
+            except self._protocol_errors:
+                # 프로토콜 수준 오류(잘못된 도구명/인자 등)는 세션 문제가 아님
+                raise
+            except Exception as e:
+                last_err = e
+                metrics.inc("mcp_call_errors_total", tool=name)
+                log.warning("mcp call %s failed on slot %d: %s", name, slot.index, e)
+                # 재시작이 끝나기 전까지 다른 호출이 죽은 세션을 집지 않도록 먼저 내려둔다
+                slot.session = None
+                slot.ready.clear()
+                slot.dead.set()
+                continue
+            finally:
+                # 포기한 슬롯은 돌려놓지 않음 (다른 호출이 집어서 기다리지 않게)
+                if not slot.task.done():
+                    self._idle.put_nowait(slot)
+            return _unwrap_result(name, res)
+        if not self._alive():
+            raise MCPUnavailable(f"mcp server {self._server_name!r}: all slots gave up ({last_err})")
+        raise RuntimeError(f"MCP call {name!r} failed: {last_err}")
+
+    @property
+    def restarts(self) -> int:
+        return sum(s.restarts for s in self._slots)
+
+
+def _unwrap_result(name: str, res: Any) -> Any:
+    texts = [c.text for c in (res.content or []) if getattr(c, "type", None) == "text"]
+    if res.isError:
+        raise MCPToolError(f"{name}: {' '.join(texts) or 'tool error'}")
+    structured = res.structuredContent
+    if isinstance(structured, dict) and "result" in structured and len(structured) == 1:
+        return structured["result"]
+    if structured is not None and not texts:
+        return structured
+    return "\n".join(texts)
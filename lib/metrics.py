@@ -0,0 +1,363 @@
+from __future__ import annotations
+import bisect
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+"""
+실행 지표 (카운터 / 게이지 / 지연시간 히스토그램) + 샘플링 프로파일러
+
+- 기본은 꺼져 있음: inc/observe/set_gauge/timed 는 전역 플래그 하나만 보고 바로 돌아감
+- enable() 후에는 프로세스 안의 레지스트리 하나에 모음 (스레드 안전)
+  · render_prometheus(): Prometheus 텍스트 형식, serve(port) 로 /metrics 에서 노출
+  · snapshot() / write_summary(path): 실행 단위 JSON 요약 (히스토그램은 p50/p95/p99 추정치 포함)
+- SamplingProfiler: interval 초마다 모든 스레드의 스택을 떠서 파이프라인 stage 별로 묶음
+  (folded stack 형식 -> flamegraph.pl / speedscope 로 볼 수 있음)
+- stdout 에는 아무것도 쓰지 않는다 (stdio MCP 서버가 같은 모듈을 import 함)
+"""
+
+NAMESPACE = "jobcrawl"
+
+# 지연시간(초) 히스토그램 버킷 상한
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_enabled = False
+_lock = threading.Lock()
+
+Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class _Histogram:
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, v: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, v)] += 1
+        self.count += 1
+        self.sum += v
+        if v > self.max:
+            self.max = v
+
+    def quantile(self, q: float) -> Optional[float]:
+        """버킷 안에서 선형 보간한 추정치 (마지막 버킷은 관측 최댓값까지)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if seen + c >= rank and c:
+                lo = LATENCY_BUCKETS[i - 1] if i else 0.0
+                hi = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else self.max
+                return min(self.max, lo + (hi - lo) * (rank - seen) / c)
+            seen += c
+        return self.max
+
+
+_counters: Dict[Key, float] = {}
+_gauges: Dict[Key, Tuple[float, float]] = {}  # (마지막 값, 최댓값)
+_histograms: Dict[Key, _Histogram] = {}
+
+
+def _key(name: str, labels: Dict[str, Any]) -> Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _histograms.clear()
+
+
+def inc(name: str, value: float = 1, **labels: Any) -> None:
+    if not _enabled:
+        return
+    k = _key(name, labels)
+    with _lock:
+        _counters[k] = _counters.get(k, 0) + value
+
+
+def set_gauge(name: str, value: float, **labels: Any) -> None:
+    if not _enabled:
+        return
+    k = _key(name, labels)
+    with _lock:
+        prev = _gauges.get(k)
+        _gauges[k] = (value, value if prev is None else max(prev[1], value))
+
+
+def observe(name: str, seconds: float, **labels: Any) -> None:
+    if not _enabled:
+        return
+    k = _key(name, labels)
+    with _lock:
+        h = _histograms.get(k)
+        if h is None:
+            h = _histograms[k] = _Histogram()
+        h.add(seconds)
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "t0")
+
+    def __init__(self, name: str, labels: Dict[str, Any]):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.t0, **self.labels)
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+_NOOP = _NoopTimer()
+
+
+def timed(name: str, **labels: Any):
+    """with timed("normalize_seconds"): ... -> 걸린 시간을 히스토그램에. 꺼져 있으면 아무것도 안 함."""
+    return _Timer(name, labels) if _enabled else _NOOP
+
+
+# ---- 내보내기 ----
+def _esc(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(labels: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+    parts = ['%s="%s"' % (k, _esc(v)) for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def render_prometheus() -> str:
+    lines: List[str] = []
+    with _lock:
+        counters = sorted(_counters.items())
+        gauges = sorted(_gauges.items())
+        hists = sorted((k, (list(h.counts), h.count, h.sum)) for k, h in _histograms.items())
+
+    def typed(kind: str, items):
+        last = None
+        for (name, labels), value in items:
+            full = f"{NAMESPACE}_{name}"
+            if full != last:
+                lines.append(f"# TYPE {full} {kind}")
+                last = full
+            yield full, labels, value
+
+    for full, labels, v in typed("counter", counters):
+        lines.append(f"{full}{_fmt_labels(labels)} {v:g}")
+    for full, labels, (v, _) in typed("gauge", gauges):
+        lines.append(f"{full}{_fmt_labels(labels)} {v:g}")
+    for full, labels, (counts, count, total) in typed("histogram", hists):
+        acc = 0
+        for bound, c in zip(LATENCY_BUCKETS, counts):
+            acc += c
+            le = 'le="%g"' % bound
+            lines.append(f"{full}_bucket{_fmt_labels(labels, le)} {acc}")
+        inf = 'le="+Inf"'
+        lines.append(f"{full}_bucket{_fmt_labels(labels, inf)} {count}")
+        lines.append(f"{full}_sum{_fmt_labels(labels)} {total:g}")
+        lines.append(f"{full}_count{_fmt_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def _label_str(labels: Tuple[Tuple[str, str], ...]) -> str:
+    return ",".join(f"{k}={v}" for k, v in labels)
+
+
+def snapshot() -> Dict[str, Any]:
+    """{"counters": {name: {labels: v}}, "gauges": ..., "histograms": {name: {labels: {count, sum, p50, ...}}}}"""
+    out: Dict[str, Dict[str, Any]] = {"counters": {}, "gauges": {}, "histograms": {}}
+    with _lock:
+        for (name, labels), v in sorted(_counters.items()):
+            out["counters"].setdefault(name, {})[_label_str(labels)] = v
+        for (name, labels), (v, peak) in sorted(_gauges.items()):
+            out["gauges"].setdefault(name, {})[_label_str(labels)] = {"last": v, "max": peak}
+        for (name, labels), h in sorted(_histograms.items()):
+            out["histograms"].setdefault(name, {})[_label_str(labels)] = {
+                "count": h.count,
+                "sum": round(h.sum, 6),
+                "mean": round(h.sum / h.count, 6) if h.count else None,
+                "p50": _round(h.quantile(0.5)),
+                "p95": _round(h.quantile(0.95)),
+                "p99": _round(h.quantile(0.99)),
+                "max": round(h.max, 6),
+            }
+    return out
+
+
+def _round(v: Optional[float]) -> Optional[float]:
+    return round(v, 6) if v is not None else None
+
+
+def write_summary(path: Path | str, extra: Optional[Dict[str, Any]] = None) -> Path:
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    doc = {"at": time.strftime("%Y-%m-%dT%H:%M:%S"), "pid": os.getpid(), **snapshot(), **(extra or {})}
+    tmp = p.with_suffix(p.suffix + ".tmp")
+    tmp.write_text(json.dumps(doc, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+    tmp.replace(p)
+    return p
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/metrics.json"):
+            body, ctype = json.dumps(snapshot(), ensure_ascii=False).encode(), "application/json"
+        elif self.path.startswith("/metrics"):
+            body, ctype = render_prometheus().encode(), "text/plain; version=0.0.4"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("content-type", ctype)
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """/metrics (Prometheus 텍스트), /metrics.json 을 데몬 스레드에서 노출. 닫을 때는 .shutdown()."""
+    httpd = ThreadingHTTPServer((host, port), _MetricsHandler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, name="metrics-http", daemon=True).start()
+    return httpd
+
+
+# ---- 샘플링 프로파일러 ----
+_THREAD_SUFFIX_RE = re.compile(r"(?:[_-]\d+)?(?: \(.*\))?$")
+# stage 에 속하지 않은 스레드가 이 함수들에서 멈춰 있으면 일이 없어서 대기 중인 것
+_IDLE_LEAVES = {"select", "poll", "do_poll", "wait", "_worker", "readinto", "recv_into", "_recv", "accept", "get"}
+
+
+class SamplingProfiler:
+    """
+    interval 초마다 sys._current_frames() 로 모든 스레드의 스택을 떠서 stage 별로 센다.
+    stage 이름:
+      - 이벤트 루프: 스택에서 pipeline._run_worker 바로 위 프레임 = Stage.fn (예: llm_stage)
+      - asyncio.to_thread / 스레드 풀: 풀 워커가 부른 함수 (예: thread:dedup_rows, thread:add_many)
+      - 그 밖: 스레드 이름, 할 일 없이 대기 중인 샘플은 stack 없이 idle 로만 셈
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 48):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples: Counter = Counter()
+        self.idle: Counter = Counter()
+        self.taken = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self._thread = threading.Thread(target=self._loop, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _loop(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for tid, frame in sys._current_frames().items():
+                if tid != me:
+                    self._record(frame, names.get(tid, str(tid)))
+            self.taken += 1
+
+    def _record(self, frame, thread_name: str) -> None:
+        stack: List[str] = []
+        stage = None
+        child = None
+        f = frame
+        while f is not None:
+            code = f.f_code
+            if stage is None and child is not None:
+                if code.co_name == "_run_worker" and code.co_filename.endswith("pipeline.py"):
+                    stage = child.f_code.co_name
+                elif code.co_name == "run" and code.co_filename.endswith(os.path.join("futures", "thread.py")):
+                    stage = "thread:" + child.f_code.co_name
+            if len(stack) < self.max_depth:
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            child, f = f, f.f_back
+        if stage is None:
+            name = "thread:" + _THREAD_SUFFIX_RE.sub("", thread_name)
+            if frame.f_code.co_name in _IDLE_LEAVES:
+                self.idle[name] += 1
+                return
+            stage = name
+        stack.reverse()
+        self.samples[(stage, ";".join(stack))] += 1
+
+    def folded(self) -> str:
+        """stage;root;...;leaf count (flamegraph 입력 형식)"""
+        return "".join(f"{stage};{stack} {n}\n" for (stage, stack), n in self.samples.most_common())
+
+    def top(self, n: int = 15) -> Dict[str, Any]:
+        """stage 별 샘플 수와 self 샘플이 많은 함수 상위 n개."""
+        per_stage: Dict[str, Counter] = {}
+        totals: Counter = Counter()
+        for (stage, stack), c in self.samples.items():
+            leaf = stack.rsplit(";", 1)[-1]
+            per_stage.setdefault(stage, Counter())[leaf] += c
+            totals[stage] += c
+        return {
+            "interval_s": self.interval,
+            "samples": self.taken,
+            "idle": dict(self.idle.most_common()),
+            "stages": {
+                stage: {"samples": totals[stage], "top_self": per_stage[stage].most_common(n)}
+                for stage, _ in totals.most_common()
+            },
+        }
+
+    def write(self, path: Path | str) -> Path:
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(self.folded(), encoding="utf-8")
+        return p
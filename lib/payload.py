@@ -0,0 +1,130 @@
+from __future__ import annotations
+import json
+from typing import Any, Dict, Optional
+
+"""
+LLM 입력 포맷팅 (순수 함수, 표준 라이브러리만)
+
+MCP 서버의 payload 도구가 이것만 쓰므로 크롤러 쪽(bs4, fetch, 프로세스 풀)과 분리해 둔다.
+lib.req 가 같은 이름으로 다시 내보내므로 기존 `from lib.req import ...` 도 그대로 동작.
+"""
+
+FIELD_ORDER = [
+    "회사이름",
+    "포지션",
+    "title",
+    "title_tag",
+    "description",
+    "meta_description",
+    "url",
+    "employmentType",
+    "datePosted",
+    "occupationalCategory",
+    "validThrough",
+    "experienceRequirements",
+]
+
+DATA_STRUCT = {
+        "회사이름": None,
+        "포지션": None,
+        "회사 위치": None,
+        "자격 요건": [],
+        "주요업무": [],
+        "employmentType": None,
+        "datePosted": None,
+        "occupationalCategory": [],
+        "validThrough": None,
+        "experienceRequirements": [],
+        "url": None,
+}
+
+
+# 같은 값을 다른 이름으로 들고 오는 키들 (원티드 목록 행 -> 스키마 이름)
+PAYLOAD_KEY_ALIASES = {
+    "name": "회사이름",
+    "company_name": "회사이름",
+    "position": "포지션",
+    "title": "title_tag",
+    "description": "meta_description",
+}
+# LLM 이 볼 필요 없는 내부 키
+PAYLOAD_SKIP_KEYS = {"error", "content_fingerprint"}
+# meta_description 토큰 상한 (프롬프트 토큰이 대부분 여기서 나옴)
+DESCRIPTION_TOKEN_BUDGET = 768
+
+
+def approx_tokens(text: str) -> int:
+    """토크나이저 없이 쓰는 토큰 수 추정 (ASCII ~4자/토큰, 한글 등은 ~1자/토큰, 넉넉하게)."""
+    ascii_n = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_n + 3) // 4 + (len(text) - ascii_n)
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """budget 토큰 안으로 자르되 가능하면 줄/불릿 경계에서 자른다."""
+    if approx_tokens(text) <= budget:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if approx_tokens(text[:mid]) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    cut = text[:lo]
+    for sep in ("\n", " • ", "• ", ". "):
+        at = cut.rfind(sep)
+        if at > lo // 2:
+            return cut[:at].rstrip()
+    return cut.rstrip()
+
+
+def _payload_value(v: Any) -> Optional[str]:
+    if v is None:
+        return None
+    if isinstance(v, (list, tuple)):
+        items = [str(x).strip() for x in v if x is not None and str(x).strip()]
+        return json.dumps(list(dict.fromkeys(items)), ensure_ascii=False) if items else None
+    if isinstance(v, dict):
+        return json.dumps(v, ensure_ascii=False) if v else None
+    s = str(v).strip()
+    return s or None
+
+
+def build_llm_payload(data: Dict[str, Any], *, description_token_budget: Optional[int] = DESCRIPTION_TOKEN_BUDGET) -> str:
+    """
+    공고 행 -> LLM user 메시지 ("키: 값" 줄).
+    null/빈 값은 빼고, 같은 값을 가진 별칭 키(name/회사이름, position/포지션 등)는 한 번만,
+    meta_description 은 토큰 상한까지만 넣는다.
+    별칭과 스키마 이름의 값이 다르면 먼저 나온 (비어 있지 않은) 값이 스키마 이름을 갖고, 나머지 값도 버리지 않음.
+    """
+    values: Dict[str, str] = {}
+    origin: Dict[str, str] = {}  # 스키마 이름 -> 그 값을 채운 원래 키
+    for key, raw in data.items():
+        if key in PAYLOAD_SKIP_KEYS:
+            continue
+        v = _payload_value(raw)
+        if v is None:
+            continue
+        canon = PAYLOAD_KEY_ALIASES.get(key, key)
+        if canon not in values:
+            values[canon] = v
+            origin[canon] = key
+            continue
+        if values[canon] == v:
+            continue
+        # 값이 다르면 자기 이름으로 남김. 자기 이름이 스키마 이름(이미 별칭 값이 차지)이면 그 별칭 이름으로
+        values.setdefault(key if key != canon else origin[canon], v)
+
+    # 별칭 쪽이 먼저 들어오고 스키마 이름 키가 나중에 같은 값으로 들어온 경우 정리
+    for alias, canon in PAYLOAD_KEY_ALIASES.items():
+        if alias in values and values.get(canon) == values[alias]:
+            del values[alias]
+
+    if description_token_budget is not None and "meta_description" in values:
+        values["meta_description"] = truncate_to_tokens(values["meta_description"], description_token_budget)
+
+    # 1) 중요 필드를 지정된 순서대로, 2) 나머지는 들어온 순서대로
+    parts = [f"{key}: {values[key]}" for key in FIELD_ORDER if key in values]
+    printed = set(FIELD_ORDER)
+    parts += [f"{key}: {v}" for key, v in values.items() if key not in printed]
+    return "\n".join(parts)
@@ -0,0 +1,243 @@
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Tuple, Type
+
+from lib import metrics
+
+"""
+비동기 스트리밍 파이프라인
+
+source(크롤러들) -> stage 1 -> stage 2 -> ... -> 마지막 stage
+- stage 사이는 크기 제한이 있는 asyncio.Queue 로 연결 (메모리 상한 = 큐 크기 합)
+- stage마다 워커 수(concurrency)와 배치 크기(batch_size)를 따로 설정
+- fn이 None을 반환하면 그 아이템은 버림(다음 stage로 안 넘김)
+- fn의 예외는 그 배치만 에러로 세고 넘어감. 단 stage.fatal 에 든 예외는 파이프라인 전체를 멈추고 그대로 올림
+- 끝나면 stage별 처리량(postings/s) 리포트를 돌려줌
+"""
+
+log = logging.getLogger(__name__)
+
+_DONE = object()  # 큐 종료 표시
+
+
+@dataclass
+class Stage:
+    name: str
+    # batch_size == 1 : fn(item) -> item | None
+    # batch_size  > 1 : fn(list[item]) -> list[item | None]
+    fn: Callable[[Any], Awaitable[Any]]
+    concurrency: int = 1
+    queue_size: int = 64
+    batch_size: int = 1
+    batch_timeout: float = 0.05  # 배치를 채우려고 기다리는 최대 시간(초)
+    # 이 예외들은 배치만 버리고 넘어가지 않고 run_pipeline 을 취소 (예: 백엔드가 영구히 죽음)
+    fatal: Tuple[Type[BaseException], ...] = ()
+
+
+@dataclass
+class StageStats:
+    name: str
+    concurrency: int = 1
+    items_in: int = 0
+    items_out: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    first_start: Optional[float] = None
+    last_finish: Optional[float] = None
+    max_queue_depth: int = 0
+
+    @property
+    def wall_seconds(self) -> float:
+        if self.first_start is None or self.last_finish is None:
+            return 0.0
+        return self.last_finish - self.first_start
+
+    @property
+    def throughput(self) -> float:
+        w = self.wall_seconds
+        return self.items_out / w if w > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "stage": self.name,
+            "concurrency": self.concurrency,
+            "in": self.items_in,
+            "out": self.items_out,
+            "errors": self.errors,
+            "wall_s": round(self.wall_seconds, 3),
+            "busy_s": round(self.busy_seconds, 3),
+            "postings_per_s": round(self.throughput, 2),
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+@dataclass
+class PipelineReport:
+    stages: List[StageStats] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "wall_s": round(self.wall_seconds, 3),
+            "stages": [s.as_dict() for s in self.stages],
+        }
+
+    def format(self) -> str:
+        lines = [f"pipeline finished in {self.wall_seconds:.2f}s"]
+        for s in self.stages:
+            d = s.as_dict()
+            lines.append(
+                f"  {d['stage']:<10} x{d['concurrency']:<3} in={d['in']:<5} out={d['out']:<5} "
+                f"err={d['errors']:<3} {d['postings_per_s']:>8.2f}/s  "
+                f"busy={d['busy_s']:.2f}s  maxq={d['max_queue_depth']}"
+            )
+        return "\n".join(lines)
+
+
+async def _feed_sources(
+    sources: Iterable[AsyncIterator[Any]],
+    out_q: asyncio.Queue,
+    stats: StageStats,
+) -> None:
+    async def _drain(src: AsyncIterator[Any]) -> None:
+        try:
+            async for item in src:
+                now = time.perf_counter()
+                if stats.first_start is None:
+                    stats.first_start = now
+                stats.items_in += 1
+                stats.items_out += 1
+                stats.last_finish = now
+                await out_q.put(item)
+        except Exception as e:
+            # 크롤러 하나가 죽어도 다른 소스는 계속
+            stats.errors += 1
+            log.warning("source failed: %s", e)
+
+    srcs = list(sources)
+    stats.concurrency = len(srcs)
+    await asyncio.gather(*(_drain(s) for s in srcs))
+
+
+async def _next_batch(in_q: asyncio.Queue, stage: Stage) -> tuple[list, bool]:
+    """큐에서 최대 batch_size개를 모은다. (items, 종료신호 수신 여부)"""
+    first = await in_q.get()
+    if first is _DONE:
+        return [], True
+    items = [first]
+    if stage.batch_size <= 1:
+        return items, False
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + stage.batch_timeout
+    while len(items) < stage.batch_size:
+        timeout = deadline - loop.time()
+        if timeout <= 0:
+            break
+        try:
+            nxt = await asyncio.wait_for(in_q.get(), timeout)
+        except asyncio.TimeoutError:
+            break
+        if nxt is _DONE:
+            return items, True
+        items.append(nxt)
+    return items, False
+
+
+async def _run_worker(
+    stage: Stage,
+    in_q: asyncio.Queue,
+    out_q: Optional[asyncio.Queue],
+    stats: StageStats,
+) -> None:
+    while True:
+        items, done = await _next_batch(in_q, stage)
+        if items:
+            stats.items_in += len(items)
+            depth = in_q.qsize() + len(items)
+            stats.max_queue_depth = max(stats.max_queue_depth, depth)
+            metrics.set_gauge("queue_depth", depth, stage=stage.name)
+            t0 = time.perf_counter()
+            if stats.first_start is None:
+                stats.first_start = t0
+            try:
+                if stage.batch_size <= 1:
+                    results = [await stage.fn(items[0])]
+                else:
+                    results = list(await stage.fn(items))
+            except stage.fatal:
+                stats.errors += len(items)
+                metrics.inc("stage_errors_total", len(items), stage=stage.name)
+                raise
+            except Exception as e:
+                stats.errors += len(items)
+                metrics.inc("stage_errors_total", len(items), stage=stage.name)
+                log.warning("stage %s failed on %d item(s): %s", stage.name, len(items), e)
+                results = []
+            t1 = time.perf_counter()
+            stats.busy_seconds += t1 - t0
+            stats.last_finish = t1
+            # batch_size > 1 이면 배치 1회 시간
+            metrics.observe("stage_seconds", t1 - t0, stage=stage.name)
+            metrics.inc("stage_items_total", len(items), stage=stage.name)
+
+            for r in results:
+                if r is None:
+                    continue
+                stats.items_out += 1
+                if out_q is not None:
+                    await out_q.put(r)
+        if done:
+            # 같은 stage의 다른 워커도 종료하도록 신호를 되돌려 놓는다
+            await in_q.put(_DONE)
+            return
+
+
+async def run_pipeline(
+    sources: Iterable[AsyncIterator[Any]],
+    stages: List[Stage],
+    *,
+    source_queue_size: Optional[int] = None,
+) -> PipelineReport:
+    """
+    sources의 모든 아이템을 stages 순서대로 흘려보내고 처리량 리포트를 반환.
+    각 stage의 입력 큐 크기는 stage.queue_size 로 제한된다.
+    """
+    if not stages:
+        raise ValueError("at least one stage is required")
+
+    t_start = time.perf_counter()
+    src_stats = StageStats(name="crawl")
+    queues = [asyncio.Queue(maxsize=s.queue_size) for s in stages]
+    if source_queue_size is not None:
+        queues[0] = asyncio.Queue(maxsize=source_queue_size)
+    all_stats = [src_stats] + [StageStats(name=s.name, concurrency=s.concurrency) for s in stages]
+
+    async def _source_task() -> None:
+        await _feed_sources(sources, queues[0], src_stats)
+        await queues[0].put(_DONE)
+
+    async def _stage_task(i: int) -> None:
+        stage = stages[i]
+        out_q = queues[i + 1] if i + 1 < len(stages) else None
+        await asyncio.gather(*(
+            _run_worker(stage, queues[i], out_q, all_stats[i + 1])
+            for _ in range(max(1, stage.concurrency))
+        ))
+        if out_q is not None:
+            await out_q.put(_DONE)
+
+    tasks = [asyncio.create_task(_source_task())] + [asyncio.create_task(_stage_task(i)) for i in range(len(stages))]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # fatal 예외(또는 취소): 나머지 stage/소스가 큐에서 영원히 기다리지 않도록 같이 취소
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    return PipelineReport(stages=all_stats, wall_seconds=time.perf_counter() - t_start)
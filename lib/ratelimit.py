@@ -0,0 +1,146 @@
+from __future__ import annotations
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+"""
+호스트별 적응형 토큰 버킷
+
+- acquire(): 토큰이 생길 때까지 asyncio.sleep (스레드/워커 슬롯을 잡지 않음)
+- 성공 응답: 지연시간이 기준선 근처이고 최근 오류율이 낮으면 rate 를 조금씩 올림 (additive increase)
+- 429 / 503: rate 를 절반으로, Retry-After 가 있으면 그 시각까지 해당 호스트 전체를 멈춤
+- 5xx / 네트워크 오류: rate 를 조금 내림
+"""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP-date) -> 남은 초. 해석 불가면 None."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return max(0.0, (dt - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, *, base: float = 0.5, cap: float = 30.0) -> float:
+    """full jitter 지수 백오프."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class AdaptiveTokenBucket:
+    def __init__(
+        self,
+        rate: float = 2.0,
+        *,
+        burst: float = 4.0,
+        min_rate: float = 0.2,
+        max_rate: float = 50.0,
+        increase_step: float = 0.25,
+        latency_tolerance: float = 1.5,
+        error_window: int = 50,
+        decrease_cooldown: float = 1.0,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.latency_tolerance = latency_tolerance
+        # 동시에 떠 있던 요청들이 한꺼번에 429를 받아도 한 번만 줄이도록
+        self.decrease_cooldown = decrease_cooldown
+        self._last_decrease = 0.0
+
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+        # 지연시간 기준선: 관측된 최소 EWMA, 최근 결과 창(오류율 계산)
+        self._ewma: Optional[float] = None
+        self._baseline: Optional[float] = None
+        self._recent: list[bool] = []
+        self._error_window = error_window
+
+        self.throttled = 0
+        self.errors = 0
+        self.successes = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+    # ---- 피드백 ----
+    def _record(self, ok: bool) -> None:
+        self._recent.append(ok)
+        if len(self._recent) > self._error_window:
+            del self._recent[0]
+
+    @property
+    def error_rate(self) -> float:
+        return self._recent.count(False) / len(self._recent) if self._recent else 0.0
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        self.rate = max(self.min_rate, self.rate * factor)
+
+    def on_success(self, latency: float) -> None:
+        self.successes += 1
+        self._record(True)
+        self._ewma = latency if self._ewma is None else 0.8 * self._ewma + 0.2 * latency
+        self._baseline = self._ewma if self._baseline is None else min(self._baseline, self._ewma)
+        if self._ewma <= self._baseline * self.latency_tolerance and self.error_rate < 0.02:
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+        elif self._ewma > self._baseline * self.latency_tolerance * 2:
+            # 응답이 눈에 띄게 느려지면 서버가 버거워하는 신호
+            self._decrease(0.9)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        self.throttled += 1
+        self._record(False)
+        self._decrease(0.5)
+        self._tokens = 0.0
+        if retry_after:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+    def on_error(self) -> None:
+        self.errors += 1
+        self._record(False)
+        self._decrease(0.7)
+
+    def snapshot(self) -> dict:
+        return {
+            "rate": round(self.rate, 2),
+            "latency_ewma": round(self._ewma, 3) if self._ewma is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "successes": self.successes,
+            "throttled": self.throttled,
+            "errors": self.errors,
+        }
@@ -1,16 +1,35 @@
 
+import asyncio
+import logging
+import multiprocessing
+import os
 import time
 import re
-import requests
 from bs4 import BeautifulSoup
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import json
 import re
-from typing import Any, Dict, Optional, List
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, List
 import html as htmlmod
-from urllib.parse import urljoin
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
 from datetime import date
 import copy
+from functools import lru_cache
+
+from lib import metrics
+from lib.fetch import Fetcher, get_fetcher, run_sync
+# 순수 포맷팅 부분은 lib.payload 로 분리 (MCP 서버는 그쪽만 import). 기존 import 경로 호환용 re-export
+from lib.payload import (
+    DATA_STRUCT,
+    DESCRIPTION_TOKEN_BUDGET,
+    FIELD_ORDER,
+    PAYLOAD_KEY_ALIASES,
+    PAYLOAD_SKIP_KEYS,
+    approx_tokens,
+    build_llm_payload,
+    truncate_to_tokens,
+)
 
 """
 최종 스키마:
@@ -44,36 +63,8 @@ DETAIL_HEADERS = {
     "referer": "https://www.wanted.co.kr/",
 }
 
-FIELD_ORDER = [
-    "회사이름",
-    "포지션",
-    "title",
-    "title_tag",
-    "description",
-    "meta_description",
-    "url",
-    "employmentType",
-    "datePosted",
-    "occupationalCategory",
-    "validThrough",
-    "experienceRequirements",
-]
-
-DATA_STRUCT = {
-        "회사이름": None,
-        "포지션": None,
-        "회사 위치": None,
-        "자격 요건": [],
-        "주요업무": [],
-        "employmentType": None,
-        "datePosted": None,
-        "occupationalCategory": [],
-        "validThrough": None,
-        "experienceRequirements": [],
-        "url": None,
-}
-
-DEBUG = True  # 필요 시 False
+# stdio MCP 서버도 이 모듈을 import 하므로 stdout 에 쓰지 않고 로깅(stderr)으로만
+log = logging.getLogger(__name__)
 
 def _parse_iso_date(text: str) -> Optional[str]:
     """
@@ -94,20 +85,24 @@ def _parse_iso_date(text: str) -> Optional[str]:
     y, mth, d = m.groups()
     return f"{int(y):04d}-{int(mth):02d}-{int(d):02d}"
 
+SARAMIN_LIST_URL = "https://www.saramin.co.kr/zf_user/jobs/list/job-category?cat_mcls=2&panel_type=&search_optional_item=n&search_done=y&panel_count=y&preview=y"
+SARAMIN_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+    "Referer": "https://www.saramin.co.kr/zf_user/jobs/list/job-category",
+    "Upgrade-Insecure-Requests": "1",
+    # Accept-Encoding은 fetch 계층이 디코딩 가능한 것만 넣어준다 (lib/fetch.py)
+}
+
+async def afetch_saramin_list_html(page: int = 1, page_count: Optional[int] = None,
+                                   *, fetcher: Optional[Fetcher] = None) -> str:
+    f = fetcher or get_fetcher()
+    params = {"page": page, "page_count": page_count} if page > 1 or page_count else {}
+    return await f.get_text(with_query(SARAMIN_LIST_URL, **params), headers=SARAMIN_HEADERS)
+
 def fetch_saramin_list_html():
-    url = "https://www.saramin.co.kr/zf_user/jobs/list/job-category?cat_mcls=2&panel_type=&search_optional_item=n&search_done=y&panel_count=y&preview=y"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-        "Referer": "https://www.saramin.co.kr/zf_user/jobs/list/job-category",
-        "Upgrade-Insecure-Requests": "1",
-        # requests 기본 압축 처리가 안정적이라서 br/zstd는 굳이 명시하지 않는 게 안전
-        "Accept-Encoding": "gzip, deflate",
-    }
-    response = requests.get(url, headers=headers, timeout=20)
-    response.raise_for_status()
-    return response.text
+    return run_sync(afetch_saramin_list_html)
 
 def parse_saramin_list_html(
     html: str,
@@ -256,21 +251,39 @@ def parse_jobkorea_li(li) -> Dict[str, Any]:
     return data
 
 
-def _dbg(msg: str):
-    if DEBUG:
-        print(f"[DEBUG] {msg}")
+JOBKOREA_HEADERS = {"User-Agent": "Mozilla/5.0"}
 
+async def afetch_jobkorea_list_html(page: int = 1, *, fetcher: Optional[Fetcher] = None) -> str:
+    f = fetcher or get_fetcher()
+    url = with_query(LIST_URL, Page=page) if page > 1 else LIST_URL
+    return await f.get_text(url, headers=JOBKOREA_HEADERS)
 
-def extract_jobkorea_metadata() -> list[dict]:
-    resp = requests.get(LIST_URL, headers={"User-Agent": "Mozilla/5.0"})
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+def fetch_jobkorea_list_html() -> str:
+    return run_sync(afetch_jobkorea_list_html)
+
+
+def parse_jobkorea_list_html(html: str) -> list[dict]:
+    # 프로세스 풀로 넘길 수 있도록 html 문자열 -> dict 리스트 (bs4 객체는 피클이 무거움)
+    soup = BeautifulSoup(html, "html.parser")
     items = soup.select("ol.rankList > li")
-    results = [parse_jobkorea_li(li) for li in items]
-    return results
+    return [parse_jobkorea_li(li) for li in items]
 
 
-def fetch_wanted(job_group_id=518, limit=20):
+def extract_jobkorea_metadata() -> list[dict]:
+    return parse_jobkorea_list_html(fetch_jobkorea_list_html())
+
+
+WANTED_HEADERS = {
+    "accept": "application/json, text/plain, */*",
+    "accept-language": "ko-KR,ko;q=0.9",
+    "user-agent": "Mozilla/5.0",
+    "wanted-user-agent": "user-web",
+    "wanted-user-country": "KR",
+    "wanted-user-language": "ko",
+    "referer": "https://www.wanted.co.kr/wdlist/518?country=kr&job_sort=job.recommend_order&years=-1&locations=all",
+}
+
+async def afetch_wanted(job_group_id=518, limit=20, offset=0, *, fetcher: Optional[Fetcher] = None):
     params = {
         "job_group_id": str(job_group_id),
         "country": "kr",
@@ -278,76 +291,44 @@ def fetch_wanted(job_group_id=518, limit=20):
         "years": "-1",
         "locations": "all",
         "limit": str(limit),
+        "offset": str(offset),
         "job_sort": "job.latest_order"
     }
-    headers = {
-        "accept": "application/json, text/plain, */*",
-        "accept-language": "ko-KR,ko;q=0.9",
-        "user-agent": "Mozilla/5.0",
-        "wanted-user-agent": "user-web",
-        "wanted-user-country": "KR",
-        "wanted-user-language": "ko",
-        "referer": "https://www.wanted.co.kr/wdlist/518?country=kr&job_sort=job.recommend_order&years=-1&locations=all",
-    }
-    r = requests.get(API, params=params, headers=headers, timeout=20)
-    r.raise_for_status()
-    return r.json()
+    f = fetcher or get_fetcher()
+    return await f.get_json(API, params=params, headers=WANTED_HEADERS)
 
-def fetch_job_html(job_id: int, *, session: requests.Session | None = None,
-                   timeout: int = 20, max_retries: int = 3) -> str:
-    url = DETAIL_URL.format(id=job_id)
-    s = session or requests.Session()
+def fetch_wanted(job_group_id=518, limit=20, offset=0):
+    return run_sync(afetch_wanted, job_group_id, limit, offset)
 
-    last_err = None
-    for i in range(max_retries):
-        try:
-            r = s.get(url, headers=DETAIL_HEADERS, timeout=timeout)
-            _dbg(f"GET {url} -> status={r.status_code}, len={len(r.text)}")
-            r.raise_for_status()
-            return r.text
-        except Exception as e:
-            last_err = e
-            _dbg(f"retry {i+1}/{max_retries} failed: {e}")
-            time.sleep(0.5 * (2 ** i))
-    raise RuntimeError(f"Failed to fetch {url}: {last_err}")
-
-def extract_title_and_description(html: str, *, job_id: int | None = None) -> dict:
-    """meta 태그 파싱 디버깅 포함"""
-    soup = BeautifulSoup(html, "html.parser")
+async def afetch_job_html(job_id: int, *, max_retries: int = 3,
+                          fetcher: Optional[Fetcher] = None) -> str:
+    f = fetcher or get_fetcher()
+    return await f.get_text(DETAIL_URL.format(id=job_id), headers=DETAIL_HEADERS, max_retries=max_retries)
 
-    # 1) title
-    title = None
-    if soup.title and soup.title.string:
-        title = soup.title.string.strip()
-
-    # 2) description meta
-    desc = None
-    desc_tag = soup.find("meta", attrs={"name": "description"})
-    if desc_tag and desc_tag.get("content"):
-        desc = desc_tag["content"].strip()
-
-    # 3) fallback: og:description
-    og_desc = None
-    og_tag = soup.find("meta", attrs={"property": "og:description"})
-    if og_tag and og_tag.get("content"):
-        og_desc = og_tag["content"].strip()
-
-    if not desc and og_desc:
-        desc = og_desc
+def fetch_job_html(job_id: int, *, session: Any = None,
+                   timeout: int = 20, max_retries: int = 3) -> str:
+    # session/timeout 은 예전 requests 기반 시그니처 호환용 (커넥션 풀은 fetch 계층이 관리)
+    return run_sync(afetch_job_html, job_id, max_retries=max_retries)
 
-    return {"title": title, "description": desc}
+def extract_title_and_description(html: str, *, job_id: int | None = None) -> dict:
+    """title + description meta (없으면 og:description)"""
+    meta = extract_detail_meta(html)
+    return {"title": meta["title"], "description": meta["description"] or meta["og_description"]}
 
 def fetch_and_extract_job_meta(
     job_id: int,
     *,
-    session: requests.Session | None = None,
+    session: Any = None,
 ) -> dict[str, Any]:
     html = fetch_job_html(job_id, session=session)
+    return build_job_meta(job_id, html)
 
-    # ✅ extract_title_and_description가 job_id 인자를 안 받으면 여기서 제거
-    meta = extract_title_and_description(html)  # 또는 함수 정의를 job_id 받게 수정
+def build_job_meta(job_id: int, html: str) -> dict[str, Any]:
+    # 문서는 한 번만 파싱: title/description/og:description/ld+json 을 같이 뽑는다
+    parsed = extract_detail_meta(html)
+    meta = {"title": parsed["title"], "description": parsed["description"] or parsed["og_description"]}
 
-    ld = extract_jobposting_jsonld_fields(html)
+    ld = _jobposting_fields(parsed["jsonld"])
 
     # ✅ jsonld 파서 실패/타입 불일치 방어
     if not isinstance(ld, dict):
@@ -373,68 +354,252 @@ def extract_name_id_position(payload: dict):
         })
     return out
 
-def build_llm_payload(data: Dict[str, Any]) -> str:
-    parts: List[str] = []
+# ---- 여러 페이지 크롤링 ----
+def with_query(url: str, **params: Any) -> str:
+    """url 쿼리스트링의 값을 덮어쓰거나 추가 (None 값은 무시)."""
+    parts = urlsplit(url)
+    q = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in params]
+    q += [(k, str(v)) for k, v in params.items() if v is not None]
+    return urlunsplit(parts._replace(query=urlencode(q)))
 
-    # 1) 우선 중요 필드들만 지정된 순서대로 찍고
-    for key in FIELD_ORDER:
-        if key in data:
-            parts.append(f"{key}: {data[key]}")
 
-    # 2) 나머지 키들도 필요하면 추가로 찍고 싶다면 (옵션)
-    #    이미 찍은 키는 제외
-    printed = set(FIELD_ORDER)
-    for key, value in data.items():
-        if key not in printed:
-            parts.append(f"{key}: {value}")
+async def _aiter_pages(
+    fetch_page: Callable[[int], Awaitable[Any]],
+    parse_page: Callable[[Any], Awaitable[List[dict]]],
+    *,
+    key: Callable[[dict], Any],
+    max_pages: int,
+    concurrency: int = 4,
+    page_size: Optional[int] = None,
+    seen_keys: Optional[set] = None,
+    stop_when: Optional[Callable[[List[dict]], Awaitable[bool]]] = None,
+):
+    """
+    0..max_pages-1 페이지를 concurrency 개씩 동시에 받아서 페이지 순서대로 행을 yield.
+    멈추는 조건: 빈 페이지 / 새 행이 없는 페이지(범위를 넘으면 같은 페이지를 돌려주는 사이트) /
+    page_size 보다 짧은 페이지 / stop_when(새 행들) 이 True (이미 본 공고에 도달).
+    seen_keys(여러 호출이 공유)에 있는 행은 건너뛰기만 함 -> "새 행 없음" 은 이 호출 안에서 본 행으로만 판단.
+    """
+    seen = seen_keys if seen_keys is not None else set()
+    page_seen: set = set()
+    page = 0
+    while page < max_pages:
+        window = list(range(page, min(page + concurrency, max_pages)))
+        results = await asyncio.gather(*(fetch_page(p) for p in window), return_exceptions=True)
+        for p, res in zip(window, results):
+            if isinstance(res, Exception):
+                log.warning("page %d failed: %s", p, res)
+                return
+            rows = await parse_page(res)
+            new = [r for r in rows if key(r) not in page_seen]
+            if not new:
+                return
+            for r in new:
+                page_seen.add(key(r))
+                if key(r) in seen:
+                    continue  # 앞선 그룹에서 이미 내보낸 행
+                seen.add(key(r))
+                yield r
+            if page_size is not None and len(rows) < page_size:
+                return
+            if stop_when is not None and await stop_when(new):
+                return
+        page += concurrency
+
+
+async def aiter_wanted_rows(
+    job_group_ids: Iterable[int] = (518,),
+    *,
+    page_size: int = 20,
+    max_pages: int = 5,
+    concurrency: int = 4,
+    stop_when: Optional[Callable[[List[dict]], Awaitable[bool]]] = None,
+):
+    """원티드 목록을 job_group_id 여러 개 x offset 페이지로 훑으며 extract_name_id_position 행을 스트리밍."""
+    seen: set = set()  # 여러 직군에 같이 걸린 공고는 한 번만
+
+    async def parse(payload: dict) -> List[dict]:
+        return extract_name_id_position(payload)
+
+    for gid in job_group_ids:
+        async def fetch(p: int, gid=gid):
+            return await afetch_wanted(gid, limit=page_size, offset=p * page_size)
+
+        async for row in _aiter_pages(fetch, parse, key=lambda r: r["id"], max_pages=max_pages,
+                                      concurrency=concurrency, page_size=page_size,
+                                      seen_keys=seen, stop_when=stop_when):
+            yield row
+
+
+async def aiter_saramin_rows(*, max_pages: int = 5, page_count: int = 50, concurrency: int = 3):
+    async def fetch(p: int) -> str:
+        return await afetch_saramin_list_html(page=p + 1, page_count=page_count)
+
+    async def parse(html: str) -> List[dict]:
+        return await parse_in_pool(parse_saramin_list_html, html)
+
+    async for row in _aiter_pages(fetch, parse, key=lambda r: r.get("url"), max_pages=max_pages,
+                                  concurrency=concurrency, page_size=page_count):
+        yield row
+
+
+async def aiter_jobkorea_rows(*, max_pages: int = 1, concurrency: int = 2):
+    async def fetch(p: int) -> str:
+        return await afetch_jobkorea_list_html(page=p + 1)
+
+    async def parse(html: str) -> List[dict]:
+        return await parse_in_pool(parse_jobkorea_list_html, html)
+
+    async for row in _aiter_pages(fetch, parse, key=lambda r: r.get("url"), max_pages=max_pages,
+                                  concurrency=concurrency):
+        yield row
+
+
+# ---- 파싱 전용 프로세스 풀 ----
+# 네트워크 I/O는 스레드(또는 asyncio)에서, HTML 파싱은 GIL 밖의 프로세스에서.
+# 풀은 스레드(fetch/색인/to_thread)가 이미 돈 뒤에 처음 쓸 때 만들어지므로 fork 로 띄우면
+# 다른 스레드가 잡고 있던 락을 그대로 복사해 워커가 멈출 수 있음 -> forkserver 로 띄움
+_PARSE_MP_CONTEXT = "forkserver"
+_PARSE_POOL: Optional[ProcessPoolExecutor] = None
+
+def get_parse_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """코어 수만큼의 파싱 프로세스 풀 (프로세스 안에서 한 번만 만들고 재사용)."""
+    global _PARSE_POOL
+    if _PARSE_POOL is None:
+        ctx = multiprocessing.get_context(_PARSE_MP_CONTEXT)
+        # 워커마다 bs4/lib.req 를 새로 import 하지 않도록 forkserver 에서 미리 import
+        ctx.set_forkserver_preload([__name__])
+        _PARSE_POOL = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count() or 1, mp_context=ctx)
+    return _PARSE_POOL
+
+def shutdown_parse_pool() -> None:
+    global _PARSE_POOL
+    if _PARSE_POOL is not None:
+        _PARSE_POOL.shutdown(cancel_futures=True)
+        _PARSE_POOL = None
+
+async def parse_in_pool(fn, *args, pool: Optional[Executor] = None):
+    """fn(*args) 를 파싱 풀에서 실행 (fn/인자/결과는 피클 가능해야 함)."""
+    loop = asyncio.get_running_loop()
+    # 대기 시간(풀이 바쁠 때)까지 포함한 시간
+    with metrics.timed("parse_seconds", fn=fn.__name__):
+        return await loop.run_in_executor(pool or get_parse_pool(), fn, *args)
+
+
+def _enriched_row(j: dict, meta: dict) -> dict:
+    return {
+        **j,
+        "title_tag": meta.get("title"),
+        "meta_description": meta.get("description"),
+        "url": meta.get("url"),
+        "employmentType": meta.get("employmentType"),
+        "datePosted": meta.get("datePosted"),
+        "occupationalCategory": meta.get("occupationalCategory"),
+        "validThrough": meta.get("validThrough"),
+        "experienceRequirements": meta.get("experienceRequirements"),
+    }
 
-    return "\n".join(parts)
+def _failed_row(j: dict, e: Exception) -> dict:
+    return {**j, "title_tag": None, "meta_description": None, "url": DETAIL_URL.format(id=j["id"]), "error": str(e)}
 
-def enrich_jobs_with_detail_meta(jobs: list[dict], *, max_workers: int = 6) -> list[dict]:
-    out = []
-    with requests.Session() as s:
-        with ThreadPoolExecutor(max_workers=max_workers) as ex:
-            futs = {ex.submit(fetch_and_extract_job_meta, j["id"], session=s): j for j in jobs}
-            for fut in as_completed(futs):
-                j = futs[fut]
+
+def iter_enriched_jobs(
+    jobs: list[dict],
+    *,
+    max_workers: int = 6,
+    parse_pool: Optional[Executor] = None,
+):
+    """상세 페이지 fetch(스레드) -> 파싱(프로세스), 끝나는 순서대로 yield."""
+    ppool = parse_pool or get_parse_pool()
+    with ThreadPoolExecutor(max_workers=max_workers) as io:
+        owner = {io.submit(fetch_job_html, j["id"]): (j, "fetch") for j in jobs}
+        pending = set(owner)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                j, kind = owner.pop(fut)
                 try:
-                    meta = fut.result()
-                    out.append({
-                        **j,
-                        "title_tag": meta.get("title"),
-                        "meta_description": meta.get("description"),
-                        "url": meta.get("url"),
-                        "employmentType": meta.get("employmentType"),
-                        "datePosted": meta.get("datePosted"),
-                        "occupationalCategory": meta.get("occupationalCategory"),
-                        "validThrough": meta.get("validThrough"),
-                        "experienceRequirements": meta.get("experienceRequirements"),
-                    })
+                    res = fut.result()
                 except Exception as e:
-                    out.append({**j, "title_tag": None, "meta_description": None, "url": DETAIL_URL.format(id=j["id"]), "error": str(e)})
-    return out
+                    yield _failed_row(j, e)
+                    continue
+                if kind == "fetch":
+                    pf = ppool.submit(build_job_meta, j["id"], res)
+                    owner[pf] = (j, "parse")
+                    pending.add(pf)
+                else:
+                    yield _enriched_row(j, res)
 
 
-def extract_jobposting_jsonld_fields(html: str) -> Dict[str, Any]:
-    soup = BeautifulSoup(html, "html.parser")
-    scripts = soup.find_all("script", attrs={"type": "application/ld+json"})
-
-    candidates = []
-    for sc in scripts:
-        raw = (sc.string or sc.get_text() or "").strip()
-        if not raw:
-            continue
-        raw = _TRAILING_COMMA_RE.sub(r"\1", raw)
+def enrich_jobs_with_detail_meta(jobs: list[dict], *, max_workers: int = 6) -> list[dict]:
+    return list(iter_enriched_jobs(jobs, max_workers=max_workers))
+
+
+async def aiter_enriched_jobs(
+    jobs,
+    *,
+    max_workers: int = 6,
+    parse_pool: Optional[Executor] = None,
+):
+    """
+    iter_enriched_jobs 의 asyncio 버전: fetch는 공용 async 클라이언트, 파싱은 프로세스 풀.
+    jobs 는 리스트든 async iterator(페이지 크롤러)든 상관없고, 들어오는 대로 처리를 시작한다.
+    """
+    sem = asyncio.Semaphore(max_workers)
+
+    async def one(j: dict) -> dict:
         try:
-            obj = json.loads(raw)
-        except Exception:
-            continue
+            async with sem:
+                html = await afetch_job_html(j["id"])
+            meta = await parse_in_pool(build_job_meta, j["id"], html, pool=parse_pool)
+            return _enriched_row(j, meta)
+        except Exception as e:
+            return _failed_row(j, e)
+
+    async def _as_aiter(it):
+        for x in it:
+            yield x
+
+    source = jobs if hasattr(jobs, "__aiter__") else _as_aiter(jobs)
+    pending: set = set()
+    # 떠 있는 작업 수 상한: 목록이 빨리 와도 결과가 pending 에 쌓이지 않고 소비 속도에 맞춰 멈춤
+    max_pending = 2 * max_workers
+    async for j in source:
+        if len(pending) >= max_pending:
+            # 끝난 작업은 아래에서 한꺼번에 꺼내 yield
+            await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        pending.add(asyncio.create_task(one(j)))
+        finished = {t for t in pending if t.done()}
+        pending -= finished
+        for t in finished:
+            yield t.result()
+    while pending:
+        finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for t in finished:
+            yield t.result()
 
-        if isinstance(obj, list):
-            candidates.extend([x for x in obj if isinstance(x, dict)])
-        elif isinstance(obj, dict):
-            candidates.append(obj)
 
+def extract_jobposting_jsonld_fields(html: str) -> Dict[str, Any]:
+    return _jobposting_fields(extract_detail_meta(html)["jsonld"])
+
+
+def _parse_ld_json(raw: str) -> List[Dict[str, Any]]:
+    raw = (raw or "").strip()
+    if not raw:
+        return []
+    raw = _TRAILING_COMMA_RE.sub(r"\1", raw)
+    try:
+        obj = json.loads(raw)
+    except Exception:
+        return []
+    if isinstance(obj, list):
+        return [x for x in obj if isinstance(x, dict)]
+    if isinstance(obj, dict):
+        return [obj]
+    return []
+
+
+def _jobposting_fields(candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
     def score(o: Dict[str, Any]) -> int:
         s = 0
         t = o.get("@type")
@@ -461,6 +626,125 @@ def extract_jobposting_jsonld_fields(html: str) -> Dict[str, Any]:
         "experienceRequirements": best.get("experienceRequirements"),
     }
 
+
+# ---- 상세 페이지 단일 파싱 ----
+# "stream": 표준 라이브러리 토크나이저로 <head>까지만 훑고, 본문의 ld+json은 정규식으로 수집
+# "lxml" / "html.parser": BeautifulSoup 트리 파싱 (stream 결과가 비었을 때의 fallback 이기도 함)
+# "auto": stream -> (비었으면) lxml -> html.parser
+PARSER_BACKEND = "auto"
+
+_HEAD_END_RE = re.compile(r"</head\s*>", re.I)
+_LD_JSON_RE = re.compile(
+    r"<script\b[^>]*\btype\s*=\s*[\"']application/ld\+json[\"'][^>]*>(.*?)</script\s*>",
+    re.I | re.S,
+)
+
+
+class _HeadMetaParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title: Optional[str] = None
+        self.description: Optional[str] = None
+        self.og_description: Optional[str] = None
+        self.ld_raw: List[str] = []
+        self._in_title = False
+        self._title_buf: List[str] = []
+        self._in_ld = False
+        self._ld_buf: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title" and self.title is None:
+            self._in_title = True
+        elif tag == "meta":
+            a = dict(attrs)
+            content = (a.get("content") or "").strip()
+            if not content:
+                return
+            if a.get("name") == "description" and self.description is None:
+                self.description = content
+            elif a.get("property") == "og:description" and self.og_description is None:
+                self.og_description = content
+        elif tag == "script" and (dict(attrs).get("type") or "").lower() == "application/ld+json":
+            self._in_ld = True
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self._in_title:
+            self._in_title = False
+            self.title = "".join(self._title_buf).strip() or None
+        elif tag == "script" and self._in_ld:
+            self._in_ld = False
+            self.ld_raw.append("".join(self._ld_buf))
+            self._ld_buf = []
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._title_buf.append(data)
+        elif self._in_ld:
+            self._ld_buf.append(data)
+
+
+def _extract_stream(html: str) -> Dict[str, Any]:
+    m = _HEAD_END_RE.search(html)
+    head, body = (html[:m.end()], html[m.end():]) if m else (html, "")
+    p = _HeadMetaParser()
+    p.feed(head)
+    p.close()
+    raws = p.ld_raw + [x for x in _LD_JSON_RE.findall(body)]
+    return {
+        "title": p.title,
+        "description": p.description,
+        "og_description": p.og_description,
+        "jsonld": [o for r in raws for o in _parse_ld_json(r)],
+    }
+
+
+def _extract_soup(html: str, parser: str) -> Dict[str, Any]:
+    soup = BeautifulSoup(html, parser)
+
+    title = None
+    if soup.title and soup.title.string:
+        title = soup.title.string.strip()
+
+    desc = None
+    desc_tag = soup.find("meta", attrs={"name": "description"})
+    if desc_tag and desc_tag.get("content"):
+        desc = desc_tag["content"].strip()
+
+    og_desc = None
+    og_tag = soup.find("meta", attrs={"property": "og:description"})
+    if og_tag and og_tag.get("content"):
+        og_desc = og_tag["content"].strip()
+
+    jsonld: List[Dict[str, Any]] = []
+    for sc in soup.find_all("script", attrs={"type": "application/ld+json"}):
+        jsonld.extend(_parse_ld_json(sc.string or sc.get_text() or ""))
+
+    return {"title": title, "description": desc, "og_description": og_desc, "jsonld": jsonld}
+
+
+@lru_cache(maxsize=None)
+def _has_lxml() -> bool:
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def extract_detail_meta(html: str, *, backend: Optional[str] = None) -> Dict[str, Any]:
+    """
+    상세 페이지를 한 번만 파싱해서 title / description / og_description / jsonld(list) 반환.
+    """
+    backend = backend or PARSER_BACKEND
+    if backend in ("auto", "stream"):
+        out = _extract_stream(html)
+        if backend == "stream" or out["title"] or out["description"] or out["og_description"] or out["jsonld"]:
+            return out
+        backend = "lxml"
+    if backend == "lxml" and not _has_lxml():
+        backend = "html.parser"
+    return _extract_soup(html, backend)
+
 if __name__ == "__main__":
     results = fetch_saramin_list_html()
     content = job_item = parse_saramin_list_html(results)
@@ -1,9 +1,12 @@
 from __future__ import annotations
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any
+import hashlib
 import json
-from elasticsearch import Elasticsearch
+
+if TYPE_CHECKING:
+    from elasticsearch import Elasticsearch
 
 REQUIRED_KEYS = [
     "url",
@@ -43,11 +46,17 @@ JOB_INDEX_TEMPLATE = {
             # date|string|null (YYYY-MM-DD만 들어온다는 전제)
             "datePosted": {"type": "date", "format": "yyyy-MM-dd"},
             "validThrough": {"type": "date", "format": "yyyy-MM-dd"},
+
+            # 증분 크롤링용: LLM 이전 원본 행의 지문 (검색 대상 아님)
+            "content_fingerprint": {"type": "keyword", "index": False},
+            # 보드 간 중복 공고: 대표 문서에 나머지 공고 url 들을 연결
+            "sameAs": {"type": "keyword"},
         }
     },
 }
 
-SCHEMA_KEYS = {
+# SYSTEM_PROMPT 출력 스키마와 같은 순서 (guided decoding 은 이 순서대로 키를 생성)
+SCHEMA_KEY_ORDER = [
     "회사이름",
     "포지션",
     "회사 위치",
@@ -59,10 +68,58 @@ SCHEMA_KEYS = {
     "validThrough",
     "experienceRequirements",
     "url",
-}
+]
+SCHEMA_KEYS = set(SCHEMA_KEY_ORDER)  # 순서 목록에서 만들어 둘이 어긋날 수 없게
 
 ARRAY_KEYS = {"자격 요건", "주요업무", "occupationalCategory", "experienceRequirements"}
 NULLABLE_STRING_KEYS = {"회사이름", "포지션", "회사 위치", "employmentType", "datePosted", "validThrough", "url"}
+DATE_KEYS = {"datePosted", "validThrough"}
+
+
+def job_json_schema() -> Dict[str, Any]:
+    """SCHEMA_KEYS/ARRAY_KEYS 로 만든 LLM 출력 JSON schema (vLLM guided decoding 용)."""
+    props: Dict[str, Any] = {}
+    for k in SCHEMA_KEY_ORDER:
+        if k in ARRAY_KEYS:
+            props[k] = {"type": "array", "items": {"type": "string"}}
+        elif k in DATE_KEYS:
+            props[k] = {"anyOf": [{"type": "string", "pattern": r"^\d{4}-\d{2}-\d{2}$"}, {"type": "null"}]}
+        else:
+            props[k] = {"anyOf": [{"type": "string"}, {"type": "null"}]}
+    return {
+        "type": "object",
+        "properties": props,
+        "required": list(SCHEMA_KEY_ORDER),
+        "additionalProperties": False,
+    }
+
+
+JOB_JSON_SCHEMA = job_json_schema()
+
+
+def parse_job_json(content: str) -> Dict[str, Any]:
+    """LLM 응답 -> dict. JSON 객체가 아니면 ValueError (재시도 대상)."""
+    try:
+        obj = json.loads(content)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"invalid JSON: {e}") from e
+    if not isinstance(obj, dict):
+        raise ValueError(f"expected a JSON object, got {type(obj).__name__}")
+    return obj
+
+
+# LLM 이전 원본 행에서 "내용이 바뀌었는지" 판단에 쓰는 필드
+# (잡코리아/사람인 목록 행은 title_tag/meta_description이 없어서 회사이름/포지션도 포함)
+FINGERPRINT_KEYS = ("title_tag", "meta_description", "validThrough", "회사이름", "포지션")
+
+def make_doc_id(doc: dict) -> str:
+    base = doc.get("url") or json.dumps(doc, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(base.encode("utf-8")).hexdigest()
+
+def row_fingerprint(row: dict) -> str:
+    """원본 행의 내용 지문. 같은 url이라도 이 값이 다르면 다시 구조화한다."""
+    base = json.dumps([row.get(k) for k in FINGERPRINT_KEYS], ensure_ascii=False, default=str)
+    return hashlib.sha1(base.encode("utf-8")).hexdigest()
 
 def coerce_job_record(obj: dict[str, Any]) -> dict[str, Any]:
     """
@@ -100,8 +157,10 @@ def coerce_job_record(obj: dict[str, Any]) -> dict[str, Any]:
     return out
 
 def ensure_job_index(es: Elasticsearch, index_name: str = "jobs") -> None:
-    """jobs 인덱스가 없으면, 위 스키마로 생성."""
+    """jobs 인덱스가 없으면, 위 스키마로 생성. 있으면 새로 추가된 필드만 매핑에 반영."""
     if es.indices.exists(index=index_name):
+        # put_mapping은 필드 추가만 하므로 기존 인덱스에도 안전 (dynamic=strict 대응)
+        es.indices.put_mapping(index=index_name, properties=JOB_INDEX_TEMPLATE["mappings"]["properties"])
         return
     es.indices.create(index=index_name, body=JOB_INDEX_TEMPLATE)
 
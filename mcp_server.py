@@ -1,9 +1,17 @@
 import sys
+import os
+import argparse
+import asyncio
+import functools
 import logging
-from mcp.server.fastmcp import FastMCP
-from typing import Any, Optional, Dict
-import httpx
-from lib.req import *
+import json
+import time
+from mcp.server.fastmcp import FastMCP, Context
+from mcp.server.fastmcp.exceptions import ToolError
+from typing import Any, Optional, Dict, List
+from lib import metrics
+# 크롤러(lib.req: bs4, fetch, 프로세스 풀)는 안 씀 -> 순수 포맷팅 모듈만 (서버 기동 시간)
+from lib.payload import build_llm_payload
 
 # ⚠️ stdio 서버는 stdout에 로그를 찍으면 프로토콜이 깨집니다.
 # 반드시 stderr로 로깅하세요. :contentReference[oaicite:3]{index=3}
@@ -11,17 +19,238 @@ logging.basicConfig(stream=sys.stderr, level=logging.INFO)
 
 mcp = FastMCP("job-tools", json_response=True)
 
+# HTTP 모드에서 uvicorn 워커는 이 모듈을 새로 import 하므로 설정은 환경변수로 넘긴다
+MAX_CONCURRENCY = int(os.getenv("MCP_MAX_CONCURRENCY", "64"))    # 워커당 동시에 실행할 도구 호출
+QUEUE_TIMEOUT = float(os.getenv("MCP_QUEUE_TIMEOUT", "2.0"))      # 자리 대기 한도(초), 넘으면 busy 로 거절
+TOOL_TIMEOUT = float(os.getenv("MCP_TOOL_TIMEOUT", "30.0"))       # 호출 1건 실행 한도(초)
+
+# ES 클라이언트/결과 캐시는 프로세스에 하나 (db.search import 와 생성 모두 첫 검색 도구 호출 때)
+_job_search = None
+
+
+def get_job_search():
+    global _job_search
+    if _job_search is None:
+        from db.search import JobSearch
+        _job_search = JobSearch()
+    return _job_search
+
+_slots: Optional[asyncio.Semaphore] = None
+
+
+def guarded(fn):
+    """
+    도구 호출 백프레셔 + 타임아웃.
+    자리가 QUEUE_TIMEOUT 안에 안 나면 바로 에러(클라이언트가 재시도/분산), 실행은 TOOL_TIMEOUT 까지.
+    """
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        global _slots
+        if _slots is None:
+            _slots = asyncio.Semaphore(MAX_CONCURRENCY)
+        t0 = time.perf_counter()
+        try:
+            await asyncio.wait_for(_slots.acquire(), QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            metrics.inc("mcp_tool_rejected_total", tool=name)
+            raise ToolError(f"server busy ({MAX_CONCURRENCY} calls in flight), retry later")
+        try:
+            return await asyncio.wait_for(fn(*args, **kwargs), TOOL_TIMEOUT)
+        except asyncio.TimeoutError:
+            metrics.inc("mcp_tool_timeouts_total", tool=name)
+            raise ToolError(f"{name} timed out after {TOOL_TIMEOUT:g}s")
+        finally:
+            _slots.release()
+            metrics.observe("mcp_tool_seconds", time.perf_counter() - t0, tool=name)
+
+    return wrapper
+
+
 @mcp.tool()
-def wanted_detail_payload(
+@guarded
+async def wanted_detail_payload(
     job_data: Dict[str, Any]) -> str:
     try:
         # 여기서 job_data는 원티드/잡코리아/사람인 등 어디서 온 dict든 상관없음
+        # 한 건은 수십 µs 라 스레드로 넘기는 비용이 더 큼 -> 루프에서 바로
         text = build_llm_payload(job_data)
         return text
     except Exception as e:
         return f"Error: {e}"
-        
+
+
+def _parse_ndjson(ndjson: str) -> List[Any]:
+    rows: List[Any] = []
+    for line in ndjson.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            rows.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            # 깨진 줄도 자리는 유지해야 응답 순서가 입력과 맞는다
+            rows.append(e)
+    return rows
+
+
+def _build_chunk(rows: List[Any], start: int) -> List[Dict[str, Any]]:
+    chunk: List[Dict[str, Any]] = []
+    for i, row in enumerate(rows, start):
+        if isinstance(row, Exception):
+            chunk.append({"index": i, "ok": False, "error": f"invalid ndjson line: {row}"})
+            continue
+        if not isinstance(row, dict):
+            chunk.append({"index": i, "ok": False, "error": f"expected object, got {type(row).__name__}"})
+            continue
+        try:
+            chunk.append({"index": i, "ok": True, "payload": build_llm_payload(row)})
+        except Exception as e:
+            chunk.append({"index": i, "ok": False, "error": str(e)})
+    return chunk
+
+
+@mcp.tool()
+@guarded
+async def build_payloads_batch(
+    jobs: Optional[List[Dict[str, Any]]] = None,
+    ndjson: Optional[str] = None,
+    chunk_size: int = 50,
+    stream: bool = False,
+    ctx: Context = None,
+) -> List[Dict[str, Any]]:
+    """
+    공고 여러 건의 LLM 입력 문자열을 한 번에 생성.
+    입력 순서 그대로 [{"index", "ok", "payload"|"error"}] 를 반환하고,
+    chunk_size 단위로 진행률을 알리며 stream=True면 부분 결과도 로그 알림으로 흘려보낸다.
+    """
+    rows: List[Any] = list(jobs or [])
+    if ndjson:
+        rows.extend(_parse_ndjson(ndjson))
+
+    total = len(rows)
+    chunk_size = max(1, chunk_size)
+    results: List[Dict[str, Any]] = []
+    for start in range(0, total, chunk_size):
+        # 청크 단위 CPU 작업은 스레드로 넘겨 다른 에이전트 요청이 루프에서 막히지 않게
+        chunk = await asyncio.to_thread(_build_chunk, rows[start:start + chunk_size], start)
+        results.extend(chunk)
+
+        if ctx is not None and total > chunk_size:
+            await ctx.report_progress(len(results), total)
+            if stream:
+                await ctx.info(json.dumps({"partial": chunk}, ensure_ascii=False))
+    return results
+
+
+@mcp.tool()
+@guarded
+async def search_jobs(
+    query: Optional[str] = None,
+    company: Optional[str] = None,
+    position: Optional[str] = None,
+    location: Optional[str] = None,
+    occupational_category: Optional[List[str]] = None,
+    valid_through_from: Optional[str] = None,
+    valid_through_to: Optional[str] = None,
+    size: int = 10,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    색인된 공고 검색. query 는 포지션/회사/업무/자격 전체, 나머지는 필드별 조건.
+    location 은 "서울", "경기 성남시" 같은 앞부분, valid_through_* 는 YYYY-MM-DD.
+    다음 페이지는 응답의 next_cursor 를 cursor 로 넘긴다 (없으면 마지막 페이지).
+    """
+    return await get_job_search().asearch(
+        query=query,
+        company=company,
+        position=position,
+        location=location,
+        occupational_category=occupational_category,
+        valid_through_from=valid_through_from,
+        valid_through_to=valid_through_to,
+        size=size,
+        cursor=cursor,
+    )
+
+
+@mcp.tool()
+@guarded
+async def get_job(job_id: Optional[str] = None, url: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """공고 한 건 전체 필드 (search_jobs 결과의 id 또는 원문 url). 없으면 null."""
+    return await get_job_search().aget(job_id=job_id, url=url)
+
+
+class _DropClosedStream(logging.Filter):
+    """stateless 모드에서 요청이 끝날 때마다 찍히는 ClosedResourceError 트레이스백 (정상 종료) 제거."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        exc = record.exc_info[1] if record.exc_info else None
+        return not (exc is not None and type(exc).__name__ == "ClosedResourceError")
+
+
+def create_app():
+    """
+    streamable-HTTP ASGI 앱 (uvicorn factory). 워커 여러 개가 한 포트를 나눠 받으므로
+    세션 상태를 워커에 두지 않는 stateless 모드로 띄운다 (요청마다 어느 워커로 가도 됨).
+    """
+    mcp.settings.stateless_http = True
+    # 요청마다 찍히는 INFO 로그가 처리량을 깎으므로 HTTP 모드에서는 경고 이상만
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+    logging.getLogger("elastic_transport").setLevel(logging.WARNING)
+    logging.getLogger("mcp.server.streamable_http").addFilter(_DropClosedStream())
+    if os.getenv("MCP_ALLOW_ANY_HOST") == "1":
+        # 127.0.0.1 이 아닌 주소로 열 때 (프록시 뒤 등): localhost 전용 Host 헤더 검사 해제
+        mcp.settings.transport_security = None
+    return mcp.streamable_http_app()
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="job-tools MCP 서버")
+    ap.add_argument("--transport", choices=["stdio", "streamable-http", "sse"], default="stdio")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--workers", type=int, default=1, help="streamable-http: uvicorn 워커 프로세스 수")
+    ap.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENCY, help="워커당 동시 도구 호출 수")
+    ap.add_argument("--queue-timeout", type=float, default=QUEUE_TIMEOUT, help="자리 대기 한도(초)")
+    ap.add_argument("--tool-timeout", type=float, default=TOOL_TIMEOUT, help="도구 호출 1건 한도(초)")
+    return ap.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    global MAX_CONCURRENCY, QUEUE_TIMEOUT, TOOL_TIMEOUT
+    args = parse_args(argv)
+    MAX_CONCURRENCY, QUEUE_TIMEOUT, TOOL_TIMEOUT = args.max_concurrency, args.queue_timeout, args.tool_timeout
+
+    if args.transport == "stdio":
+        # 로컬 붙이기는 보통 stdio가 가장 단순합니다. (stdio는 표준 전송) :contentReference[oaicite:4]{index=4}
+        mcp.run(transport="stdio")
+        return
+    if args.transport == "sse":
+        # SSE 는 세션이 프로세스 메모리에 묶여 있어 워커 1개만
+        mcp.settings.host, mcp.settings.port = args.host, args.port
+        mcp.run(transport="sse")
+        return
+
+    import uvicorn
+    os.environ.update(
+        MCP_MAX_CONCURRENCY=str(args.max_concurrency),
+        MCP_QUEUE_TIMEOUT=str(args.queue_timeout),
+        MCP_TOOL_TIMEOUT=str(args.tool_timeout),
+    )
+    if args.host not in ("127.0.0.1", "localhost", "::1"):
+        os.environ["MCP_ALLOW_ANY_HOST"] = "1"
+    uvicorn.run(
+        "mcp_server:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level="warning",
+        timeout_keep_alive=30,
+    )
+
 
 if __name__ == "__main__":
-    # 로컬 붙이기는 보통 stdio가 가장 단순합니다. (stdio는 표준 전송) :contentReference[oaicite:4]{index=4}
-    mcp.run(transport="stdio")
+    main()
@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+import lib.aimd
+from lib.aimd import AdaptiveConcurrency
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = FakeClock()
+    monkeypatch.setattr(lib.aimd, "time", c)
+    return c
+
+
+def _saturate(ctrl):
+    # 슬롯을 limit 만큼 다 잡았다가 돌려줌 -> 이번 window 는 포화로 기록
+    async def run():
+        n = int(ctrl.limit)
+        for _ in range(n):
+            await ctrl.acquire()
+        for _ in range(n):
+            ctrl.release()
+    asyncio.run(run())
+
+
+def _window(ctrl, clock, *, latency=1.0, tokens=100, n=4, saturated=True):
+    # window 하나 분량의 완료를 기록하고, 마지막 완료가 window 를 닫으며 조정을 일으킴
+    if saturated:
+        _saturate(ctrl)
+    for _ in range(n - 1):
+        ctrl.on_success(latency, tokens)
+    clock.now += ctrl.window
+    ctrl.on_success(latency, tokens)
+
+
+def test_saturated_window_increases_limit(clock):
+    ctrl = AdaptiveConcurrency(4, window=1.0)
+    _window(ctrl, clock)
+    assert int(ctrl.limit) == 5
+    assert ctrl.increases == 1
+
+
+def test_unsaturated_window_holds(clock):
+    ctrl = AdaptiveConcurrency(4, window=1.0)
+    _window(ctrl, clock, saturated=False)
+    assert int(ctrl.limit) == 4
+
+
+def test_no_adjustment_before_window_ends(clock):
+    ctrl = AdaptiveConcurrency(4, window=1.0)
+    _saturate(ctrl)
+    clock.now += 0.5
+    ctrl.on_success(1.0, 100)
+    assert int(ctrl.limit) == 4
+
+
+def test_failures_back_off_to_min_limit(clock):
+    ctrl = AdaptiveConcurrency(8, min_limit=2, window=1.0, backoff=0.5)
+    for _ in range(5):
+        clock.now += ctrl.window
+        ctrl.on_timeout()
+    assert int(ctrl.limit) == 2
+    assert ctrl.timeouts == 5
+
+
+def test_latency_above_baseline_decreases(clock):
+    ctrl = AdaptiveConcurrency(10, window=1.0, latency_tolerance=2.0, backoff=0.7)
+    _window(ctrl, clock, latency=1.0, saturated=False)
+    _window(ctrl, clock, latency=3.0, saturated=False)
+    assert int(ctrl.limit) == 7
+    assert ctrl.decreases == 1
+
+
+def test_steps_back_when_more_slots_only_add_latency(clock):
+    ctrl = AdaptiveConcurrency(4, window=1.0)
+    _window(ctrl, clock, latency=1.0, tokens=100)
+    assert int(ctrl.limit) == 5
+    # 처리량은 그대로인데 지연만 늘어남 -> 한 칸 물러남
+    _window(ctrl, clock, latency=1.5, tokens=100)
+    assert int(ctrl.limit) == 4
+    assert ctrl.snapshot()["limit"] == 4
+
+
+def test_limit_is_clamped_to_max(clock):
+    ctrl = AdaptiveConcurrency(3, max_limit=3, window=1.0)
+    _window(ctrl, clock)
+    assert int(ctrl.limit) == 3
+
+
+def test_acquire_waits_for_release_and_cancelled_waiter_leaves_queue():
+    async def run():
+        ctrl = AdaptiveConcurrency(1, window=3600)
+        await ctrl.acquire()
+        waiter = asyncio.create_task(ctrl.acquire())
+        cancelled = asyncio.create_task(ctrl.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        ctrl.release()
+        await asyncio.wait_for(waiter, 1.0)
+        snap = ctrl.snapshot()
+        ctrl.release()
+        return snap
+
+    snap = asyncio.run(run())
+    assert snap["in_flight"] == 1
+    assert snap["waiting"] == 0
+
+
+def test_run_times_out_and_returns_the_slot():
+    async def run():
+        ctrl = AdaptiveConcurrency(1, timeout=0.05, window=3600)
+        with pytest.raises(TimeoutError):
+            await ctrl.run(asyncio.sleep(1))
+        return await ctrl.run(asyncio.sleep(0, result="ok")), ctrl.snapshot()["in_flight"]
+
+    assert asyncio.run(run()) == ("ok", 0)
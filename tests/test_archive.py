@@ -0,0 +1,99 @@
+import asyncio
+import gzip
+
+import pytest
+
+from lib.archive import NotInArchive, PageArchive
+from lib.fetch import Fetcher
+
+
+@pytest.fixture
+def archive(tmp_path):
+    a = PageArchive(tmp_path / "archive")
+    yield a
+    a.close()
+
+
+def test_round_trip_keeps_body_status_and_content_type(archive):
+    body = "<html>원티드 공고</html>".encode()
+    archive.append("https://example.com/wd/1", body, status=200, content_type="text/html; charset=utf-8")
+    page = archive.get("https://example.com/wd/1")
+    assert page.body == body
+    assert page.status == 200
+    assert page.content_type == "text/html; charset=utf-8"
+    assert archive.has("https://example.com/wd/1")
+    assert archive.stats.written == 1 and archive.stats.read == 1
+
+
+def test_binary_body_with_record_separator_survives(archive):
+    body = b"\r\n\r\n\x00\xff" * 100
+    archive.append("u", body)
+    assert archive.get("u").body == body
+
+
+def test_get_returns_latest_or_as_of(archive):
+    archive.append("u", b"old", fetched_at=1000.0)
+    archive.append("u", b"new", fetched_at=2000.0)
+    assert archive.get("u").body == b"new"
+    assert archive.get("u", as_of=1500.0).body == b"old"
+    with pytest.raises(NotInArchive):
+        archive.get("u", as_of=10.0)
+    with pytest.raises(NotInArchive):
+        archive.get("missing")
+    assert archive.stats.missing == 2
+
+
+def test_segments_roll_over_and_stay_plain_gzip(tmp_path):
+    a = PageArchive(tmp_path / "archive", segment_bytes=512)
+    bodies = {f"u{i}": bytes([i]) * 2000 + str(i).encode() for i in range(10)}
+    for url, body in bodies.items():
+        a.append(url, body)
+    segments = sorted((tmp_path / "archive").glob("segment-*.warc.gz"))
+    assert len(segments) > 1
+    # 세그먼트 파일 자체가 gzip 멤버들을 이은 정상 스트림
+    for seg in segments:
+        assert b"WARC/1.1" in gzip.decompress(seg.read_bytes())
+    assert {p.url: p.body for p in a.iter_latest()} == bodies
+    a.close()
+
+
+def test_reopen_read_only_and_iter_latest_prefix(tmp_path):
+    a = PageArchive(tmp_path / "archive")
+    a.append("https://a.test/1", b"a1", fetched_at=1.0)
+    a.append("https://a.test/1", b"a1-new", fetched_at=2.0)
+    a.append("https://b.test/1", b"b1", fetched_at=3.0)
+    a.close()
+
+    ro = PageArchive(tmp_path / "archive", readonly=True)
+    assert [(p.url, p.body) for p in ro.iter_latest(prefix="https://a.test/")] == [("https://a.test/1", b"a1-new")]
+    with pytest.raises(RuntimeError):
+        ro.append("x", b"x")
+    ro.close()
+
+    # 다시 쓰기로 열면 기존 세그먼트 뒤에 이어 붙임
+    rw = PageArchive(tmp_path / "archive")
+    rw.append("https://c.test/1", b"c1")
+    assert rw.get("https://b.test/1").body == b"b1"
+    assert rw.get("https://c.test/1").body == b"c1"
+    rw.close()
+
+
+def test_read_only_without_index_fails(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        PageArchive(tmp_path / "nothing", readonly=True)
+
+
+def test_fetcher_replays_from_archive(archive):
+    archive.append("https://example.com/list?page=2", b'{"data": []}', content_type="application/json")
+
+    async def run():
+        f = Fetcher(archive=archive, replay=True)
+        r = await f.get("https://example.com/list", params={"page": 2})
+        with pytest.raises(NotInArchive):
+            await f.get("https://example.com/list", params={"page": 3})
+        return r
+
+    r = asyncio.run(run())
+    assert r.status_code == 200
+    assert r.json() == {"data": []}
+    assert r.extensions["from_archive"] is True
@@ -0,0 +1,105 @@
+import pytest
+
+from lib.dedup import DedupIndex, normalize_position, position_qualifiers, same_as_update
+
+DESC = "주요업무 결제 시스템 API 설계와 개발, 대용량 트래픽 처리 자격요건 Java Spring 경험 3년 이상"
+
+
+@pytest.fixture
+def index(tmp_path):
+    d = DedupIndex(tmp_path / "dedup.sqlite")
+    yield d
+    d.close()
+
+
+def _row(url, position, company="(주)테스트", **kw):
+    return {"url": url, "회사이름": company, "포지션": position, **kw}
+
+
+def test_position_normalization_splits_core_name_and_tags():
+    assert normalize_position("[경력] 결제 백엔드 개발자") == normalize_position("결제 백엔드 개발자 (경력)")
+    assert position_qualifiers("[경력] 결제 백엔드 개발자") == position_qualifiers("결제 백엔드 개발자 (경력)")
+    assert position_qualifiers("시니어 백엔드") != position_qualifiers("주니어 백엔드")
+
+
+def test_exact_cross_board_posting_is_linked(index):
+    a = "https://www.saramin.co.kr/a1"
+    b = "https://www.jobkorea.co.kr/b1"
+    assert index.assign(_row(a, "백엔드 개발자")) == (a, False)
+    assert index.assign(_row(b, "백엔드 개발자", company="테스트")) == (a, False)
+    assert index.same_as(a) == [b]
+    assert index.stats.as_dict()["duplicates"] == 1
+
+
+def test_same_board_postings_are_never_merged(index):
+    a1 = "https://www.saramin.co.kr/a1"
+    a2 = "https://saramin.co.kr/a2"  # www 유무만 다른 같은 보드
+    index.assign(_row(a1, "백엔드 개발자"))
+    assert index.assign(_row(a2, "백엔드 개발자"))[0] == a2
+
+
+@pytest.mark.parametrize("first, second", [
+    ("시니어 백엔드 개발자", "주니어 백엔드 개발자"),
+    ("Backend Engineer (Python)", "Backend Engineer (Java)"),
+])
+def test_different_tags_stay_separate(index, first, second):
+    a = "https://www.saramin.co.kr/a1"
+    b = "https://www.jobkorea.co.kr/b1"
+    index.assign(_row(a, first, meta_description=DESC))
+    assert index.assign(_row(b, second, meta_description=DESC))[0] == b
+
+
+def test_near_duplicate_needs_matching_description(index):
+    a = "https://www.wanted.co.kr/wd/1"
+    b = "https://www.jobkorea.co.kr/b1"
+    c = "https://www.saramin.co.kr/c1"
+    index.assign(_row(a, "[경력] 결제 백엔드 개발자", meta_description=DESC))
+    assert index.assign(_row(b, "결제 백엔드 개발자 (경력)", meta_description=DESC))[0] == a
+    # 본문이 없으면 포지션이 완전히 같아야 함
+    assert index.assign(_row(c, "결제 백엔드 개발자 (경력) 채용"))[0] == c
+
+
+def test_different_company_or_location_is_not_a_duplicate(index):
+    a = "https://www.saramin.co.kr/a1"
+    index.assign(_row(a, "백엔드 개발자", **{"회사 위치": "서울 강남구"}))
+    assert index.assign(_row("https://www.jobkorea.co.kr/b1", "백엔드 개발자", company="다른회사"))[0] != a
+    assert index.assign(_row("https://www.wanted.co.kr/wd/1", "백엔드 개발자",
+                             **{"회사 위치": "부산 해운대구"}))[0] != a
+
+
+def test_missing_fields_are_skipped(index):
+    assert index.assign({"url": "https://x.test/1", "포지션": "백엔드"}) is None
+    assert index.stats.skipped == 1
+
+
+def test_reassign_is_stable_and_reports_emitted(index):
+    a = "https://www.saramin.co.kr/a1"
+    b = "https://www.jobkorea.co.kr/b1"
+    c = "https://www.wanted.co.kr/wd/3"
+    index.assign(_row(a, "백엔드 개발자"))
+    index.assign(_row(b, "백엔드 개발자"))
+    linked = index.same_as(a)
+    # same_as() 와 mark_emitted() 사이에 묶인 중복은 mark_emitted 가 돌려줌
+    index.assign(_row(c, "백엔드 개발자"))
+    assert index.mark_emitted(a, linked) == [c]
+    # 대표가 색인기로 넘어간 뒤에는 assign 이 emitted=True 를 알려줌
+    assert index.assign(_row(b, "백엔드 개발자")) == (a, True)
+
+
+def test_index_persists_across_reopen(tmp_path):
+    a = "https://www.saramin.co.kr/a1"
+    d = DedupIndex(tmp_path / "dedup.sqlite")
+    d.assign(_row(a, "백엔드 개발자"))
+    d.mark_emitted(a, [])
+    d.close()
+    d = DedupIndex(tmp_path / "dedup.sqlite")
+    assert d.assign(_row("https://www.jobkorea.co.kr/b1", "백엔드 개발자")) == (a, True)
+    d.close()
+
+
+def test_same_as_update_appends_url_once():
+    action = same_as_update("jobs", "doc1", "https://www.jobkorea.co.kr/b1")
+    assert action["_op_type"] == "update"
+    assert action["_id"] == "doc1"
+    assert action["script"]["params"] == {"url": "https://www.jobkorea.co.kr/b1"}
+    assert "contains(params.url)" in action["script"]["source"]
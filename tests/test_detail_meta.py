@@ -0,0 +1,52 @@
+import pytest
+
+from bench.fixtures import load_fixtures
+from lib.req import DETAIL_URL, build_job_meta, extract_detail_meta
+
+PAGE = """<!DOCTYPE html><html><head>
+<title> [토스] 백엔드 개발자 | 원티드 </title>
+<meta name="description" content="토스에서 백엔드 개발자를 찾습니다.">
+<meta property="og:description" content="og 설명">
+</head><body>
+<script type="application/ld+json">{"@type": "Organization", "name": "토스"}</script>
+<script type="application/ld+json">
+{"@type": "JobPosting", "employmentType": "FULL_TIME", "datePosted": "2025-11-01",
+ "occupationalCategory": ["개발"], "validThrough": "2025-12-31",}
+</script>
+</body></html>"""
+
+
+@pytest.mark.parametrize("backend", ["stream", "html.parser", "auto"])
+def test_single_parse_extracts_head_meta_and_jsonld(backend):
+    out = extract_detail_meta(PAGE, backend=backend)
+    assert out["title"] == "[토스] 백엔드 개발자 | 원티드"
+    assert out["description"] == "토스에서 백엔드 개발자를 찾습니다."
+    assert out["og_description"] == "og 설명"
+    # 끝에 쉼표가 남은 ld+json 도 읽음
+    assert [o["@type"] for o in out["jsonld"]] == ["Organization", "JobPosting"]
+
+
+def test_stream_backend_matches_tree_parser_on_fixtures():
+    for html in load_fixtures().wanted_details:
+        assert extract_detail_meta(html, backend="stream") == extract_detail_meta(html, backend="html.parser")
+
+
+def test_auto_falls_back_to_tree_parser_when_stream_finds_nothing():
+    # meta 가 </head> 뒤 본문에 있는 깨진 문서: stream 은 <head> 만 보므로 비고, 트리 파서가 찾음
+    html = '<html><head></head><body><meta name="description" content="본문 설명"></body></html>'
+    assert extract_detail_meta(html, backend="stream")["description"] is None
+    assert extract_detail_meta(html, backend="auto")["description"] == "본문 설명"
+
+
+def test_build_job_meta_prefers_jobposting_block():
+    meta = build_job_meta(123, PAGE)
+    assert meta["id"] == 123
+    assert meta["url"] == DETAIL_URL.format(id=123)
+    assert meta["employmentType"] == "FULL_TIME"
+    assert meta["validThrough"] == "2025-12-31"
+    assert meta["description"] == "토스에서 백엔드 개발자를 찾습니다."
+
+
+def test_build_job_meta_uses_og_description_when_description_missing():
+    html = '<html><head><title>t</title><meta property="og:description" content="og 만"></head></html>'
+    assert build_job_meta(1, html)["description"] == "og 만"
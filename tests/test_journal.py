@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+from lib.journal import JournalState, RunJournal, load_journal
+
+
+def test_missing_journal_loads_empty(tmp_path):
+    state = load_journal(tmp_path / "nope.ndjson")
+    assert state.as_dict() == JournalState().as_dict()
+
+
+def test_records_are_on_disk_right_after_write(tmp_path):
+    path = tmp_path / "run.ndjson"
+    j = RunJournal(path, fsync_interval=3600, fsync_records=1000)
+    j.record("a", "payload", "text-a")
+    # fsync 전이라도 OS 까지는 넘어가 있어야 함 (프로세스가 죽어도 남음)
+    assert load_journal(path).payloads == {"a": "text-a"}
+    j.close()
+
+
+def test_load_journal_classifies_stages(tmp_path):
+    path = tmp_path / "run.ndjson"
+    j = RunJournal(path)
+    j.record("a", "payload", "text-a")
+    j.record("a", "action", {"_id": "a"})
+    j.record("b", "payload", "text-b")
+    j.record("c", "failed", "ValueError: bad")
+    j.record("d", "failed", "TimeoutError")
+    j.record("d", "action", {"_id": "d"})
+    j.close()
+
+    state = load_journal(path)
+    assert state.done == {"a", "d"}
+    assert state.actions == [{"_id": "a"}, {"_id": "d"}]
+    assert state.payloads == {"a": "text-a", "b": "text-b"}
+    # 나중에 성공한 공고는 실패로 세지 않음
+    assert state.as_dict()["failed"] == 1
+
+
+def test_resume_skips_done_and_appends(tmp_path):
+    path = tmp_path / "run.ndjson"
+    j = RunJournal(path)
+    j.record("a", "action", {"_id": "a"})
+    j.record("b", "payload", "text-b")
+    j.close()
+
+    j = RunJournal(path, resume=True)
+    assert j.is_done("a") and not j.is_done("b")
+    assert j.payload_for("b") == "text-b"
+    j.record("b", "action", {"_id": "b"})
+    j.close()
+    assert load_journal(path).done == {"a", "b"}
+
+
+def test_new_run_truncates(tmp_path):
+    path = tmp_path / "run.ndjson"
+    j = RunJournal(path)
+    j.record("a", "action", {"_id": "a"})
+    j.close()
+    RunJournal(path).close()
+    assert load_journal(path).done == set()
+
+
+def test_torn_last_line_is_ignored_and_not_glued_to_next_record(tmp_path):
+    path = tmp_path / "run.ndjson"
+    good = json.dumps({"id": "a", "stage": "action", "data": {"_id": "a"}})
+    path.write_text(good + "\n" + '{"id": "b", "stage": "act', encoding="utf-8")
+
+    j = RunJournal(path, resume=True)
+    assert j.state.corrupt_lines == 1
+    assert j.state.done == {"a"}
+    j.record("c", "action", {"_id": "c"})
+    j.close()
+
+    state = load_journal(path)
+    assert state.done == {"a", "c"}
+    assert state.corrupt_lines == 1
+
+
+def test_fsync_batches_by_record_count(tmp_path):
+    j = RunJournal(tmp_path / "run.ndjson", fsync_interval=3600, fsync_records=3)
+    for i in range(7):
+        j.record(str(i), "payload", "x")
+    assert j.syncs == 2
+    j.sync()
+    assert j.syncs == 3
+    j.sync()  # 남은 게 없으면 fsync 안 함
+    assert j.syncs == 3
+    j.close()
+    j.sync()  # 닫힌 뒤에도 안전
+
+
+def test_autosync_flushes_a_stalled_journal(tmp_path):
+    j = RunJournal(tmp_path / "run.ndjson", fsync_interval=0.05, fsync_records=1000)
+
+    async def run():
+        task = asyncio.create_task(j.autosync())
+        j.record("a", "payload", "x")
+        await asyncio.sleep(0.2)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+    assert j.syncs >= 1
+    j.close()
@@ -0,0 +1,40 @@
+from lib.payload import build_llm_payload, truncate_to_tokens, approx_tokens
+
+
+def test_alias_and_schema_key_with_same_value_print_once():
+    assert build_llm_payload({"name": "토스", "회사이름": "토스"}) == "회사이름: 토스"
+    assert build_llm_payload({"회사이름": "토스", "name": "토스"}) == "회사이름: 토스"
+
+
+def test_empty_schema_key_does_not_overwrite_alias():
+    assert build_llm_payload({"position": "백엔드", "포지션": ""}) == "포지션: 백엔드"
+    assert build_llm_payload({"position": "백엔드", "포지션": None}) == "포지션: 백엔드"
+
+
+def test_alias_before_schema_key_keeps_both_values():
+    # 먼저 나온 값이 스키마 이름을 갖고, 다른 값도 버리지 않음
+    out = build_llm_payload({"name": "비바리퍼블리카", "회사이름": "토스"}).splitlines()
+    assert out == ["회사이름: 비바리퍼블리카", "name: 토스"]
+
+
+def test_alias_after_schema_key_keeps_its_own_name():
+    out = build_llm_payload({"포지션": "백엔드", "position": "서버 개발자"}).splitlines()
+    assert out == ["포지션: 백엔드", "position: 서버 개발자"]
+
+
+def test_skips_internal_keys_and_orders_fields():
+    out = build_llm_payload({
+        "extra": "x",
+        "url": "https://example.com/1",
+        "content_fingerprint": "abc",
+        "회사이름": "토스",
+    }).splitlines()
+    assert out == ["회사이름: 토스", "url: https://example.com/1", "extra: x"]
+
+
+def test_description_is_truncated_to_budget():
+    text = "\n".join(f"• 항목 {i}" for i in range(500))
+    out = build_llm_payload({"description": text}, description_token_budget=50)
+    body = out.split(": ", 1)[1]
+    assert approx_tokens(body) <= 50
+    assert body == truncate_to_tokens(text, 50)
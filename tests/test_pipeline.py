@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from lib.pipeline import Stage, run_pipeline
+
+
+async def _aiter(items):
+    for x in items:
+        yield x
+
+
+def _run(sources, stages):
+    return asyncio.run(run_pipeline(sources, stages))
+
+
+def test_items_flow_through_every_stage():
+    out = []
+
+    async def double(x):
+        return x * 2
+
+    async def collect(x):
+        out.append(x)
+        return x
+
+    report = _run([_aiter(range(10))], [Stage("double", double), Stage("collect", collect)])
+    # 워커 1개씩이면 순서도 그대로
+    assert out == [x * 2 for x in range(10)]
+    crawl, d, c = report.stages
+    assert (crawl.items_in, d.items_in, d.items_out, c.items_out) == (10, 10, 10, 10)
+
+
+def test_none_results_are_dropped():
+    out = []
+
+    async def odd_only(x):
+        return x if x % 2 else None
+
+    async def collect(x):
+        out.append(x)
+        return x
+
+    report = _run([_aiter(range(10))], [Stage("odd", odd_only), Stage("collect", collect)])
+    assert out == [1, 3, 5, 7, 9]
+    assert report.stages[1].items_out == 5
+
+
+def test_batches_respect_batch_size_and_keep_order():
+    seen_batches = []
+    out = []
+
+    async def batch(items):
+        seen_batches.append(len(items))
+        return [x + 100 for x in items]
+
+    async def collect(x):
+        out.append(x)
+        return x
+
+    _run([_aiter(range(25))], [Stage("batch", batch, batch_size=10, batch_timeout=1.0), Stage("collect", collect)])
+    assert out == [x + 100 for x in range(25)]
+    assert sum(seen_batches) == 25
+    assert max(seen_batches) <= 10
+
+
+def test_multiple_sources_and_workers_deliver_everything():
+    out = []
+
+    async def slow(x):
+        await asyncio.sleep(0.001)
+        return x
+
+    async def collect(x):
+        out.append(x)
+        return x
+
+    report = _run([_aiter(range(0, 50)), _aiter(range(50, 100))],
+                  [Stage("slow", slow, concurrency=8), Stage("collect", collect)])
+    assert sorted(out) == list(range(100))
+    assert report.stages[0].concurrency == 2
+
+
+def test_stage_error_counts_the_batch_and_continues():
+    out = []
+
+    async def flaky(items):
+        if 3 in items:
+            raise ValueError("bad batch")
+        return items
+
+    async def collect(x):
+        out.append(x)
+        return x
+
+    report = _run([_aiter(range(10))], [Stage("flaky", flaky, batch_size=2, batch_timeout=1.0),
+                                        Stage("collect", collect)])
+    flaky_stats = report.stages[1]
+    assert flaky_stats.errors == 2
+    assert sorted(out) == [0, 1, 4, 5, 6, 7, 8, 9]
+
+
+def test_source_error_does_not_stop_other_sources():
+    async def broken():
+        yield 1
+        raise RuntimeError("crawler died")
+
+    async def ident(x):
+        return x
+
+    report = _run([broken(), _aiter([10, 11])], [Stage("ident", ident)])
+    assert report.stages[0].errors == 1
+    assert report.stages[1].items_out == 3
+
+
+def test_fatal_error_cancels_the_pipeline():
+    class Dead(RuntimeError):
+        pass
+
+    handled = []
+
+    async def endless():
+        i = 0
+        while True:
+            yield i
+            i += 1
+
+    async def first(x):
+        if x == 5:
+            raise Dead("backend gone")
+        return x
+
+    async def second(x):
+        handled.append(x)
+        return x
+
+    with pytest.raises(Dead):
+        _run([endless()], [Stage("first", first, fatal=(Dead,)), Stage("second", second)])
+    assert 5 not in handled
+
+
+def test_requires_a_stage():
+    with pytest.raises(ValueError):
+        _run([_aiter([1])], [])
@@ -0,0 +1,81 @@
+import asyncio
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from lib.ratelimit import AdaptiveTokenBucket, backoff_delay, parse_retry_after
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    when = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= parse_retry_after(when) <= 30
+
+
+def test_backoff_delay_is_capped():
+    for attempt in range(20):
+        assert 0 <= backoff_delay(attempt, base=0.5, cap=2.0) <= 2.0
+
+
+def test_success_at_baseline_latency_increases_rate():
+    b = AdaptiveTokenBucket(2.0, increase_step=0.5, max_rate=3.0)
+    for _ in range(5):
+        b.on_success(0.1)
+    assert b.rate == 3.0  # max_rate 에서 멈춤
+
+
+def test_throttle_halves_rate_once_per_cooldown():
+    b = AdaptiveTokenBucket(8.0, decrease_cooldown=60.0)
+    b.on_throttle()
+    b.on_throttle()  # 같은 순간 몰려온 429 는 한 번만 반영
+    assert b.rate == 4.0
+    assert b.throttled == 2
+
+
+def test_errors_decrease_rate_down_to_min():
+    b = AdaptiveTokenBucket(1.0, min_rate=0.5, decrease_cooldown=0.0)
+    for _ in range(10):
+        b.on_error()
+    assert b.rate == 0.5
+    assert b.error_rate == 1.0
+
+
+def test_slow_responses_decrease_rate():
+    b = AdaptiveTokenBucket(4.0, decrease_cooldown=0.0)
+    b.on_success(0.1)
+    for _ in range(20):
+        b.on_success(5.0)
+    assert b.rate < 4.0
+
+
+def test_acquire_spends_burst_then_waits_for_refill():
+    async def run():
+        b = AdaptiveTokenBucket(20.0, burst=2.0)
+        t0 = time.monotonic()
+        for _ in range(4):
+            await b.acquire()
+        return time.monotonic() - t0
+
+    # burst 2개는 바로, 나머지 2개는 1/20 초씩
+    assert 0.08 <= asyncio.run(run()) < 0.5
+
+
+def test_retry_after_blocks_the_host():
+    async def run():
+        b = AdaptiveTokenBucket(100.0, burst=10.0)
+        b.on_throttle(retry_after=0.2)
+        t0 = time.monotonic()
+        await b.acquire()
+        return time.monotonic() - t0
+
+    assert asyncio.run(run()) >= 0.19
+
+
+@pytest.mark.parametrize("value", ["", "   "])
+def test_parse_retry_after_blank(value):
+    assert parse_retry_after(value) is None